@@ -167,6 +167,10 @@ def get_draft_filenames() -> list[str]:
 
 # --- Import LLM client ---
 from llm_client import LLMClient
+from app.refactor_regions.studio_engine.section_regen import regenerate_article_section, remember_sections
+from app.refactor_regions.studio_engine.source_ingest import chunk_text, infer_thesis, ingest_source
+
+FALLBACK_BODY_TOKENS = 300      # body fallback: leading paragraphs, cut on a boundary
 
 # (inactive logic) Define key directories
 ARTICLES_DIR = ROOT / "articles"
@@ -484,9 +488,12 @@ def find_post_outputs(slug: str) -> tuple[pathlib.Path | None, pathlib.Path | No
 def write_render_refresh(choice: str | None,
                          data: Dict[str, Any],
                          openai_key: str | None,
-                         mock_mode: bool) -> subprocess.CompletedProcess:
+                         mock_mode: bool,
+                         section: str | int | None = None) -> subprocess.CompletedProcess:
     """
     1) Generate sections with LLM based on current YAML (incl. intention_equation if present)
+       — or, with `section`, regenerate only that section (lede/body/counterpoints/
+       conclusion or a YAML sections[i] index) with its neighbours as context
     2) Save YAML
     3) Render selected draft (or all if none)
     4) Return the render process so caller can show logs
@@ -503,7 +510,11 @@ def write_render_refresh(choice: str | None,
         if k in data:
             to_send[k] = data[k]
 
-    sections = llm.write_post_sections(to_send)
+    if section is not None:
+        sections = regenerate_article_section(data, section, to_send, llm)
+    else:
+        sections = llm.write_post_sections(to_send)
+        remember_sections(to_send, sections)
     data["generated_sections"] = sections
 
     if choice and choice != "(new)":
@@ -750,14 +761,15 @@ def article_from_source_text(
         elif openai_key:
             os.environ["OPENAI_API_KEY"] = openai_key
 
+        # the whole source, chunked and map-reduced (no character cut-off)
+        digest = ingest_source(text, llm)
+        base["source_digest"] = {k: v for k, v in digest.items() if k != "summary"}
+        base["source_summary"] = digest["summary"]
+        if digest["sampled"]:
+            st.info(f"Source is ~{digest['tokens']:,} tokens; summarized {digest['chunks']} evenly spaced chunks of it.")
+
         if not inferred_thesis:
-            inferred_thesis = llm.complete(
-                system=(
-                    "You infer concise op-ed theses. "
-                    "Return a single sentence (<=25 words) that captures the central claim."
-                ),
-                user=f"Source:\n{text[:4000]}\n\nReturn only the thesis sentence."
-            ).strip()
+            inferred_thesis = infer_thesis(digest["summary"], llm)
 
         base["thesis"] = inferred_thesis or base["thesis"]
 
@@ -769,6 +781,7 @@ def article_from_source_text(
                 "tone": base["tone"],
                 "outline": base.get("outline", []),
                 "claims": [],
+                "source_summary": base["source_summary"],
             }
         )
         base["generated_sections"] = sections
@@ -777,7 +790,7 @@ def article_from_source_text(
         base["thesis"] = inferred_thesis or base["thesis"]
         base["generated_sections"] = {
             "lede": "Draft lede from source.",
-            "body": text[:1200],
+            "body": base.get("source_summary") or next(iter(chunk_text(text, FALLBACK_BODY_TOKENS)), ""),
             "counterpoints": "List a few limitations and counterarguments.",
             "conclusion": "Close with next steps or call to action.",
         }
@@ -18,6 +18,15 @@ from app.utils.errors import (
 # NEW: HTML cleaner
 from app.utils.text_clean import clean_html
 
+# RippleScore batch scoring for headline ranking
+from app.refactor_regions.studio_engine.ripple_score import (
+    load_equations,
+    score_articles,
+)
+
+# Monitor items feed the RippleTruth evidence index
+from app.refactor_regions.studio_engine.evidence_index import get_evidence_index
+
 # ----------------------------------------------------------
 # RSS SOURCES
 # ----------------------------------------------------------
@@ -57,6 +66,90 @@ def fetch_feed(url):
     except Exception as e:
         return None, str(e)
 
+# ----------------------------------------------------------
+# Ingestion (fetch + clean + score once per refresh)
+# ----------------------------------------------------------
+RANK_VIEWS = {
+    "Feed order": None,
+    "Rank by FILS": "fils",
+    "Rank by UCIP": "ucip",
+    "Rank by TTCF": "ttcf",
+}
+
+
+def _entry_to_item(entry, source_name):
+    return {
+        "title": entry.get("title", "(no title)"),
+        "summary": clean_html(entry.get("summary", "")),
+        "timestamp": entry.get("published", ""),
+        "url": entry.get("link", ""),
+        "author": entry.get("author", ""),
+        "source": source_name,
+    }
+
+
+def score_items(items):
+    """
+    Batch-score feed items with every RippleScore equation.
+    Each item gets item["scores"] = {equation_id: score}.
+    """
+    if not items:
+        return items
+
+    articles = [
+        {"thesis": it["title"], "generated_sections": {"body": it["summary"]}}
+        for it in items
+    ]
+    eq_ids, _signals, scores = score_articles(articles, load_equations())
+
+    for it, row in zip(items, scores):
+        it["scores"] = {eq_id: float(v) for eq_id, v in zip(eq_ids, row)}
+    return items
+
+
+# errors key for the evidence-index sync (not an RSS source)
+EVIDENCE_INDEX = "Evidence index"
+
+
+def ingest_feeds():
+    """
+    Fetch every source, clean summaries and score all items in one batch.
+    Returns (items, errors) where errors maps source -> message.
+    """
+    items, errors = [], {}
+    for source_name, url in RSS_SOURCES.items():
+        feed, error = fetch_feed(url)
+        if error:
+            errors[source_name] = error
+            continue
+        if not feed or not feed.entries:
+            errors[source_name] = None
+            continue
+        items.extend(_entry_to_item(e, source_name) for e in feed.entries)
+
+    items = score_items(items)
+
+    # Ingested items become RippleTruth evidence (local index, no network)
+    try:
+        get_evidence_index().sync(monitor_items=items)
+    except Exception as e:
+        errors[EVIDENCE_INDEX] = str(e)
+
+    return items, errors
+
+
+def _render_item(item, key_prefix):
+    # A real Streamlit button – guaranteed safe
+    if st.button(item["title"], key=f"{key_prefix}-{item['source']}-{item['title']}"):
+        payload = {k: item[k] for k in ("title", "summary", "timestamp", "url", "author", "source")}
+        st.session_state["design_payload"] = payload
+        st.session_state["go_to_design"] = True
+        st.rerun()
+
+    if item["timestamp"]:
+        st.caption(item["timestamp"])
+
+
 # ----------------------------------------------------------
 # MAIN RENDER FUNCTION (PHASE 1 SAFE MODE)
 # ----------------------------------------------------------
@@ -74,11 +167,26 @@ def render_monitor_region():
     # ------------------------------------------------------
     auto = st.checkbox("Auto-refresh every 10 seconds", value=False)
     if auto:
+        st.session_state.pop("monitor_items", None)
         st.rerun()
 
     if st.button("Refresh Feeds"):
+        st.session_state.pop("monitor_items", None)
         st.rerun()
 
+    # Ingest + score once; renders reuse the stored items
+    if "monitor_items" not in st.session_state:
+        items, errors = ingest_feeds()
+        st.session_state["monitor_items"] = items
+        st.session_state["monitor_errors"] = errors
+        st.session_state["monitor_ingested_at"] = datetime.now().strftime("%H:%M:%S")
+
+    items = st.session_state["monitor_items"]
+    errors = st.session_state.get("monitor_errors", {})
+
+    view = st.radio("View", list(RANK_VIEWS), horizontal=True, key="monitor_rank_view")
+    eq_id = RANK_VIEWS[view]
+
     # ------------------------------------------------------
     # MAIN LAYOUT (safe mode, native only)
     # ------------------------------------------------------
@@ -88,52 +196,28 @@ def render_monitor_region():
     # LEFT SIDE: NEWS FEEDS
     # ============================
     with left:
-        for source_name, url in RSS_SOURCES.items():
-
-            st.subheader(source_name)
-
-            feed, error = fetch_feed(url)
-
-            if error:
-                st.error(friendly_rss_error(source_name, error))
-                continue
-
-            if not feed or not feed.entries:
-                st.warning("⚠️ Feed returned no items.")
-                continue
-
-            # Show first 5 items
-            for entry in feed.entries[:5]:
-
-                title = entry.get("title", "(no title)")
-
-                # NEW: CLEAN SUMMARY
-                summary_raw = entry.get("summary", "")
-                summary = clean_html(summary_raw)
-
-                ts = entry.get("published", "")
-                link = entry.get("link", "")
-                author = entry.get("author", "")
-
-                # Payload for Design tab
-                payload = {
-                    "title": title,
-                    "summary": summary,
-                    "timestamp": ts,
-                    "url": link,
-                    "author": author,
-                    "source": source_name,
-                }
-
-                # A real Streamlit button – guaranteed safe
-                if st.button(title, key=f"{source_name}-{title}"):
-
-                    st.session_state["design_payload"] = payload
-                    st.session_state["go_to_design"] = True
-                    st.rerun()
-
-                if ts:
-                    st.caption(ts)
+        if eq_id is None:
+            for source_name in RSS_SOURCES:
+
+                st.subheader(source_name)
+
+                if source_name in errors:
+                    if errors[source_name]:
+                        st.error(friendly_rss_error(source_name, errors[source_name]))
+                    else:
+                        st.warning("⚠️ Feed returned no items.")
+                    continue
+
+                # Show first 5 items
+                source_items = [it for it in items if it["source"] == source_name]
+                for item in source_items[:5]:
+                    _render_item(item, "feed")
+        else:
+            st.subheader(view)
+            ranked = sorted(items, key=lambda it: it["scores"].get(eq_id, 0.0), reverse=True)
+            for rank, item in enumerate(ranked[:15], start=1):
+                st.markdown(f"**#{rank}** · {item['source']} · {eq_id.upper()} {item['scores'].get(eq_id, 0.0):.3f}")
+                _render_item(item, f"rank-{eq_id}")
 
     # ============================
     # RIGHT SIDE: SYSTEM STATUS
@@ -142,7 +226,12 @@ def render_monitor_region():
         st.subheader("System Status")
         st.write("✓ RSS Active")
         st.write("✓ Internet OK")
-        st.write(f"Last Update: {datetime.now().strftime('%H:%M:%S')}")
+        st.write(f"Last Update: {st.session_state.get('monitor_ingested_at', '')}")
+        st.write(f"Scored Items: {len(items)}")
+        if errors.get(EVIDENCE_INDEX):
+            st.error(f"Evidence index sync failed: {errors[EVIDENCE_INDEX]}")
+        else:
+            st.write("✓ Evidence Index Synced")
 
         st.markdown("---")
         st.subheader("Story Pipelines")
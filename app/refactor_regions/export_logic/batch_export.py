@@ -0,0 +1,356 @@
+# ==========================================================
+#  Export — Batch Exporter
+#  Renders many YAML drafts to every requested format in
+#  worker processes and streams the outputs into one ZIP:
+#
+#    {slug}/{slug}.md | .html | .docx | .json | .yaml
+#    batch_report.json   per-document timings + failures
+#
+#  Results are written to the archive as each document
+#  finishes and at most 2 x workers documents are in flight,
+#  so memory stays bounded however many drafts are selected.
+#
+#  CLI:
+#    python -m app.refactor_regions.export_logic.batch_export \
+#        "articles/*.yaml" --tag politics --formats md,html,docx \
+#        --out exports.zip
+#
+#  The Export tab drives the same engine through submit_batch().
+# ==========================================================
+
+import argparse
+import glob
+import html
+import json
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pathlib import Path
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+ARTICLES_DIR = PROJECT_ROOT / "articles"
+EXPORTS_DIR = PROJECT_ROOT / "output" / "exports"
+
+FORMATS = ("md", "html", "docx", "json", "yaml")
+DEFAULT_FORMATS = ("md", "html", "docx")
+REPORT_NAME = "batch_report.json"
+
+# Draft body, first key present wins; else generated_sections / sections
+BODY_KEYS = ("draft", "draft_text", "body", "content", "text")
+GENERATED_SECTIONS = (
+    ("lede", "Lede"),
+    ("body", "Body"),
+    ("counterpoints", "Counterpoints & Limits"),
+    ("conclusion", "Conclusion"),
+)
+
+
+# ----------------------------------------------------------
+# Draft selection
+# ----------------------------------------------------------
+def draft_tags(data):
+    meta = data.get("meta") if isinstance(data.get("meta"), dict) else {}
+    tags = data.get("tags") or meta.get("tags") or []
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    return {str(t).strip().lower() for t in tags if str(t).strip()}
+
+
+def _load(path):
+    try:
+        data = yaml.safe_load(Path(path).read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def collect_drafts(patterns=(), tags=(), root=ARTICLES_DIR):
+    """
+    YAML draft paths matching any glob in `patterns` (default:
+    root/*.yaml + *.yml). With `tags`, keep drafts carrying any of
+    them (top-level or meta.tags, case-insensitive).
+    """
+    if not patterns:
+        patterns = (str(Path(root) / "*.yaml"), str(Path(root) / "*.yml"))
+    paths = []
+    for pattern in patterns:
+        matches = glob.glob(str(pattern)) if any(c in str(pattern) for c in "*?[") else [str(pattern)]
+        paths.extend(Path(p) for p in matches if Path(p).is_file())
+    paths = sorted(dict.fromkeys(paths))
+
+    wanted = {t.strip().lower() for t in tags if t.strip()}
+    if wanted:
+        paths = [p for p in paths if wanted & draft_tags(_load(p) or {})]
+    return paths
+
+
+def draft_body(data):
+    """Markdown body of a draft YAML (see BODY_KEYS)."""
+    for key in BODY_KEYS:
+        value = data.get(key)
+        if isinstance(value, str) and value.strip():
+            return value
+    gen = data.get("generated_sections") or {}
+    if isinstance(gen, dict) and any(gen.values()):
+        parts = []
+        for key, heading in GENERATED_SECTIONS:
+            value = gen.get(key) or ""
+            if isinstance(value, list):
+                value = "\n".join(map(str, value))
+            if str(value).strip():
+                parts.append(f"## {heading}\n\n{value}")
+        return "\n\n".join(parts)
+    sections = data.get("sections") or []
+    if isinstance(sections, list):
+        parts = []
+        for sec in sections:
+            if isinstance(sec, dict):
+                head = sec.get("heading") or sec.get("title") or ""
+                text = sec.get("content") or sec.get("text") or ""
+                parts.append((f"## {head}\n\n" if head else "") + str(text))
+            elif sec:
+                parts.append(str(sec))
+        return "\n\n".join(parts)
+    return ""
+
+
+def _slug(text):
+    slug = "".join(c.lower() if c.isalnum() else "-" for c in text).strip("-")
+    return "-".join(filter(None, slug.split("-")))[:80] or "draft"
+
+
+# ----------------------------------------------------------
+# Worker (runs in a child process)
+# ----------------------------------------------------------
+def export_draft(path, formats):
+    """
+    Render one draft. Returns {"name", "files": [(arcname, bytes)],
+    "timings": {fmt: seconds}, "error"}; never raises.
+    """
+    started = time.perf_counter()
+    path = Path(path)
+    result = {"name": path.name, "files": [], "timings": {}, "error": None}
+    try:
+        from app.refactor_regions.export_logic.document_ast import build_document, render_html, render_markdown
+        from app.refactor_regions.export_logic.html_template import HTML_WRAPPER
+        from app.refactor_regions.export_logic.html_inline import inline_html
+
+        data = _load(path)
+        if data is None:
+            raise ValueError("not a YAML mapping")
+        body = draft_body(data)
+        title = str(data.get("title") or path.stem)
+        slug = _slug(str(data.get("slug") or path.stem))
+
+        t = time.perf_counter()
+        doc = build_document(body, data, title=title)
+        result["timings"]["parse"] = time.perf_counter() - t
+
+        for fmt in formats:
+            t = time.perf_counter()
+            if fmt == "md":
+                out = render_markdown(doc).encode("utf-8")
+            elif fmt == "html":
+                # self-contained: images are inlined (the disk asset cache is
+                # shared by the worker processes), relative paths break in a ZIP
+                page, _ = inline_html(HTML_WRAPPER.format(title=html.escape(title), content=render_html(doc)), path.parent)
+                out = page.encode("utf-8")
+            elif fmt == "docx":
+                from app.refactor_regions.export_logic.docx_builder import build_docx
+                out = build_docx(doc)
+            elif fmt in ("json", "yaml"):
+                from app.refactor_regions.export_logic.structured_export import structured_bytes
+                from app.refactor_regions.studio_engine.intention_equations import draft_weight_overrides
+                meta = {"title": title, "subtitle": doc.subtitle, "intention_weights": draft_weight_overrides(data)}
+                out = structured_bytes(fmt, {"final_draft": body}, meta)
+            else:
+                raise ValueError(f"unknown format {fmt!r}")
+            result["files"].append((f"{slug}/{slug}.{fmt}", out))
+            result["timings"][fmt] = time.perf_counter() - t
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["timings"]["total"] = time.perf_counter() - started
+    return result
+
+
+# ----------------------------------------------------------
+# Driver
+# ----------------------------------------------------------
+def _pool(workers):
+    # spawn: the Streamlit server is multi-threaded, fork is not safe there
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def run_batch(paths, formats=DEFAULT_FORMATS, target=None, workers=None, report=None):
+    """
+    Export `paths` into a ZIP at `target` (path or binary file
+    object). Returns the per-document report rows. `report(fraction,
+    message)` is called as documents finish. A crashed worker fails
+    the drafts in flight; the rest continue on a fresh pool.
+    """
+    formats = tuple(f for f in formats if f in FORMATS) or DEFAULT_FORMATS
+    paths = [str(p) for p in paths]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths) or 1))
+    report = report or (lambda fraction, message="": None)
+    rows, used = [], set()
+
+    with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        pool = _pool(workers)
+        try:
+            pending, queue = {}, deque(paths)      # future -> path
+            while queue or pending:
+                while queue and len(pending) < 2 * workers:
+                    path = queue.popleft()
+                    try:
+                        pending[pool.submit(export_draft, path, formats)] = path
+                    except BrokenProcessPool:
+                        queue.appendleft(path)
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        pool = _pool(workers)
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = pending.pop(future)
+                    try:
+                        res = future.result()
+                    except BrokenProcessPool as e:
+                        res = {"name": Path(path).name, "files": [], "timings": {}, "error": f"worker crashed: {e}"}
+                    size = 0
+                    for arcname, data in res["files"]:
+                        while arcname in used:      # two drafts with the same slug
+                            stem, ext = arcname.rsplit(".", 1)
+                            arcname = f"{stem}-{len(used)}.{ext}"
+                        used.add(arcname)
+                        zf.writestr(arcname, data)
+                        size += len(data)
+                    rows.append({
+                        "draft": res["name"],
+                        "status": "error" if res["error"] else "ok",
+                        "error": res["error"],
+                        "bytes": size,
+                        "seconds": {k: round(v, 4) for k, v in res["timings"].items()},
+                    })
+                    report(len(rows) / max(1, len(paths)), f"{len(rows)}/{len(paths)} · {res['name']}")
+        finally:
+            pool.shutdown()
+
+        summary = {
+            "generated": datetime.now().isoformat(timespec="seconds"),
+            "formats": list(formats),
+            "drafts": len(rows),
+            "failed": sum(r["status"] == "error" for r in rows),
+            "results": rows,
+        }
+        zf.writestr(REPORT_NAME, json.dumps(summary, indent=2, ensure_ascii=False))
+    return rows
+
+
+# ----------------------------------------------------------
+# Background jobs (Export tab)
+# ----------------------------------------------------------
+_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rw-batch")
+_LOCK = threading.Lock()
+_JOBS = {}                 # job id -> BatchJob
+
+
+class BatchJob:
+    """Progress + outcome of one batch export. Safe to poll from the UI."""
+
+    def __init__(self, job_id, count, target):
+        self.id = job_id
+        self.count = count
+        self.target = target
+        self.status = "queued"     # queued | running | done | error
+        self.progress = 0.0
+        self.message = "Queued…"
+        self.rows = []
+        self.error = None
+        self.elapsed = 0.0
+
+    @property
+    def finished(self):
+        return self.status in ("done", "error")
+
+    def report(self, fraction, message=""):
+        self.progress = max(0.0, min(1.0, float(fraction)))
+        if message:
+            self.message = message
+
+
+def _run(job, paths, formats, workers):
+    job.status = "running"
+    started = time.perf_counter()
+    try:
+        job.rows = run_batch(paths, formats, job.target, workers, report=job.report)
+        job.status = "done"
+        job.report(1.0, "Batch export ready.")
+    except Exception as e:
+        job.error = str(e)
+        job.status = "error"
+    finally:
+        job.elapsed = time.perf_counter() - started
+
+
+def submit_batch(paths, formats=DEFAULT_FORMATS, workers=None, exports_dir=EXPORTS_DIR):
+    """Start a batch export into exports_dir/batch_<stamp>.zip; returns the BatchJob."""
+    Path(exports_dir).mkdir(parents=True, exist_ok=True)
+    job_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    job = BatchJob(job_id, len(paths), Path(exports_dir) / f"batch_{job_id}.zip")
+    with _LOCK:
+        _JOBS[job_id] = job
+    _EXECUTOR.submit(_run, job, list(paths), tuple(formats), workers)
+    return job
+
+
+def get_batch_job(job_id):
+    with _LOCK:
+        return _JOBS.get(job_id)
+
+
+# ----------------------------------------------------------
+# CLI
+# ----------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export many YAML drafts into one ZIP.")
+    parser.add_argument("drafts", nargs="*", help="YAML files or globs (default: articles/*.yaml)")
+    parser.add_argument("--tag", action="append", default=[], help="only drafts with this tag (repeatable)")
+    parser.add_argument("--formats", default=",".join(DEFAULT_FORMATS), help=f"comma list of {', '.join(FORMATS)}")
+    parser.add_argument("--out", default=None, help="ZIP path (default: output/exports/batch_<stamp>.zip)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    formats = [f.strip().lower() for f in args.formats.split(",") if f.strip()]
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(unknown)}")
+
+    paths = collect_drafts(args.drafts, args.tag)
+    if not paths:
+        print("No drafts matched.")
+        return 1
+
+    out = Path(args.out) if args.out else EXPORTS_DIR / f"batch_{datetime.now():%Y%m%d_%H%M%S}.zip"
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    started = time.perf_counter()
+    rows = run_batch(paths, formats, out, args.workers)
+    elapsed = time.perf_counter() - started
+
+    width = max(len(r["draft"]) for r in rows)
+    for r in sorted(rows, key=lambda r: r["draft"]):
+        detail = r["error"] or " ".join(f"{k}={v:.2f}s" for k, v in r["seconds"].items() if k != "total")
+        print(f"{r['draft']:<{width}}  {r['status']:<5}  {r['seconds'].get('total', 0):6.2f}s  {detail}")
+    failed = sum(r["status"] == "error" for r in rows)
+    print(f"\n{len(rows)} draft(s), {failed} failed, {elapsed:.2f}s -> {out}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,542 @@
+# ==========================================================
+#  Export — Document AST
+#  Draft + YAML parsed once into a compact block tree that
+#  every export backend walks (Markdown, HTML, DOCX):
+#
+#    Heading  Paragraph  ListBlock  Quote  CodeBlock  Rule
+#    Image    FactBox    PullQuote  RawHtml
+#    inline:  Run(text, bold, italic, code, href, src, raw, field)
+#
+#  Markdown is parsed by one long-lived markdown.Markdown
+#  (reset between documents); its finished element tree is
+#  captured and folded into the AST, so structure matches what
+#  Python-Markdown renders. Parsed blocks are cached under the
+#  shared document model digest.
+#
+#  Late-bound values (e.g. the export timestamp) are Runs with
+#  a `field` name; backends take fields={name: value}.
+# ==========================================================
+
+import html
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+
+import markdown
+from markdown.treeprocessors import Treeprocessor
+from markdown.util import AMP_SUBSTITUTE
+
+from app.refactor_regions.studio_engine.document_model import get_document
+
+FORMATS = ("markdown", "html", "docx")
+MAX_CACHED_PARSES = 256
+
+
+# ----------------------------------------------------------
+# Nodes
+# ----------------------------------------------------------
+@dataclass(frozen=True)
+class Run:
+    text: str
+    bold: bool = False
+    italic: bool = False
+    code: bool = False
+    href: str = None
+    src: str = None          # inline image; text is its alt text
+    raw: bool = False        # inline HTML passed through by Python-Markdown
+    field: str = None        # late-bound value, see module header
+
+
+@dataclass(frozen=True)
+class Heading:
+    level: int
+    runs: tuple
+
+
+@dataclass(frozen=True)
+class Paragraph:
+    runs: tuple
+
+
+@dataclass(frozen=True)
+class ListBlock:
+    ordered: bool
+    items: tuple             # one tuple of blocks per item
+    start: int = 1
+    loose: tuple = ()        # per item: leading paragraph wrapped in <p>
+
+
+@dataclass(frozen=True)
+class Quote:
+    blocks: tuple
+
+
+@dataclass(frozen=True)
+class CodeBlock:
+    text: str
+
+
+@dataclass(frozen=True)
+class Rule:
+    pass
+
+
+@dataclass(frozen=True)
+class Image:
+    src: str
+    alt: str = ""
+    title: str = ""
+    caption: str = ""
+
+
+@dataclass(frozen=True)
+class FactBox:
+    title: str
+    blocks: tuple
+
+
+@dataclass(frozen=True)
+class PullQuote:
+    text: str
+    attribution: str = ""
+
+
+@dataclass(frozen=True)
+class RawHtml:
+    html: str
+
+
+@dataclass(frozen=True)
+class Document:
+    title: str = ""
+    subtitle: str = ""
+    blocks: tuple = ()
+
+
+LINE_BREAK = "\u2028"        # hard break (<br />) inside a run
+
+
+def run_text(run, fields=None):
+    if run.field and fields and run.field in fields:
+        return str(fields[run.field])
+    return run.text
+
+
+def plain_text(runs, fields=None):
+    return "".join(run_text(r, fields) for r in runs)
+
+
+# ----------------------------------------------------------
+# Markdown -> AST
+# ----------------------------------------------------------
+class _CaptureTree(Treeprocessor):
+    """Registered last: keeps the finished element tree for folding."""
+
+    def run(self, root):
+        self.md.rw_tree = root
+
+
+_MD = markdown.Markdown()
+_MD.treeprocessors.register(_CaptureTree(_MD), "rw_capture", -100)
+_MD_LOCK = threading.Lock()
+
+_PARSES = OrderedDict()     # document digest -> blocks
+_PARSES_LOCK = threading.Lock()
+
+_STASH_RE = re.compile("\x02wzxhzdk:(\\d+)\x03")
+_HEADINGS = {f"h{i}": i for i in range(1, 7)}
+_BLOCK_TAGS = {"p", "ul", "ol", "li", "blockquote", "pre", "hr", "div", *_HEADINGS}
+_ENTITY_RE = re.compile(r"&(#\d+|#[xX][0-9a-fA-F]+|\w+);")
+
+
+def _text_runs(text, fmt, runs, stash):
+    """Runs for element text, undoing Python-Markdown's placeholders."""
+    if AMP_SUBSTITUTE in text:
+        text = html.unescape(text.replace(AMP_SUBSTITUTE, "&"))
+    pos = 0
+    for m in _STASH_RE.finditer(text):
+        if m.start() > pos:
+            runs.append(Run(text[pos:m.start()], **fmt))
+        raw = stash[int(m.group(1))]
+        if _ENTITY_RE.fullmatch(raw):
+            runs.append(Run(html.unescape(raw), **fmt))
+        else:
+            runs.append(Run(raw, raw=True, **fmt))
+        pos = m.end()
+    if pos < len(text):
+        runs.append(Run(text[pos:], **fmt))
+
+
+def _walk_inline(node, fmt, runs, stash):
+    """Append Runs for node's content (not its tail)."""
+    tag = node.tag
+    if tag in ("strong", "b"):
+        fmt = {**fmt, "bold": True}
+    elif tag in ("em", "i"):
+        fmt = {**fmt, "italic": True}
+    elif tag == "a":
+        fmt = {**fmt, "href": node.get("href")}
+
+    if tag == "code":
+        runs.append(Run(html.unescape(node.text or ""), code=True, **fmt))
+    elif tag == "br":
+        runs.append(Run(LINE_BREAK, **fmt))
+    elif tag == "img":
+        runs.append(Run(node.get("alt", ""), src=node.get("src"), **fmt))
+    else:
+        if node.text:
+            _text_runs(node.text, fmt, runs, stash)
+        for child in node:
+            _walk_inline(child, fmt, runs, stash)
+            if child.tail:
+                _text_runs(child.tail, fmt, runs, stash)
+
+
+def _finish(runs, strip=False):
+    """Merge adjacent same-format runs; optionally trim outer whitespace."""
+    merged = []
+    for r in runs:
+        prev = merged[-1] if merged else None
+        if (prev and not r.src and not prev.src
+                and (prev.bold, prev.italic, prev.code, prev.href, prev.raw) == (r.bold, r.italic, r.code, r.href, r.raw)):
+            merged[-1] = replace(prev, text=prev.text + r.text)
+        else:
+            merged.append(r)
+    if strip and merged:
+        if not merged[0].src:
+            merged[0] = replace(merged[0], text=merged[0].text.lstrip())
+        if not merged[-1].src:
+            merged[-1] = replace(merged[-1], text=merged[-1].text.rstrip())
+    return tuple(r for r in merged if r.text or r.src)
+
+
+def _runs(el, stash):
+    runs = []
+    _walk_inline(el, {}, runs, stash)
+    return _finish(runs)
+
+
+def _block(el, stash):
+    """One AST block for a block-level element (None if empty)."""
+    tag = el.tag
+    if tag in _HEADINGS:
+        return Heading(_HEADINGS[tag], _runs(el, stash))
+    if tag == "hr":
+        return Rule()
+    if tag == "pre":
+        code = el.find("code")
+        return CodeBlock(html.unescape((code if code is not None else el).text or ""))
+    if tag == "blockquote":
+        return Quote(_blocks(el, stash))
+    if tag in ("ul", "ol"):
+        items = [li for li in el if li.tag == "li"]
+        loose = tuple(bool(len(li) and li[0].tag == "p" and not (li.text or "").strip()) for li in items)
+        return ListBlock(tag == "ol", tuple(_blocks(li, stash) for li in items), int(el.get("start", 1)), loose)
+    if tag == "p":
+        text = (el.text or "").strip()
+        raw = _STASH_RE.fullmatch(text)
+        if raw and not len(el):
+            return RawHtml(stash[int(raw.group(1))])
+        if not text and len(el) == 1 and el[0].tag == "img" and not (el[0].tail or "").strip():
+            img = el[0]
+            return Image(img.get("src", ""), img.get("alt", ""), img.get("title") or "")
+    runs = _runs(el, stash)
+    return Paragraph(runs) if runs else None
+
+
+def _blocks(container, stash):
+    """Blocks inside a container; loose inline content becomes a Paragraph."""
+    out, pending = [], []
+
+    def flush():
+        runs = _finish(pending, strip=True)
+        if runs:
+            out.append(Paragraph(runs))
+        pending.clear()
+
+    if container.text:
+        _text_runs(container.text, {}, pending, stash)
+    for child in container:
+        if child.tag in _BLOCK_TAGS:
+            flush()
+            block = _block(child, stash)
+            if block is not None:
+                out.append(block)
+        else:
+            _walk_inline(child, {}, pending, stash)
+        if child.tail:
+            _text_runs(child.tail, {}, pending, stash)
+    flush()
+    return tuple(out)
+
+
+def parse_markdown(text):
+    """AST blocks for a Markdown string, parsed once per content hash."""
+    doc = get_document(text)
+    with _PARSES_LOCK:
+        hit = _PARSES.get(doc.digest)
+        if hit is not None:
+            _PARSES.move_to_end(doc.digest)
+            return hit
+
+    with _MD_LOCK:
+        _MD.reset()
+        _MD.convert(doc.text)
+        stash = list(_MD.htmlStash.rawHtmlBlocks)
+        blocks = _blocks(_MD.rw_tree, stash)
+
+    with _PARSES_LOCK:
+        _PARSES[doc.digest] = blocks
+        if len(_PARSES) > MAX_CACHED_PARSES:
+            _PARSES.popitem(last=False)
+    return blocks
+
+
+def clear_parse_cache():
+    with _PARSES_LOCK:
+        _PARSES.clear()
+
+
+# ----------------------------------------------------------
+# Draft + YAML -> Document
+# ----------------------------------------------------------
+def _pull_quote(item):
+    if isinstance(item, dict):
+        return PullQuote(str(item.get("text", "")).strip(), str(item.get("attribution", "") or "").strip())
+    return PullQuote(str(item).strip())
+
+
+def _with_pull_quotes(blocks, quotes):
+    """Spread pull quotes evenly between top-level paragraphs."""
+    if not quotes:
+        return blocks
+    anchors = [i for i, b in enumerate(blocks) if isinstance(b, Paragraph)]
+    if not anchors:
+        return blocks + tuple(quotes)
+    after = {}
+    for n, quote in enumerate(quotes):
+        slot = anchors[min(len(anchors) - 1, (n + 1) * len(anchors) // (len(quotes) + 1))]
+        after.setdefault(slot, []).append(quote)
+    out = []
+    for i, block in enumerate(blocks):
+        out.append(block)
+        out.extend(after.get(i, ()))
+    return tuple(out)
+
+
+def build_document(draft, data=None, title=None, subtitle=None):
+    """
+    Document for a draft body plus its YAML (pull_quotes, images,
+    fact_boxes as stored by write_engine). Pull quotes are spread
+    through the body; images and fact boxes follow it.
+    """
+    data = data or {}
+    title = title if title is not None else str(data.get("title", "") or "")
+    subtitle = subtitle if subtitle is not None else str(data.get("subtitle") or data.get("summary") or "")
+
+    quotes = [q for q in map(_pull_quote, data.get("pull_quotes") or []) if q.text]
+    blocks = _with_pull_quotes(parse_markdown(draft), quotes)
+
+    extras = []
+    for img in data.get("images") or []:
+        if isinstance(img, dict) and img.get("src"):
+            caption = str(img.get("caption", "") or "")
+            extras.append(Image(str(img["src"]), str(img.get("alt", caption) or ""), caption=caption))
+    for box in data.get("fact_boxes") or []:
+        if isinstance(box, dict):
+            extras.append(FactBox(str(box.get("title", "") or ""), parse_markdown(str(box.get("content", "") or ""))))
+
+    return Document(title, subtitle, blocks + tuple(extras))
+
+
+# ----------------------------------------------------------
+# Backend: Markdown
+# ----------------------------------------------------------
+_MD_SPECIAL = re.compile(r"([\\`*_\[\]])")
+
+
+def _md_inline(runs, fields):
+    out = []
+    for r in runs:
+        text = run_text(r, fields)
+        if r.src:
+            alt = _MD_SPECIAL.sub(r"\\\1", text)
+            out.append(f"![{alt}]({r.src})")
+            continue
+        if r.raw:
+            out.append(text)
+            continue
+        if r.code:
+            fence = "``" if "`" in text else "`"
+            piece = f"{fence}{text}{fence}"
+        else:
+            piece = _MD_SPECIAL.sub(r"\\\1", text).replace(LINE_BREAK + "\n", LINE_BREAK).replace(LINE_BREAK, "  \n")
+            core = piece.strip()
+            if core and (r.bold or r.italic):
+                marks = ("**" if r.bold else "") + ("*" if r.italic else "")
+                lead = piece[:len(piece) - len(piece.lstrip())]
+                trail = piece[len(piece.rstrip()):]
+                piece = f"{lead}{marks}{core}{marks[::-1]}{trail}"
+        if r.href:
+            piece = f"[{piece}]({r.href})"
+        out.append(piece)
+    return "".join(out)
+
+
+def _indent(text, prefix, first=None):
+    lines = text.split("\n")
+    first = prefix if first is None else first
+    return "\n".join([first + lines[0]] + [(prefix + l) if l else l for l in lines[1:]])
+
+
+def _md_block(block, fields):
+    if isinstance(block, Heading):
+        return "#" * block.level + " " + _md_inline(block.runs, fields)
+    if isinstance(block, Paragraph):
+        return _md_inline(block.runs, fields)
+    if isinstance(block, ListBlock):
+        items = []
+        for n, item in enumerate(block.items):
+            marker = f"{block.start + n}. " if block.ordered else "- "
+            loose = block.loose[n] if n < len(block.loose) else False
+            body = _md_blocks(item, fields, "\n\n" if loose else "\n")
+            items.append(_indent(body, "    ", marker))
+        return ("\n\n" if any(block.loose) else "\n").join(items)
+    if isinstance(block, Quote):
+        return _indent(_md_blocks(block.blocks, fields), "> ").replace("\n\n", "\n>\n")
+    if isinstance(block, CodeBlock):
+        return _indent(block.text.rstrip("\n"), "    ")
+    if isinstance(block, Rule):
+        return "---"
+    if isinstance(block, Image):
+        title = f' "{block.title or block.caption}"' if (block.title or block.caption) else ""
+        return f"![{block.alt or block.caption}]({block.src}{title})"
+    if isinstance(block, FactBox):
+        inner = f"**{block.title}**\n\n" + _md_blocks(block.blocks, fields)
+        return _indent(inner.rstrip(), "> ").replace("\n\n", "\n>\n")
+    if isinstance(block, PullQuote):
+        inner = f"*“{block.text}”*"
+        if block.attribution:
+            inner += f"  \n— {block.attribution}"
+        return _indent(inner, "> ")
+    if isinstance(block, RawHtml):
+        return block.html
+    return ""
+
+
+def _md_blocks(blocks, fields, sep="\n\n"):
+    return sep.join(filter(None, (_md_block(b, fields) for b in blocks)))
+
+
+def render_markdown(doc, fields=None):
+    """Markdown for a Document (or a bare tuple of blocks)."""
+    blocks = doc.blocks if isinstance(doc, Document) else doc
+    return _md_blocks(blocks, fields) + "\n"
+
+
+# ----------------------------------------------------------
+# Backend: HTML (fragment, XHTML-style like Python-Markdown)
+# ----------------------------------------------------------
+def _esc(text):
+    return html.escape(text, quote=False)
+
+
+def _attr(text):
+    return html.escape(text or "", quote=True)
+
+
+def _html_inline(runs, fields):
+    out = []
+    for r in runs:
+        text = run_text(r, fields)
+        if r.src:
+            piece = f'<img alt="{_attr(text)}" src="{_attr(r.src)}" />'
+        elif r.raw:
+            piece = text
+        else:
+            piece = f"<code>{_esc(text)}</code>" if r.code else _esc(text).replace(LINE_BREAK, "<br />")
+            if r.italic:
+                piece = f"<em>{piece}</em>"
+            if r.bold:
+                piece = f"<strong>{piece}</strong>"
+        if r.href:
+            piece = f'<a href="{_attr(r.href)}">{piece}</a>'
+        out.append(piece)
+    return "".join(out)
+
+
+def _html_block(block, fields, tight=False):
+    if isinstance(block, Heading):
+        return f"<h{block.level}>{_html_inline(block.runs, fields)}</h{block.level}>"
+    if isinstance(block, Paragraph):
+        inner = _html_inline(block.runs, fields)
+        return inner if tight else f"<p>{inner}</p>"
+    if isinstance(block, ListBlock):
+        tag = "ol" if block.ordered else "ul"
+        start = f' start="{block.start}"' if block.ordered and block.start != 1 else ""
+        items = []
+        for n, item in enumerate(block.items):
+            loose = block.loose[n] if n < len(block.loose) else False
+            if not loose and item and isinstance(item[0], Paragraph):
+                head = _html_block(item[0], fields, tight=True)
+                rest = _html_blocks(item[1:], fields)
+                items.append(f"<li>{head}" + (f"\n{rest}\n" if rest else "") + "</li>")
+            else:
+                items.append(f"<li>\n{_html_blocks(item, fields)}\n</li>")
+        return f"<{tag}{start}>\n" + "\n".join(items) + f"\n</{tag}>"
+    if isinstance(block, Quote):
+        return f"<blockquote>\n{_html_blocks(block.blocks, fields)}\n</blockquote>"
+    if isinstance(block, CodeBlock):
+        return f"<pre><code>{_esc(block.text)}</code></pre>"
+    if isinstance(block, Rule):
+        return "<hr />"
+    if isinstance(block, Image):
+        title = block.title or ""
+        img = f'<img alt="{_attr(block.alt)}" src="{_attr(block.src)}"' + (f' title="{_attr(title)}"' if title else "") + " />"
+        if block.caption:
+            return f"<figure>\n{img}\n<figcaption>{_esc(block.caption)}</figcaption>\n</figure>"
+        return f"<p>{img}</p>"
+    if isinstance(block, FactBox):
+        body = _html_blocks(block.blocks, fields)
+        return f'<aside class="fact-box">\n<h4>{_esc(block.title)}</h4>\n{body}\n</aside>'
+    if isinstance(block, PullQuote):
+        cite = f"\n<footer>— {_esc(block.attribution)}</footer>" if block.attribution else ""
+        return f'<blockquote class="pull-quote">\n<p>{_esc(block.text)}</p>{cite}\n</blockquote>'
+    if isinstance(block, RawHtml):
+        return block.html
+    return ""
+
+
+def _html_blocks(blocks, fields):
+    return "\n".join(filter(None, (_html_block(b, fields) for b in blocks)))
+
+
+def render_html(doc, fields=None):
+    """HTML fragment for a Document (or a bare tuple of blocks)."""
+    blocks = doc.blocks if isinstance(doc, Document) else doc
+    return _html_blocks(blocks, fields)
+
+
+# ----------------------------------------------------------
+# All formats from one parse
+# ----------------------------------------------------------
+_EXECUTOR = ThreadPoolExecutor(max_workers=len(FORMATS), thread_name_prefix="rw-render")
+
+
+def _backend(fmt):
+    if fmt == "markdown":
+        return render_markdown
+    if fmt == "html":
+        return render_html
+    if fmt == "docx":
+        from app.refactor_regions.export_logic.docx_builder import build_docx
+        return build_docx
+    raise ValueError(f"Unknown export format: {fmt}")
+
+
+def render_all(doc, formats=FORMATS, fields=None):
+    """{format: output} for one Document, backends run concurrently."""
+    futures = {fmt: _EXECUTOR.submit(_backend(fmt), doc, fields=fields) for fmt in formats}
+    return {fmt: f.result() for fmt, f in futures.items()}
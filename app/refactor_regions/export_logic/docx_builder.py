@@ -1,21 +1,521 @@
+# ==========================================================
+#  Export — DOCX backend
+#  Walks the document AST (export_logic.document_ast) into a
+#  python-docx document with real structure: Heading styles,
+#  bullet / numbered lists (numbering restarts per list),
+#  Quote styles, bold / italic / code runs, hyperlinks,
+#  pictures with captions and boxed fact boxes.
+#
+#  Two writers produce the same structure:
+#    bulk_document    WordprocessingML built as text and parsed
+#                     into a clone of a cached base template in
+#                     one pass (used by build_docx / _file)
+#    write_document   python-docx object API, one call per
+#                     paragraph / run (reference implementation)
+#
+#  The base template (templates/export_base.docx if present,
+#  else python-docx's default) is read once per process; its
+#  style ids are resolved once.
+#
+#  Pictures are embedded only for image files under
+#  IMAGE_ROOTS (the same check as the single-file HTML export);
+#  anything else becomes an "[Image: ...]" placeholder.
+# ==========================================================
+
+import html
+import re
+import threading
+from io import BytesIO
+
 from docx import Document
+from docx.enum.text import WD_BREAK
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml import OxmlElement
+from docx.oxml.ns import nsdecls, qn
+from docx.oxml.parser import parse_xml
+from docx.shared import Inches, RGBColor
+from docx.text.paragraph import Paragraph as DocxParagraph
 
-def build_docx_file(title, subtitle, sections):
-    document = Document()
+from app.refactor_regions.export_logic.document_ast import (
+    LINE_BREAK,
+    CodeBlock,
+    Document as AstDocument,
+    FactBox,
+    Heading,
+    Image,
+    ListBlock,
+    Paragraph,
+    PullQuote,
+    Quote,
+    RawHtml,
+    Rule,
+    Run,
+    parse_markdown,
+    run_text,
+)
+from app.refactor_regions.export_logic.html_inline import PROJECT_ROOT, local_image
 
-    # Title
-    document.add_heading(title, level=1)
+CODE_FONT = "Courier New"
+LINK_COLOR = RGBColor(0x05, 0x63, 0xC1)
+IMAGE_WIDTH = Inches(5.5)
+MAX_LIST_DEPTH = 3
 
-    # Subtitle
-    if subtitle:
-        document.add_heading(subtitle, level=2)
+BASE_TEMPLATE = PROJECT_ROOT / "templates" / "export_base.docx"
+IMAGE_ROOTS = (PROJECT_ROOT,)
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_XML_INVALID_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")     # rejected by lxml
+
+
+def _strip_html(text):
+    return html.unescape(_TAG_RE.sub("", text))
+
+
+# ----------------------------------------------------------
+# Inline runs
+# ----------------------------------------------------------
+def _hyperlink(paragraph, run, href, links):
+    """Move `run` inside a w:hyperlink pointing at `href`."""
+    # part.relate_to() scans every relationship per call (quadratic on
+    # link-heavy drafts); keep our own href -> rId map instead.
+    r_id = links.get(href)
+    if r_id is None:
+        r_id = links[href] = f"rIdLink{len(links) + 1}"
+        paragraph.part.rels.add_relationship(RT.HYPERLINK, href, r_id, is_external=True)
+    link = OxmlElement("w:hyperlink")
+    link.set(qn("r:id"), r_id)
+    run._r.addprevious(link)
+    link.append(run._r)
+    run.font.underline = True
+    run.font.color.rgb = LINK_COLOR
+
+
+def _add_runs(paragraph, runs, fields, links):
+    for r in runs:
+        text = run_text(r, fields)
+        if r.raw:
+            text = _strip_html(text)
+        elif r.src:
+            text = f"[{text or 'image'}]"
+        if not r.code:
+            text = text.replace("\n", " ")
+        text = _XML_INVALID_RE.sub("", text)
+
+        for i, part in enumerate(text.split(LINE_BREAK)):
+            run = paragraph.add_run()
+            if i:
+                run.add_break(WD_BREAK.LINE)
+            if part:
+                run.add_text(part)
+            if r.bold:
+                run.bold = True
+            if r.italic or r.src:
+                run.italic = True
+            if r.code:
+                run.font.name = CODE_FONT
+            if r.href:
+                _hyperlink(paragraph, run, r.href, links)
+
+
+# ----------------------------------------------------------
+# Lists (each ordered list gets its own w:num so it restarts)
+# ----------------------------------------------------------
+def _list_style(ordered, depth):
+    base = "List Number" if ordered else "List Bullet"
+    depth = min(depth, MAX_LIST_DEPTH)
+    return base if depth == 1 else f"{base} {depth}"
+
+
+def _restart_numbering(document, style_name, start):
+    """New w:num sharing the style's abstract numbering, starting at `start`."""
+    style = document.styles[style_name]
+    num_id = style.element.pPr.numPr.numId.val
+    numbering = document.part.numbering_part.element
+    abstract_id = numbering.num_having_numId(num_id).abstractNumId.val
+
+    num = numbering.add_num(abstract_id)
+    override = num.add_lvlOverride(ilvl=0)
+    override.add_startOverride(start)
+    return num.numId
+
+
+def _set_num(paragraph, num_id):
+    numPr = paragraph._p.get_or_add_pPr().get_or_add_numPr()
+    numPr.get_or_add_ilvl().val = 0
+    numPr.get_or_add_numId().val = num_id
+
+
+# ----------------------------------------------------------
+# Blocks
+# ----------------------------------------------------------
+class _Writer:
+    def __init__(self, document, fields=None, report=None, total=0):
+        self.document = document
+        self.fields = fields
+        self.report = report
+        self.total = max(1, total)
+        self.done = 0
+        self.links = {}     # href -> relationship id
+
+    def _tick(self):
+        self.done += 1
+        if self.report and self.done % 200 == 0:
+            self.report(0.1 + 0.7 * min(1.0, self.done / self.total), f"Writing blocks ({self.done:,})…")
+
+    def blocks(self, container, blocks, style=None, depth=0):
+        for block in blocks:
+            self.block(container, block, style, depth)
+            self._tick()
+
+    def block(self, container, block, style=None, depth=0):
+        fields = self.fields
+        if isinstance(block, Heading):
+            p = container.add_paragraph(style=f"Heading {min(max(block.level, 1), 9)}")
+            _add_runs(p, block.runs, fields, self.links)
+        elif isinstance(block, Paragraph):
+            p = container.add_paragraph(style=style)
+            _add_runs(p, block.runs, fields, self.links)
+        elif isinstance(block, ListBlock):
+            self.list(container, block, depth + 1)
+        elif isinstance(block, Quote):
+            self.blocks(container, block.blocks, "Quote", depth)
+        elif isinstance(block, CodeBlock):
+            p = container.add_paragraph(style="No Spacing")
+            _add_runs(p, (Run(block.text.rstrip("\n").replace("\n", LINE_BREAK), code=True),), fields, self.links)
+        elif isinstance(block, Rule):
+            self.rule(container)
+        elif isinstance(block, Image):
+            self.image(container, block)
+        elif isinstance(block, FactBox):
+            self.fact_box(container, block)
+        elif isinstance(block, PullQuote):
+            p = container.add_paragraph(style="Intense Quote")
+            p.add_run(f"“{block.text}”")
+            if block.attribution:
+                p.add_run().add_break(WD_BREAK.LINE)
+                p.add_run(f"— {block.attribution}").italic = True
+        elif isinstance(block, RawHtml):
+            text = _strip_html(block.html).strip()
+            if text:
+                container.add_paragraph(text, style=style)
+
+    def list(self, container, block, depth):
+        style = _list_style(block.ordered, depth)
+        num_id = _restart_numbering(self.document, style, block.start) if block.ordered else None
+        for item in block.items:
+            first = True
+            for child in item:
+                if first and isinstance(child, Paragraph):
+                    p = container.add_paragraph(style=style)
+                    if num_id is not None:
+                        _set_num(p, num_id)
+                    _add_runs(p, child.runs, self.fields, self.links)
+                else:
+                    self.block(container, child, None, depth)
+                first = False
+            if not item:
+                container.add_paragraph(style=style)
+
+    def rule(self, container):
+        p = container.add_paragraph()
+        border = OxmlElement("w:pBdr")
+        bottom = OxmlElement("w:bottom")
+        for key, value in (("w:val", "single"), ("w:sz", "6"), ("w:space", "1"), ("w:color", "auto")):
+            bottom.set(qn(key), value)
+        border.append(bottom)
+        p._p.get_or_add_pPr().append(border)
+
+    def image(self, container, block):
+        p = container.add_paragraph()
+        path = local_image(block.src, IMAGE_ROOTS)
+        if path is not None:
+            try:
+                p.add_run().add_picture(str(path), width=IMAGE_WIDTH)
+            except Exception:
+                p.add_run(f"[Image: {block.src}]").italic = True
+        else:
+            p.add_run(f"[Image: {block.alt or block.src}]").italic = True
+        caption = block.caption or block.title
+        if caption:
+            container.add_paragraph(caption, style="Caption")
+
+    def fact_box(self, container, block):
+        table = container.add_table(rows=1, cols=1)
+        table.style = "Table Grid"
+        cell = table.cell(0, 0)
+        title = cell.paragraphs[0]
+        title.add_run(block.title or "Fact box").bold = True
+        self.blocks(cell, block.blocks)
+        container.add_paragraph()
+
+
+# ----------------------------------------------------------
+# Bulk writer: WordprocessingML text -> one parse into a clone
+# ----------------------------------------------------------
+_BASE_LOCK = threading.Lock()
+_BASE = {}      # "bytes" -> template package, "styles" -> name -> style id
+
+_PICTURE_MARK = "\ue001picture:{}\ue001"
+
+_STYLE_NAMES = (
+    *(f"Heading {i}" for i in range(1, 10)),
+    "List Bullet", "List Bullet 2", "List Bullet 3",
+    "List Number", "List Number 2", "List Number 3",
+    "Quote", "Intense Quote", "Caption", "No Spacing", "Table Grid",
+)
 
-    # Sections
-    for header, text in sections:
-        document.add_heading(header, level=2)
 
-        for line in (text or "").split("\n"):
-            if line.strip():
-                document.add_paragraph(line)
+def _base_template():
+    """(fresh python-docx Document cloned from the cached base, style ids)."""
+    with _BASE_LOCK:
+        if not _BASE:
+            if BASE_TEMPLATE.is_file():
+                data = BASE_TEMPLATE.read_bytes()
+            else:
+                buffer = BytesIO()
+                Document().save(buffer)
+                data = buffer.getvalue()
+            base = Document(BytesIO(data))
+            styles = {}
+            for name in _STYLE_NAMES:
+                try:
+                    styles[name] = base.styles[name].style_id
+                except KeyError:
+                    pass
+            _BASE["bytes"], _BASE["styles"] = data, styles
+        return Document(BytesIO(_BASE["bytes"])), _BASE["styles"]
 
+
+def _x(text):
+    return html.escape(_XML_INVALID_RE.sub("", text), quote=False)
+
+
+def _xa(text):
+    return html.escape(_XML_INVALID_RE.sub("", text), quote=True)
+
+
+class _BulkWriter:
+    def __init__(self, document, styles, fields=None):
+        self.document = document
+        self.styles = styles
+        self.fields = fields
+        self.links = {}         # href -> relationship id
+        self.pictures = {}      # marker -> (image path, src), placed after the parse
+        self.out = []
+
+    # -- inline -------------------------------------------------
+    def _run(self, text, bold=False, italic=False, code=False, link=False):
+        props = []
+        if code:
+            props.append(f'<w:rFonts w:ascii="{CODE_FONT}" w:hAnsi="{CODE_FONT}"/>')
+        if bold:
+            props.append("<w:b/>")
+        if italic:
+            props.append("<w:i/>")
+        if link:
+            props.append(f'<w:color w:val="{LINK_COLOR}"/><w:u w:val="single"/>')
+        rpr = f"<w:rPr>{''.join(props)}</w:rPr>" if props else ""
+        # one run per hard-break segment, the break leading, as the object API writes it
+        return "".join(
+            f"<w:r>{rpr}{'<w:br/>' if i else ''}" + (f'<w:t xml:space="preserve">{_x(part)}</w:t>' if part else "") + "</w:r>"
+            for i, part in enumerate(text.split(LINE_BREAK))
+        )
+
+    def _link_id(self, href):
+        r_id = self.links.get(href)
+        if r_id is None:
+            r_id = self.links[href] = f"rIdLink{len(self.links) + 1}"
+            self.document.part.rels.add_relationship(RT.HYPERLINK, href, r_id, is_external=True)
+        return r_id
+
+    def runs(self, runs):
+        out = []
+        for r in runs:
+            text = run_text(r, self.fields)
+            if r.raw:
+                text = _strip_html(text)
+            elif r.src:
+                text = f"[{text or 'image'}]"
+            if not r.code:
+                text = text.replace("\n", " ")
+            run = self._run(text, r.bold, r.italic or bool(r.src), r.code, bool(r.href))
+            if r.href:
+                run = f'<w:hyperlink r:id="{self._link_id(r.href)}">{run}</w:hyperlink>'
+            out.append(run)
+        return "".join(out)
+
+    # -- blocks -------------------------------------------------
+    def p(self, content="", style=None, num_id=None, border=False):
+        ppr = []
+        if style:
+            ppr.append(f'<w:pStyle w:val="{self.styles.get(style, style)}"/>')
+        if num_id is not None:
+            ppr.append(f'<w:numPr><w:ilvl w:val="0"/><w:numId w:val="{num_id}"/></w:numPr>')
+        if border:
+            ppr.append('<w:pBdr><w:bottom w:val="single" w:sz="6" w:space="1" w:color="auto"/></w:pBdr>')
+        self.out.append(f"<w:p>{'<w:pPr>' + ''.join(ppr) + '</w:pPr>' if ppr else ''}{content}</w:p>")
+
+    def blocks(self, blocks, style=None, depth=0):
+        for block in blocks:
+            self.block(block, style, depth)
+
+    def block(self, block, style=None, depth=0):
+        if isinstance(block, Heading):
+            self.p(self.runs(block.runs), f"Heading {min(max(block.level, 1), 9)}")
+        elif isinstance(block, Paragraph):
+            self.p(self.runs(block.runs), style)
+        elif isinstance(block, ListBlock):
+            self.list(block, depth + 1)
+        elif isinstance(block, Quote):
+            self.blocks(block.blocks, "Quote", depth)
+        elif isinstance(block, CodeBlock):
+            self.p(self._run(block.text.rstrip("\n").replace("\n", LINE_BREAK), code=True), "No Spacing")
+        elif isinstance(block, Rule):
+            self.p(border=True)
+        elif isinstance(block, Image):
+            self.image(block)
+        elif isinstance(block, FactBox):
+            self.fact_box(block)
+        elif isinstance(block, PullQuote):
+            content = self._run(f"“{block.text}”")
+            if block.attribution:
+                content += "<w:r><w:br/></w:r>" + self._run(f"— {block.attribution}", italic=True)
+            self.p(content, "Intense Quote")
+        elif isinstance(block, RawHtml):
+            text = _strip_html(block.html).strip()
+            if text:
+                self.p(self._run(text), style)
+
+    def list(self, block, depth):
+        style = _list_style(block.ordered, depth)
+        num_id = _restart_numbering(self.document, style, block.start) if block.ordered else None
+        for item in block.items:
+            if not item:
+                self.p("", style, num_id)
+            for n, child in enumerate(item):
+                if n == 0 and isinstance(child, Paragraph):
+                    self.p(self.runs(child.runs), style, num_id)
+                else:
+                    self.block(child, None, depth)
+
+    def image(self, block):
+        path = local_image(block.src, IMAGE_ROOTS)
+        if path is not None:
+            marker = _PICTURE_MARK.format(len(self.pictures))
+            self.pictures[marker] = (path, block.src)
+            self.p(self._run(marker))
+        else:
+            self.p(self._run(f"[Image: {block.alt or block.src}]", italic=True))
+        caption = block.caption or block.title
+        if caption:
+            self.p(self._run(caption), "Caption")
+
+    def fact_box(self, block):
+        outer, self.out = self.out, []
+        self.p(self._run(block.title or "Fact box", bold=True))
+        self.blocks(block.blocks)
+        cell, self.out = "".join(self.out), outer
+        style = self.styles.get("Table Grid", "TableGrid")
+        self.out.append(
+            f'<w:tbl><w:tblPr><w:tblStyle w:val="{style}"/><w:tblW w:type="auto" w:w="0"/>'
+            f'<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" '
+            f'w:noHBand="0" w:noVBand="1" w:val="04A0"/></w:tblPr>'
+            f'<w:tblGrid><w:gridCol w:w="{int(IMAGE_WIDTH.twips)}"/></w:tblGrid>'
+            f'<w:tr><w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{int(IMAGE_WIDTH.twips)}"/></w:tcPr>{cell}</w:tc></w:tr></w:tbl>'
+        )
+        self.p()
+
+    # -- assembly -----------------------------------------------
+    def insert(self):
+        """Parse the collected XML once and place it before the body's sectPr."""
+        body = self.document.element.body
+        fragment = parse_xml(f'<w:body {nsdecls("w", "r")}>{"".join(self.out)}</w:body>')
+        anchor = body.sectPr
+        for child in list(fragment):
+            if anchor is not None:
+                anchor.addprevious(child)
+            else:
+                body.append(child)
+        self._place_pictures(body)
+
+    def _place_pictures(self, body):
+        if not self.pictures:
+            return
+        # one scan for every marker, then edit the tree
+        found = [t for t in body.iter(qn("w:t")) if t.text in self.pictures]
+        for t in found:
+            path, src = self.pictures[t.text]
+            p_el = t.getparent().getparent()
+            p_el.remove(t.getparent())
+            paragraph = DocxParagraph(p_el, self.document._body)
+            try:
+                paragraph.add_run().add_picture(str(path), width=IMAGE_WIDTH)
+            except Exception:
+                paragraph.add_run(f"[Image: {src}]").italic = True
+
+
+def bulk_document(ast, fields=None, report=None):
+    """python-docx Document for an AST Document, built in one XML pass."""
+    report = report or (lambda fraction, message="": None)
+    document, styles = _base_template()
+    if ast.title:
+        document.core_properties.title = ast.title
+    if ast.subtitle:
+        document.core_properties.subject = ast.subtitle
+
+    writer = _BulkWriter(document, styles, fields)
+    writer.blocks(ast.blocks)
+    report(0.5, "Assembling document XML…")
+    writer.insert()
+    return document
+
+
+def _count_blocks(blocks):
+    n = 0
+    for b in blocks:
+        n += 1
+        if isinstance(b, (Quote, FactBox)):
+            n += _count_blocks(b.blocks)
+        elif isinstance(b, ListBlock):
+            n += sum(_count_blocks(item) for item in b.items)
+    return n
+
+
+def write_document(ast, fields=None, report=None):
+    """python-docx Document for an AST Document."""
+    document = Document()
+    if ast.title:
+        document.core_properties.title = ast.title
+    if ast.subtitle:
+        document.core_properties.subject = ast.subtitle
+    _Writer(document, fields, report, _count_blocks(ast.blocks)).blocks(document, ast.blocks)
     return document
+
+
+# ----------------------------------------------------------
+# Entry points
+# ----------------------------------------------------------
+def build_docx(ast, fields=None, report=None):
+    """
+    DOCX bytes for an AST Document. `report(fraction, message)` is
+    called between stages.
+    """
+    report = report or (lambda fraction, message="": None)
+    report(0.1, "Creating document…")
+    document = bulk_document(ast, fields, report)
+
+    report(0.8, "Serializing DOCX…")
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def build_docx_file(title, subtitle, sections):
+    """python-docx Document for (header, markdown) sections."""
+    blocks = [Heading(1, (Run(title),))]
+    if subtitle:
+        blocks.append(Heading(2, (Run(subtitle),)))
+    for header, text in sections:
+        blocks.append(Heading(2, (Run(header),)))
+        blocks.extend(parse_markdown(text or ""))
+    return bulk_document(AstDocument(title, subtitle or "", tuple(blocks)))
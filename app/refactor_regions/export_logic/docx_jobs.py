@@ -0,0 +1,146 @@
+# ==========================================================
+#  Export — DOCX Job Engine
+#  Builds DOCX files on demand, off the Streamlit script
+#  thread, and caches the bytes by the export key (a hash of
+#  the document's inputs). Browsing the Export tab never
+#  serializes a document; the download button receives cached
+#  bytes.
+#
+#  Late-bound fields (the "Generated" timestamp) are built in
+#  as placeholders and filled in when the bytes are fetched,
+#  like the MD / HTML export, so a cached file is never stale.
+# ==========================================================
+
+import io
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
+
+from app.refactor_regions.export_logic.docx_builder import build_docx
+
+MAX_CACHED_FILES = 8
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rw-docx")
+_LOCK = threading.Lock()
+_FILES = OrderedDict()     # key -> bytes, fields as placeholders
+_STAMPED = OrderedDict()   # (key, field values) -> bytes with the fields filled in
+_JOBS = {}                 # key -> DocxJob (in flight or finished)
+
+
+class DocxJob:
+    """Progress + outcome of one DOCX build. Safe to poll from the UI."""
+
+    def __init__(self, key):
+        self.key = key
+        self.status = "queued"     # queued | running | done | error
+        self.progress = 0.0
+        self.message = "Queued…"
+        self.data = None
+        self.error = None
+        self.cached = False
+        self.elapsed = 0.0
+
+    @property
+    def finished(self):
+        return self.status in ("done", "error")
+
+    def report(self, fraction, message=""):
+        self.progress = max(0.0, min(1.0, float(fraction)))
+        if message:
+            self.message = message
+
+
+def _remember(key, data):
+    with _LOCK:
+        _FILES[key] = data
+        _FILES.move_to_end(key)
+        while len(_FILES) > MAX_CACHED_FILES:
+            old_key, _ = _FILES.popitem(last=False)
+            _JOBS.pop(old_key, None)
+
+
+def _placeholder(name):
+    return f"\ue000{name}\ue000"
+
+
+def stamp_docx(data, fields):
+    """Fill the late-bound field placeholders in DOCX bytes."""
+    if not fields:
+        return data
+    src = zipfile.ZipFile(io.BytesIO(data))
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w") as dst:
+        for info in src.infolist():
+            part = src.read(info)
+            if info.filename.endswith(".xml"):
+                for name, value in fields.items():
+                    part = part.replace(_placeholder(name).encode("utf-8"), escape(str(value)).encode("utf-8"))
+            dst.writestr(info, part)
+    return out.getvalue()
+
+
+def _run(job, document, fields):
+    job.status = "running"
+    started = time.perf_counter()
+    try:
+        placeholders = {name: _placeholder(name) for name in fields or ()}
+        data = build_docx(document, placeholders, report=job.report)
+        _remember(job.key, data)
+        job.data = data
+        job.status = "done"
+        job.report(1.0, "DOCX ready.")
+    except Exception as e:
+        job.error = str(e)
+        job.status = "error"
+    finally:
+        job.elapsed = time.perf_counter() - started
+
+
+def cached_docx(key, fields=None):
+    """Cached bytes for this export key with `fields` filled in, or None."""
+    stamp = (key, tuple(sorted((fields or {}).items())))
+    with _LOCK:
+        data = _FILES.get(key)
+        if data is None:
+            return None
+        hit = _STAMPED.get(stamp)
+    if hit is None:
+        hit = stamp_docx(data, fields)
+        with _LOCK:
+            _STAMPED[stamp] = hit
+            while len(_STAMPED) > MAX_CACHED_FILES:
+                _STAMPED.popitem(last=False)
+    return hit
+
+
+def submit_docx(key, document, fields=None):
+    """
+    Start (or reuse) a DOCX build of an AST Document under `key`.
+    Returns the DocxJob; if the file is already cached the job
+    comes back finished. Only the names in `fields` are used here;
+    cached_docx() fills in their values.
+    """
+    with _LOCK:
+        existing = _JOBS.get(key)
+        if existing and existing.status != "error":
+            return existing
+
+        data = _FILES.get(key)
+        job = DocxJob(key)
+        _JOBS[key] = job
+        if data is not None:
+            _FILES.move_to_end(key)
+            job.status, job.progress, job.message = "done", 1.0, "Loaded from cache."
+            job.data, job.cached = data, True
+            return job
+
+    _EXECUTOR.submit(_run, job, document, fields)
+    return job
+
+
+def get_docx_job(key):
+    with _LOCK:
+        return _JOBS.get(key)
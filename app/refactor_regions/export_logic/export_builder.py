@@ -1,70 +1,101 @@
 # ==========================================================
 #  Export Builder — Markdown + HTML generator
 #  Modernized for 2025 modular panels
+#
+#  The export is assembled once as a document AST
+#  (export_logic.document_ast; section bodies are parsed once
+#  per content hash) and HTML / DOCX are rendered from it. The
+#  Markdown export keeps the sections' own Markdown, so it is
+#  byte-for-byte what the editor wrote. The AST and both
+#  renderings are cached per (sections, metadata) hash. The "Generated" timestamp is a late-bound
+#  field, substituted on return, so reruns and the Generate
+#  button reuse the cached output.
 # ==========================================================
 
-import markdown
+import hashlib
+import threading
+from collections import OrderedDict
 from datetime import datetime
+from html import escape
 
+from app.refactor_regions.export_logic.document_ast import (
+    Document,
+    Heading,
+    Paragraph,
+    Run,
+    parse_markdown,
+    render_all,
+)
 
-def build_export_output(sections: dict, metadata: dict):
-    """
-    sections = {
-        "final_draft": "...",
-        "insights": "...",
-        "rippletruth": "...",
-        "intent_metrics": "..."
-    }
+EXPORT_SECTIONS = (
+    ("final_draft", "Final Draft"),
+    ("insights", "Insights & Recommendations"),
+    ("rippletruth", "RippleTruth Report"),
+    ("intent_metrics", "Intention Metrics (FILS / UCIP / Drift)"),
+)
 
-    metadata = {
-        "title": "...",
-        "subtitle": "..."
-    }
-    """
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"
+MAX_CACHED_EXPORTS = 16
 
-    title = metadata.get("title", "Untitled Document")
-    subtitle = metadata.get("subtitle", "")
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+_TIMESTAMP = "\ue000generated\ue000"     # private-use sentinel for the late-bound field
 
-    # ------------------------------------------------------
-    # Build Markdown
-    # ------------------------------------------------------
-    md = f"# {title}\n"
-    if subtitle:
-        md += f"### {subtitle}\n"
-    md += f"**Generated:** {timestamp}  \n\n"
+_EXPORTS = OrderedDict()        # input digest -> (Document, md, html) with _TIMESTAMP
+_CACHE_LOCK = threading.Lock()
+
+
+def _lru_get(cache, key):
+    with _CACHE_LOCK:
+        hit = cache.get(key)
+        if hit is not None:
+            cache.move_to_end(key)
+        return hit
+
+
+def _lru_put(cache, key, value, limit):
+    with _CACHE_LOCK:
+        cache[key] = value
+        if len(cache) > limit:
+            cache.popitem(last=False)
 
-    # Final Draft
-    if sections.get("final_draft", "").strip():
-        md += "## Final Draft\n\n"
-        md += sections["final_draft"] + "\n\n"
 
-    # Insights
-    if sections.get("insights", "").strip():
-        md += "## Insights & Recommendations\n\n"
-        md += sections["insights"] + "\n\n"
+def _export_key(sections, title, subtitle):
+    h = hashlib.blake2b(digest_size=16)
+    for part in (title, subtitle, *(sections.get(key, "") or "" for key, _ in EXPORT_SECTIONS)):
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
 
-    # RippleTruth
-    if sections.get("rippletruth", "").strip():
-        md += "## RippleTruth Report\n\n"
-        md += sections["rippletruth"] + "\n\n"
 
-    # Intention Metrics
-    if sections.get("intent_metrics", "").strip():
-        md += "## Intention Metrics (FILS / UCIP / Drift)\n\n"
-        md += sections["intent_metrics"] + "\n\n"
+# ----------------------------------------------------------
+# Assembly
+# ----------------------------------------------------------
+def _assemble(sections, title, subtitle):
+    md = f"# {title}\n"
+    blocks = [Heading(1, (Run(title),))]
+    if subtitle:
+        md += f"### {subtitle}\n"
+        blocks.append(Heading(3, (Run(subtitle),)))
+    md += f"**Generated:** {_TIMESTAMP}  \n\n"
+    # the trailing hard-break spaces survive in Python-Markdown's HTML too
+    blocks.append(Paragraph((Run("Generated:", bold=True), Run(" "), Run(_TIMESTAMP, field="generated"), Run("  "))))
+
+    for key, heading in EXPORT_SECTIONS:
+        text = sections.get(key, "") or ""
+        if not text.strip():
+            continue
+        md += f"## {heading}\n\n" + text + "\n\n"
+        blocks.append(Heading(2, (Run(heading),)))
+        blocks.extend(parse_markdown(text))
 
-    # ------------------------------------------------------
-    # Convert Markdown → HTML
-    # ------------------------------------------------------
-    html_body = markdown.markdown(md)
+    doc = Document(title, subtitle, tuple(blocks))
+    html_body = render_all(doc, ("html",))["html"]
 
     html = f"""
     <!DOCTYPE html>
     <html>
     <head>
     <meta charset="UTF-8" />
-    <title>{title}</title>
+    <title>{escape(title)}</title>
     <style>
         body {{
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
@@ -82,4 +113,57 @@ def build_export_output(sections: dict, metadata: dict):
     </html>
     """
 
-    return md, html
+    return doc, md, html
+
+
+def _cached_export(sections, metadata):
+    title = metadata.get("title", "Untitled Document")
+    subtitle = metadata.get("subtitle", "")
+
+    key = _export_key(sections, title, subtitle)
+    cached = _lru_get(_EXPORTS, key)
+    if cached is None:
+        cached = _assemble(sections, title, subtitle)
+        _lru_put(_EXPORTS, key, cached, MAX_CACHED_EXPORTS)
+    return key, cached
+
+
+def timestamp_fields(timestamp=None):
+    return {"generated": (timestamp or datetime.now()).strftime(TIMESTAMP_FORMAT)}
+
+
+def export_document(sections: dict, metadata: dict):
+    """
+    (key, Document) for the export, shared with the MD / HTML
+    output. The key ignores the timestamp; pass
+    timestamp_fields() to backends to bind it.
+    """
+    key, (doc, _, _) = _cached_export(sections, metadata)
+    return key, doc
+
+
+def build_export_output(sections: dict, metadata: dict, timestamp=None):
+    """
+    sections = {
+        "final_draft": "...",
+        "insights": "...",
+        "rippletruth": "...",
+        "intent_metrics": "..."
+    }
+
+    metadata = {
+        "title": "...",
+        "subtitle": "..."
+    }
+
+    timestamp: datetime for the "Generated" line (default: now)
+    """
+
+    _, (_, md, html) = _cached_export(sections, metadata)
+    stamp = timestamp_fields(timestamp)["generated"]
+    return md.replace(_TIMESTAMP, stamp), html.replace(_TIMESTAMP, stamp)
+
+
+def clear_export_cache():
+    with _CACHE_LOCK:
+        _EXPORTS.clear()
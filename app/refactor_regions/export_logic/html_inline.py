@@ -0,0 +1,337 @@
+# ==========================================================
+#  Export — Single-file HTML
+#  Inlines linked stylesheets (<link rel=stylesheet>) and local
+#  images (<img src>, CSS url()) so a downloaded HTML file
+#  renders on its own. Images become data URIs; with Pillow
+#  they are downscaled / re-encoded to the smallest of PNG and
+#  JPEG, and shrunk further to fit the per-image cap. Without
+#  Pillow an image over the cap keeps its reference.
+#
+#  Encoded assets are content-addressed:
+#    (path, mtime, size) -> content digest     no re-read
+#    (digest, cap, width) -> data URI          no re-encode
+#  held in a byte-bounded LRU and on disk (studio_state/
+#  asset_cache), so repeat exports only stat their assets.
+# ==========================================================
+
+import base64
+import hashlib
+import mimetypes
+import re
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+
+try:
+    from PIL import Image as PILImage
+except ImportError:     # optional: images are inlined as-is
+    PILImage = None
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+CACHE_DIR = PROJECT_ROOT / "app" / "refactor_regions" / "studio_state" / "asset_cache"
+
+DEFAULT_MAX_IMAGE_BYTES = 512 * 1024
+MAX_IMAGE_WIDTH = 1600
+MIN_IMAGE_WIDTH = 240
+MAX_CACHED_BYTES = 64 * 1024 * 1024
+
+_IMG_RE = re.compile(r"<img\b[^>]*>", re.IGNORECASE)
+_LINK_RE = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+_CSS_URL_RE = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""", re.IGNORECASE)
+_REMOTE_RE = re.compile(r"^(?:[a-z][a-z0-9+.-]*:|//|#)", re.IGNORECASE)
+
+
+def _attr_re(name):
+    return re.compile(r"""(\b%s\s*=\s*)(["'])(.*?)\2""" % name, re.IGNORECASE | re.DOTALL)
+
+
+_SRC_RE = _attr_re("src")
+_HREF_RE = _attr_re("href")
+_REL_RE = _attr_re("rel")
+
+
+def format_size(n):
+    for unit in ("B", "KB", "MB"):
+        if n < 1024 or unit == "MB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+# ----------------------------------------------------------
+# Content-addressed caches
+# ----------------------------------------------------------
+_LOCK = threading.Lock()
+_DIGESTS = {}               # (path, mtime_ns, size) -> (digest, size)
+_ENCODED = OrderedDict()    # (digest, cap, width) -> data URI (or "" = does not fit)
+_encoded_bytes = 0
+
+
+def _digest(path):
+    """Content digest of a file; read only when its stat changed."""
+    st = path.stat()
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    with _LOCK:
+        hit = _DIGESTS.get(key)
+    if hit is not None:
+        return hit[0], True
+    digest = hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+    with _LOCK:
+        _DIGESTS[key] = (digest, st.st_size)
+    return digest, False
+
+
+def _cache_get(key):
+    with _LOCK:
+        hit = _ENCODED.get(key)
+        if hit is not None:
+            _ENCODED.move_to_end(key)
+            return hit
+    disk = CACHE_DIR / ("_".join(map(str, key)) + ".uri")
+    if disk.is_file():
+        value = disk.read_text(encoding="ascii")
+        _cache_put(key, value, persist=False)
+        return value
+    return None
+
+
+def _cache_put(key, value, persist=True):
+    global _encoded_bytes
+    with _LOCK:
+        if key in _ENCODED:
+            return
+        _ENCODED[key] = value
+        _encoded_bytes += len(value)
+        while len(_ENCODED) > 1 and _encoded_bytes > MAX_CACHED_BYTES:
+            _, old = _ENCODED.popitem(last=False)
+            _encoded_bytes -= len(old)
+    if persist:
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            (CACHE_DIR / ("_".join(map(str, key)) + ".uri")).write_text(value, encoding="ascii")
+        except OSError:
+            pass
+
+
+def clear_asset_cache(disk=False):
+    global _encoded_bytes
+    with _LOCK:
+        _DIGESTS.clear()
+        _ENCODED.clear()
+        _encoded_bytes = 0
+    if disk and CACHE_DIR.is_dir():
+        for f in CACHE_DIR.glob("*.uri"):
+            f.unlink(missing_ok=True)
+
+
+# ----------------------------------------------------------
+# Encoding
+# ----------------------------------------------------------
+def _data_uri(mime, data):
+    return f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+def _optimized(data, cap, max_width):
+    """Smallest PNG / JPEG rendition that fits `cap` (None if none does)."""
+    try:
+        img = PILImage.open(BytesIO(data))
+        img.load()
+    except Exception:
+        return None
+    if getattr(img, "is_animated", False):
+        return None         # keep animated GIFs untouched
+    has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+
+    width = min(img.width, max_width)
+    while True:
+        frame = img if width == img.width else img.resize((width, max(1, round(img.height * width / img.width))))
+        candidates = []
+        buf = BytesIO()
+        frame.save(buf, "PNG", optimize=True)
+        candidates.append(("image/png", buf.getvalue()))
+        if not has_alpha:
+            buf = BytesIO()
+            frame.convert("RGB").save(buf, "JPEG", quality=85, optimize=True, progressive=True)
+            candidates.append(("image/jpeg", buf.getvalue()))
+        mime, best = min(candidates, key=lambda c: len(c[1]))
+        if len(best) <= cap or width <= MIN_IMAGE_WIDTH:
+            return (mime, best) if len(best) <= cap else None
+        width = max(MIN_IMAGE_WIDTH, width // 2)
+
+
+def _encode_image(path, cap, max_width):
+    """(data URI or None, cached?) for a local image file (image/* only)."""
+    mime = mimetypes.guess_type(path.name)[0] or ""
+    if not mime.startswith("image/"):
+        return None, False
+    digest, _ = _digest(path)
+    key = (digest, cap, max_width if PILImage is not None else 0)
+    hit = _cache_get(key)
+    if hit is not None:
+        return hit or None, True
+
+    data = path.read_bytes()
+    uri = ""
+    if PILImage is not None and mime in ("image/png", "image/jpeg", "image/bmp", "image/tiff", "image/webp"):
+        best = _optimized(data, cap, max_width)
+        if best is not None and len(best[1]) < len(data):
+            uri = _data_uri(*best)
+    if not uri and len(data) <= cap:
+        uri = _data_uri(mime, data)
+    _cache_put(key, uri)
+    return uri or None, False
+
+
+def _encode_css(path):
+    digest, cached = _digest(path)
+    key = (digest, "css", 0)
+    hit = _cache_get(key)
+    if hit is not None:
+        return hit, True
+    text = path.read_text(encoding="utf-8-sig", errors="replace")
+    _cache_put(key, text, persist=False)
+    return text, cached
+
+
+# ----------------------------------------------------------
+# Local files (shared with the DOCX backend)
+# ----------------------------------------------------------
+def within_roots(path, roots):
+    """True if the resolved `path` lies under one of `roots`."""
+    return any(path.is_relative_to(Path(root).resolve()) for root in roots)
+
+
+def is_image(path):
+    return (mimetypes.guess_type(path.name)[0] or "").startswith("image/")
+
+
+def local_image(src, roots=(PROJECT_ROOT,)):
+    """Resolved path of an image/* file under one of `roots`, else None."""
+    if not src or _REMOTE_RE.match(src):
+        return None
+    path = Path(src).resolve()
+    if path.is_file() and within_roots(path, roots) and is_image(path):
+        return path
+    return None
+
+
+# ----------------------------------------------------------
+# Rewriting
+# ----------------------------------------------------------
+class _Inliner:
+    def __init__(self, base_dir, search_dirs, cap, max_width):
+        self.dirs = [Path(d) for d in ([base_dir] if base_dir else []) + list(search_dirs or ())]
+        self.roots = [Path(d).resolve() for d in [PROJECT_ROOT] + self.dirs]
+        self.cap = cap
+        self.max_width = max_width
+        self.assets = []
+
+    def _allowed(self, path):
+        """Only files under the project or one of the search directories."""
+        return within_roots(path, self.roots)
+
+    def resolve(self, src, base=None):
+        src = src.split("#", 1)[0].split("?", 1)[0]
+        candidate = Path(src)
+        if not src or candidate.is_absolute():
+            return None
+        dirs = ([Path(base)] if base else []) + self.dirs
+        for d in dirs:
+            p = (d / src).resolve()
+            if p.is_file() and self._allowed(p):
+                return p
+        for d in dirs:          # e.g. "../styles.css" written before output/ exists
+            p = (d / candidate.name).resolve()
+            if p.is_file() and self._allowed(p):
+                return p
+        return None
+
+    def _note(self, src, kind, status, original=0, encoded=0):
+        self.assets.append({"src": src, "kind": kind, "status": status, "original": original, "encoded": encoded})
+
+    def image(self, src, base=None):
+        if _REMOTE_RE.match(src):
+            self._note(src, "image", "remote")
+            return None
+        path = self.resolve(src, base)
+        if path is None:
+            self._note(src, "image", "missing")
+            return None
+        if not is_image(path):
+            self._note(src, "image", "not an image")
+            return None
+        uri, cached = _encode_image(path, self.cap, self.max_width)
+        size = path.stat().st_size
+        if uri is None:
+            self._note(src, "image", "over cap", size)
+            return None
+        self._note(src, "image", "cached" if cached else "inlined", size, len(uri))
+        return uri
+
+    def css(self, text, base):
+        def repl(m):
+            uri = self.image(m.group(2), base)
+            return f"url({uri})" if uri else m.group(0)
+        return _CSS_URL_RE.sub(repl, text)
+
+    def img_tag(self, m):
+        tag = m.group(0)
+        src = _SRC_RE.search(tag)
+        if not src:
+            return tag
+        uri = self.image(src.group(3))
+        return tag if uri is None else tag[:src.start(3)] + uri + tag[src.end(3):]
+
+    def link_tag(self, m):
+        tag = m.group(0)
+        rel, href = _REL_RE.search(tag), _HREF_RE.search(tag)
+        if not rel or not href or "stylesheet" not in rel.group(3).lower():
+            return tag
+        src = href.group(3)
+        if _REMOTE_RE.match(src):
+            self._note(src, "css", "remote")
+            return tag
+        path = self.resolve(src)
+        if path is None or path.suffix.lower() != ".css":
+            self._note(src, "css", "missing")
+            return tag
+        text, cached = _encode_css(path)
+        text = self.css(text, path.parent)
+        self._note(src, "css", "cached" if cached else "inlined", path.stat().st_size, len(text))
+        return f"<style>\n{text}\n</style>"
+
+
+def inline_html(html, base_dir=None, search_dirs=(PROJECT_ROOT,), max_image_bytes=DEFAULT_MAX_IMAGE_BYTES,
+                max_image_width=MAX_IMAGE_WIDTH):
+    """
+    Self-contained copy of `html`. Relative references resolve
+    against base_dir, then search_dirs; only image/* files (and .css
+    stylesheets) under the project or those directories are inlined,
+    anything else keeps its original reference. Returns (html, report) with
+    report = {"bytes", "inlined", "skipped", "assets": [...]}.
+    """
+    inliner = _Inliner(base_dir, search_dirs, int(max_image_bytes), int(max_image_width))
+    out = _LINK_RE.sub(inliner.link_tag, html)
+    out = _IMG_RE.sub(inliner.img_tag, out)
+    out = re.sub(
+        r"(<style\b[^>]*>)(.*?)(</style>)",
+        lambda m: m.group(1) + inliner.css(m.group(2), None) + m.group(3),
+        out, flags=re.IGNORECASE | re.DOTALL,
+    )
+    done = ("inlined", "cached")
+    report = {
+        "bytes": len(out.encode("utf-8")),
+        "inlined": sum(a["status"] in done for a in inliner.assets),
+        "skipped": sum(a["status"] not in done for a in inliner.assets),
+        "assets": inliner.assets,
+    }
+    return out, report
+
+
+def summarize(report):
+    """One-line size / asset summary for UIs and CLIs."""
+    line = f"{format_size(report['bytes'])} · {report['inlined']} asset(s) inlined"
+    skipped = [a for a in report["assets"] if a["status"] not in ("inlined", "cached")]
+    if skipped:
+        line += " · skipped: " + ", ".join(f"{a['src']} ({a['status']})" for a in skipped[:5])
+    return line
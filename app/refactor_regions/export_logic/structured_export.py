@@ -0,0 +1,173 @@
+# ==========================================================
+#  Export — Structured JSON / YAML
+#  The full article as data for downstream tooling:
+#
+#    schema_version   bumped on incompatible layout changes
+#    generated        export timestamp
+#    metadata         title, subtitle, word count
+#    scores           draft signals + intention scores
+#    sections[]       key, heading, kind, digest, word_count,
+#                     paragraphs (Markdown source, in order)
+#
+#  Writers stream: output is produced as chunks of a few
+#  hundred paragraphs, so a book-length manuscript is never
+#  held twice as one serialized string. YAML uses libyaml's
+#  CSafeDumper when PyYAML was built with it.
+# ==========================================================
+
+import json
+
+import yaml
+
+from app.refactor_regions.export_logic.export_builder import EXPORT_SECTIONS, timestamp_fields
+from app.refactor_regions.studio_engine.document_model import get_document
+
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:     # PyYAML without libyaml
+    from yaml import SafeDumper as _YamlDumper
+
+SCHEMA_VERSION = "1.0"
+STRUCTURED_FORMATS = {"JSON": "json", "YAML": "yaml"}     # Export format label -> writer
+MIME_TYPES = {"json": "application/json", "yaml": "application/x-yaml"}
+
+PARAGRAPHS_PER_CHUNK = 256
+
+
+# ----------------------------------------------------------
+# Payload pieces
+# ----------------------------------------------------------
+def export_scores(text, weights=None):
+    """Draft signals and intention scores (with the draft's intention_weights) for the article text."""
+    if not (text or "").strip():
+        return {}
+    signals = get_document(text).signals
+    scores = {"signals": {k: round(float(v), 4) for k, v in signals.items()}}
+    try:
+        from app.refactor_regions.studio_engine.intention_equations import load_intention_bank
+        scores["intention"] = {k: round(float(v), 4) for k, v in load_intention_bank(overrides=weights).score(signals).items()}
+    except Exception:
+        pass
+    return scores
+
+
+def _header(sections, metadata, timestamp=None):
+    article = sections.get("final_draft", "") or ""
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "generated": timestamp_fields(timestamp)["generated"],
+        "metadata": {
+            "title": metadata.get("title", "Untitled Document"),
+            "subtitle": metadata.get("subtitle", ""),
+            "word_count": get_document(article).word_count if article.strip() else 0,
+        },
+        "scores": export_scores(article, metadata.get("intention_weights")),
+    }
+
+
+def _sections(sections):
+    """(section header dict, paragraph tuple) for each non-empty section."""
+    for key, heading in EXPORT_SECTIONS:
+        text = sections.get(key, "") or ""
+        if not text.strip():
+            continue
+        doc = get_document(text)
+        head = {
+            "key": key,
+            "heading": heading,
+            "kind": "article" if key == "final_draft" else "analysis",
+            "digest": doc.digest,
+            "word_count": doc.word_count,
+        }
+        yield head, doc.paragraphs
+
+
+def _batches(items, size=PARAGRAPHS_PER_CHUNK):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# ----------------------------------------------------------
+# JSON
+# ----------------------------------------------------------
+def _json(value):
+    return json.dumps(value, ensure_ascii=False)
+
+
+def iter_json(sections, metadata, timestamp=None):
+    """Chunks of one JSON document (schema above)."""
+    yield _json(_header(sections, metadata, timestamp))[:-1] + ', "sections": ['
+    for n, (head, paragraphs) in enumerate(_sections(sections)):
+        yield ("," if n else "") + "\n  " + _json(head)[:-1] + ', "paragraphs": ['
+        for i, batch in enumerate(_batches(paragraphs)):
+            yield ("," if i else "") + "\n    " + ",\n    ".join(map(_json, batch))
+        yield "\n  ]}"
+    yield "\n]}\n"
+
+
+# ----------------------------------------------------------
+# YAML
+# ----------------------------------------------------------
+def _yaml(value):
+    return yaml.dump(
+        value, Dumper=_YamlDumper, sort_keys=False, allow_unicode=True,
+        default_flow_style=False, width=2 ** 31 - 1,
+    )
+
+
+def _indent(text, prefix):
+    return "".join(prefix + line if line.strip() else line for line in text.splitlines(keepends=True))
+
+
+def iter_yaml(sections, metadata, timestamp=None):
+    """Chunks of one YAML document (schema above)."""
+    yield _yaml(_header(sections, metadata, timestamp))
+    yield "sections:\n"
+    any_section = False
+    for head, paragraphs in _sections(sections):
+        any_section = True
+        yield _yaml([head])
+        if not paragraphs:
+            yield "  paragraphs: []\n"
+            continue
+        yield "  paragraphs:\n"
+        for batch in _batches(paragraphs):
+            yield _indent(_yaml(list(batch)), "  ")
+    if not any_section:
+        yield "  []\n"
+
+
+WRITERS = {"json": iter_json, "yaml": iter_yaml}
+
+
+# ----------------------------------------------------------
+# Entry points
+# ----------------------------------------------------------
+def iter_structured(fmt, sections, metadata, timestamp=None):
+    try:
+        writer = WRITERS[fmt]
+    except KeyError:
+        raise ValueError(f"Unknown structured format: {fmt}") from None
+    return writer(sections, metadata, timestamp)
+
+
+def write_structured(fp, fmt, sections, metadata, timestamp=None):
+    """Stream the export into a text file object chunk by chunk."""
+    for chunk in iter_structured(fmt, sections, metadata, timestamp):
+        fp.write(chunk)
+
+
+def structured_bytes(fmt, sections, metadata, timestamp=None):
+    """UTF-8 bytes of the export (for download buttons)."""
+    return b"".join(chunk.encode("utf-8") for chunk in iter_structured(fmt, sections, metadata, timestamp))
+
+
+def structured_preview(fmt, sections, metadata, limit=4000):
+    """First `limit` characters; only the chunks needed are produced."""
+    out, size = [], 0
+    for chunk in iter_structured(fmt, sections, metadata):
+        out.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            return "".join(out)[:limit] + "\n…"
+    return "".join(out)
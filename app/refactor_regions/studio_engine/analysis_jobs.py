@@ -0,0 +1,137 @@
+# ==========================================================
+#  RippleWriter Studio — Analysis Job Engine
+#  Runs Analyze-tab modes off the Streamlit script thread and
+#  caches results by (draft hash, mode, engine version).
+#  Re-running a mode on an unchanged draft returns instantly.
+# ==========================================================
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from app.refactor_regions.studio_engine.analysis_modes import MODE_INPUT_VERSIONS, MODE_RUNNERS, SharedDocument
+
+# Bump when any runner's output changes so stale cache entries are ignored
+ENGINE_VERSION = "8"
+MAX_CACHED_RESULTS = 64
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="rw-analysis")
+_LOCK = threading.Lock()
+_RESULTS = OrderedDict()   # key -> result dict
+_JOBS = {}                 # key -> AnalysisJob (in flight or finished)
+
+
+def draft_hash(text):
+    return hashlib.blake2b((text or "").encode("utf-8"), digest_size=16).hexdigest()
+
+
+def job_key(draft, mode, sections=None, weights=None):
+    version = MODE_INPUT_VERSIONS.get(mode)
+    return (draft_hash(draft), tuple(sections or ()), tuple(sorted((weights or {}).items())),
+            mode, ENGINE_VERSION, version() if version else None)
+
+
+class AnalysisJob:
+    """Progress + outcome of one analysis run. Safe to poll from the UI."""
+
+    def __init__(self, key, mode):
+        self.key = key
+        self.mode = mode
+        self.status = "queued"     # queued | running | done | error
+        self.progress = 0.0
+        self.message = "Queued…"
+        self.result = None
+        self.partials = {}         # module name -> partial result, in finish order
+        self.error = None
+        self.cached = False
+        self.started = None
+        self.elapsed = 0.0
+
+    @property
+    def finished(self):
+        return self.status in ("done", "error")
+
+    def report(self, fraction, message=""):
+        self.progress = max(0.0, min(1.0, float(fraction)))
+        if message:
+            self.message = message
+
+    def publish(self, name, result):
+        self.partials[name] = result
+
+
+def _remember(key, result):
+    with _LOCK:
+        _RESULTS[key] = result
+        _RESULTS.move_to_end(key)
+        while len(_RESULTS) > MAX_CACHED_RESULTS:
+            old_key, _ = _RESULTS.popitem(last=False)
+            _JOBS.pop(old_key, None)
+
+
+def _run(job, runner, draft, sections, weights):
+    job.status = "running"
+    job.started = time.perf_counter()
+    try:
+        job.report(0.05, "Tokenizing draft…")
+        doc = SharedDocument(draft, sections, weights)
+        result = runner(doc, job.report, job.publish)
+        _remember(job.key, result)
+        job.result = result
+        job.status = "done"
+        job.report(1.0, "Done.")
+    except Exception as e:
+        job.error = str(e)
+        job.status = "error"
+    finally:
+        job.elapsed = time.perf_counter() - job.started
+
+
+def cached_result(draft, mode, sections=None, weights=None):
+    with _LOCK:
+        return _RESULTS.get(job_key(draft, mode, sections, weights))
+
+
+def submit_analysis(draft, mode, sections=None, weights=None):
+    """
+    Start (or reuse) an analysis job. `sections` are the draft YAML
+    section names used by the coherence map, `weights` its
+    intention_weights (factor overrides). Returns the AnalysisJob;
+    if the result is already cached the job comes back finished.
+    """
+    if mode not in MODE_RUNNERS:
+        raise ValueError(f"Unknown analysis mode: {mode}")
+
+    key = job_key(draft, mode, sections, weights)
+    with _LOCK:
+        existing = _JOBS.get(key)
+        if existing and existing.status in ("queued", "running"):
+            return existing
+
+        result = _RESULTS.get(key)
+        if result is not None:
+            _RESULTS.move_to_end(key)
+            job = AnalysisJob(key, mode)
+            job.status, job.progress, job.message = "done", 1.0, "Loaded from cache."
+            job.result, job.cached = result, True
+            _JOBS[key] = job
+            return job
+
+        job = AnalysisJob(key, mode)
+        _JOBS[key] = job
+
+    _EXECUTOR.submit(_run, job, MODE_RUNNERS[mode], draft, list(sections or []), dict(weights or {}))
+    return job
+
+
+def get_job(key):
+    with _LOCK:
+        return _JOBS.get(key)
+
+
+def clear_cache():
+    with _LOCK:
+        _RESULTS.clear()
+        _JOBS.clear()
@@ -0,0 +1,405 @@
+# ==========================================================
+#  RippleWriter Studio — Analysis Modes
+#  One module per analysis, all reading a SharedDocument
+#  (the draft tokenized once). Runners are pure (no Streamlit
+#  calls) so they can run on the job thread pool.
+#
+#  runner(doc, report, publish) -> result dict
+#    doc                        SharedDocument (built once per job)
+#    report(fraction, message)  updates job progress
+#    publish(name, result)      streams a partial result
+#
+#  Result keys:
+#    title, metrics {label: value}, table [rows],
+#    chart {series: [values per paragraph]}, notes [str],
+#    findings [str], recommendations [str],
+#    rippletruth_report / intent_metrics / insights_text (Export)
+#  Composite results add parts {module: result} and timings.
+# ==========================================================
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from app.refactor_regions.studio_engine.signal_engine import DEFAULT_ENGINE
+from app.refactor_regions.studio_engine.claim_engine import claims_from_sentences
+from app.refactor_regions.studio_engine.evidence_index import get_evidence_index, is_supported
+from app.refactor_regions.studio_engine.drift_engine import DriftTracker, drift_summary
+from app.refactor_regions.studio_engine.coherence_engine import ORPHAN_SIM, TOP_K, assign_sections, build_coherence_map
+from app.refactor_regions.studio_engine.force_engine import analyze_force
+from app.refactor_regions.studio_engine.score_uncertainty import bootstrap_bank_intervals
+from app.refactor_regions.studio_engine.intention_equations import load_intention_bank
+from app.refactor_regions.studio_engine.document_model import get_document
+from app.refactor_regions.studio_engine.module_graph import run_graph
+from app.refactor_regions.studio_engine.paragraph_cache import paragraph_hash
+
+MODE_TRUTH = "RippleTruth Fact Scan"
+MODE_INTENTION = "Intentionality Metrics (FILS / UCIP / Drift)"
+MODE_STRUCTURE = "Structural Coherence Map"
+MODE_FORCE = "Narrative Force Analysis"
+MODE_COMPOSITE = "Full Composite Analysis"
+
+
+def _result(title, **kw):
+    out = {
+        "title": title,
+        "metrics": {},
+        "table": None,
+        "chart": None,
+        "notes": [],
+        "findings": [],
+        "recommendations": [],
+        "rippletruth_report": "",
+        "intent_metrics": "",
+        "insights_text": "",
+    }
+    out.update(kw)
+    return out
+
+
+# ----------------------------------------------------------
+# Shared document — tokenized once, read by every module
+# ----------------------------------------------------------
+class SharedDocument:
+    """Paragraphs, per-paragraph TextStats and draft signals for one draft."""
+
+    def __init__(self, draft, sections=None, weights=None):
+        self.created = time.perf_counter()
+        self.model = get_document(draft)
+        self.text = self.model.text
+        self.sections = list(sections or [])
+        self.weights = dict(weights or {})     # the draft YAML's intention_weights
+        self.signals = self.model.signals
+        self.paragraphs = self.model.paragraphs
+        self.stats = self.model.paragraph_stats
+
+
+# ----------------------------------------------------------
+# RippleTruth Fact Scan
+# ----------------------------------------------------------
+def truth_module(doc, deps=None):
+    claims = list(claims_from_sentences(doc.model.sentences))
+    signals = DEFAULT_ENGINE.claim_signals(" ".join(c.text for c in claims)[:8000])
+    unsupported = [c for c in claims if c.needs_evidence]
+
+    notes = []
+    try:
+        index = get_evidence_index()
+        index.sync()
+        # saved copies of this draft are in the corpus; they'd corroborate every claim
+        evidence = index.verify_claims([c.text for c in claims], exclude=index.draft_sources(doc.text))
+    except Exception as e:
+        evidence = [[] for _ in claims]
+        notes.append(f"Evidence index unavailable: {e}")
+    corroborated = [c for c, ev in zip(claims, evidence) if is_supported(ev)]
+
+    rows = []
+    for c, ev in zip(claims, evidence):
+        best = ev[0] if ev else {}
+        rows.append({
+            "Claim": c.text,
+            "Check-worthiness": c.score,
+            "Features": ", ".join(k for k, on in c.features.items() if on),
+            "Needs evidence": c.needs_evidence,
+            "Corroborated": is_supported(ev),
+            "Best evidence": best.get("text", ""),
+            "Source": best.get("source", ""),
+        })
+
+    lines = []
+    for c, ev in zip(claims, evidence):
+        line = f"- {c.text}" + (" _(needs evidence)_" if c.needs_evidence else "")
+        if is_supported(ev):
+            line += f"\n  - Evidence ({ev[0]['source']}): {ev[0]['text'][:240]}"
+        lines.append(line)
+
+    return _result(
+        "🧪 RippleTruth Fact Scan",
+        metrics={
+            "Claims": len(claims),
+            "Needs evidence": len(unsupported),
+            "Corroborated": len(corroborated),
+            "Evidence": round(signals["evidence"], 3),
+        },
+        table=rows,
+        notes=notes,
+        findings=[
+            f"{len(unsupported)} of {len(claims)} check-worthy claims carry no attribution or source.",
+            f"{len(corroborated)} of {len(claims)} claims match a passage in the local evidence corpus.",
+        ] if claims else [],
+        recommendations=["Attribute or cite the flagged claims."] if unsupported else [],
+        rippletruth_report="\n".join(lines) or "No check-worthy claims found.",
+    )
+
+
+# ----------------------------------------------------------
+# Intention Metrics (FILS / UCIP / Drift)
+# ----------------------------------------------------------
+def intention_module(doc, deps=None):
+    bank = load_intention_bank(overrides=doc.weights)
+    scores = bank.score(doc.signals)
+    expressions = dict(zip(bank.names, bank.expressions))
+    bands = bootstrap_bank_intervals(doc.stats, bank) if len(doc.stats) > 1 else {}
+
+    # In the composite graph Drift is an upstream module and reports itself
+    shared = "Drift" in (deps or {})
+    drift = deps["Drift"] if shared else drift_module(doc)
+    metrics = {k.title(): round(v, 3) for k, v in doc.signals.items()}
+    metrics["Drift"] = drift["metrics"].get("Mean drift", 0.0)
+
+    return _result(
+        "🌌 Intention Metrics",
+        metrics=metrics,
+        table=[
+            {
+                "Format": name,
+                "Equation": expressions[name],
+                "Score": round(val, 3),
+                "95% interval": "{:.3f}–{:.3f}".format(*bands[name]) if name in bands else "",
+            }
+            for name, val in scores.items()
+        ],
+        chart=drift.get("chart"),
+        notes=[] if shared else drift["notes"],
+        findings=[] if shared else drift["findings"],
+        recommendations=[] if shared else drift["recommendations"],
+        intent_metrics="\n".join(
+            f"- **{name}** ({expressions[name]}): {val:.3f}" for name, val in scores.items()
+        ) + f"\n- **Drift** (mean): {metrics['Drift']:.3f}",
+    )
+
+
+# ----------------------------------------------------------
+# Narrative Drift (sliding-window TF-IDF vs. the thesis)
+# ----------------------------------------------------------
+# One tracker per draft, keyed by its thesis (opening) paragraph, so
+# drafts and sessions never share an IDF snapshot; re-analysing an
+# edited draft only recomputes the windows that touch edited paragraphs.
+MAX_DRIFT_TRACKERS = 16
+_DRIFT_TRACKERS = OrderedDict()     # thesis paragraph hash -> DriftTracker
+_DRIFT_LOCK = threading.Lock()
+
+
+def drift_tracker(paragraphs):
+    key = paragraph_hash(paragraphs[0])
+    with _DRIFT_LOCK:
+        tracker = _DRIFT_TRACKERS.get(key)
+        if tracker is None:
+            tracker = _DRIFT_TRACKERS[key] = DriftTracker()
+            while len(_DRIFT_TRACKERS) > MAX_DRIFT_TRACKERS:
+                _DRIFT_TRACKERS.popitem(last=False)
+        else:
+            _DRIFT_TRACKERS.move_to_end(key)
+    return tracker
+
+
+def drift_module(doc, deps=None):
+    if not doc.paragraphs:
+        return _result("🧭 Narrative Drift", notes=["No paragraphs to compare."])
+
+    tracker = drift_tracker(doc.paragraphs)
+    with tracker.lock:
+        series = tracker.update(doc.paragraphs)
+        recomputed = tracker.last_recomputed
+    summary = drift_summary(series)
+    drifting = summary["drifting"]
+
+    return _result(
+        "🧭 Narrative Drift",
+        metrics={"Mean drift": round(summary["mean"], 3), "Max drift": round(summary["max"], 3)},
+        table=[{"Paragraph": r["paragraph"], "Drift": r["drift"], "Shift": r["shift"]} for r in series],
+        chart={"Drift": [r["drift"] for r in series], "Shift": [r["shift"] for r in series]},
+        notes=[f"{recomputed} of {len(series)} windows recomputed (window = {tracker.window} paragraphs)."],
+        findings=[f"Paragraphs drifting from the opening thesis: {drifting}"] if drifting else [],
+        recommendations=["Tie drifting paragraphs back to the thesis."] if drifting else [],
+        insights_text=f"Narrative drift (mean): {summary['mean']:.2f}",
+        drift_series=series,
+    )
+
+
+# ----------------------------------------------------------
+# Structural Coherence Map (sparse paragraph similarity graph)
+# ----------------------------------------------------------
+def structure_module(doc, deps=None):
+    cmap = build_coherence_map(doc.paragraphs, doc.sections)
+    rows = cmap["paragraphs"]
+    if not rows:
+        return _result("🧩 Structural Coherence Map", notes=["No paragraphs to map."])
+
+    weak = [s["section"] for s in cmap["sections"] if s["cohesion"] is not None and s["cohesion"] < ORPHAN_SIM]
+    empty = [s["section"] for s in cmap["sections"] if s["paragraphs"] == 0]
+
+    findings = []
+    if cmap["orphans"]:
+        findings.append(f"Orphan paragraphs (no close neighbour): {cmap['orphans']}")
+    if cmap["breaks"]:
+        findings.append("Transition breaks: " + ", ".join(f"¶{a}→¶{b} ({sim})" for a, b, sim in cmap["breaks"]))
+    if weak:
+        findings.append(f"Low-cohesion sections: {weak}")
+    if empty:
+        findings.append(f"YAML sections with no paragraphs: {empty}")
+
+    recommendations = []
+    if cmap["orphans"]:
+        recommendations.append("Connect or cut orphan paragraphs.")
+    if cmap["breaks"]:
+        recommendations.append("Add a bridging sentence at each transition break.")
+
+    return _result(
+        "🧩 Structural Coherence Map",
+        metrics={
+            "Paragraphs": len(rows),
+            "Sections": sum(1 for s in cmap["sections"] if s["paragraphs"]),
+            "Orphans": len(cmap["orphans"]),
+            "Breaks": len(cmap["breaks"]),
+        },
+        table=[
+            {
+                "Paragraph": r["paragraph"],
+                "Section": r["section"],
+                "Words": r["words"],
+                "→ Next": r["next_sim"],
+                "Best match": r["best_match"],
+                "Best sim": r["best_sim"],
+                "Orphan": r["orphan"],
+            }
+            for r in rows
+        ],
+        chart={"Similarity to next": [r["next_sim"] or 0.0 for r in rows]},
+        notes=[
+            "Sections: " + "; ".join(
+                f"{s['section']} ({s['paragraphs']} ¶, cohesion {s['cohesion'] if s['cohesion'] is not None else '–'})"
+                for s in cmap["sections"]
+            ),
+            f"Similarity graph: {cmap['edges']} edges (top-{TOP_K} per paragraph).",
+        ],
+        findings=findings,
+        recommendations=recommendations,
+        insights_text=f"Structure: {len(rows)} paragraphs, {len(cmap['orphans'])} orphans, {len(cmap['breaks'])} transition breaks.",
+        coherence_map=cmap,
+    )
+
+
+# ----------------------------------------------------------
+# Narrative Force Analysis (lexicon trie, per-section vectors)
+# ----------------------------------------------------------
+def force_module(doc, deps=None):
+    texts, labels = assign_sections(doc.paragraphs, doc.sections)
+    force = analyze_force(texts, labels)
+    if not force["sentences"]:
+        return _result("⚡ Narrative Force Analysis", notes=["No sentences to analyze."])
+
+    dims = force["dimensions"]
+    document = force["document"]["force"]
+
+    rows = []
+    for sec in force["sections"]:
+        row = {"Section": sec["section"], "Words": sec["words"]}
+        row.update({d.title(): round(sec["force"][d], 3) for d in dims})
+        rows.append(row)
+
+    charged = sorted(force["sentences"], key=lambda s: sum(s["hits"].values()), reverse=True)[:3]
+    flat = [sec["section"] for sec in force["sections"] if sec["words"] and not any(sec["force"].values())]
+
+    return _result(
+        "⚡ Narrative Force Analysis",
+        metrics={d.title(): round(document[d], 3) for d in dims},
+        table=rows,
+        notes=[
+            f"Most charged: “{s['text'][:160]}” ({', '.join(sorted(s['hits']))})"
+            for s in charged if s["hits"]
+        ],
+        findings=[f"Sections with no narrative force: {flat}"] if flat else [],
+        recommendations=["Give flat sections a stake, a movement or a turn."] if flat else [],
+        insights_text="Narrative force: " + ", ".join(f"{d} {document[d]:+.2f}" for d in dims),
+        force=force,
+    )
+
+
+# ----------------------------------------------------------
+# Single-mode runners
+# ----------------------------------------------------------
+def _single(module, message):
+    def runner(doc, report, publish=None):
+        report(0.5, message)
+        return module(doc)
+    return runner
+
+
+run_truth_scan = _single(truth_module, "Scoring candidate claims…")
+run_intention_metrics = _single(intention_module, "Evaluating intention equations…")
+run_structure_map = _single(structure_module, "Mapping paragraphs…")
+run_narrative_force = _single(force_module, "Reading tone cues…")
+
+
+# ----------------------------------------------------------
+# Full Composite Analysis — modules as a dependency graph
+# ----------------------------------------------------------
+COMPOSITE_GRAPH = {
+    "TruthScan": (truth_module, ()),
+    "FILS": (intention_module, ("Drift",)),
+    "Drift": (drift_module, ()),
+    "Coherence": (structure_module, ()),
+}
+
+# Separate from the job pool so a composite job never waits on its own workers
+_MODULE_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rw-module")
+
+
+def _module_error(name, error):
+    """Stand-in result for a composite module that raised."""
+    return _result(f"⚠️ {name}", notes=[f"{name} failed: {error}"], error=str(error))
+
+
+def run_composite(doc, report, publish=None):
+    t0 = doc.created     # timings include tokenizing the shared document
+
+    finished = {}
+
+    def on_result(name, part):
+        finished[name] = round((time.perf_counter() - t0) * 1000, 1)
+        report(0.1 + 0.9 * len(finished) / len(COMPOSITE_GRAPH), f"{name} finished.")
+        if publish:
+            publish(name, part)
+
+    parts = run_graph(COMPOSITE_GRAPH, doc, _MODULE_EXECUTOR, on_result, _module_error)
+    wall_ms = round((time.perf_counter() - t0) * 1000, 1)
+    first_ms = min(finished.values()) if finished else wall_ms
+
+    metrics = {}
+    for name, part in parts.items():
+        metrics.update({f"{name} · {k}": v for k, v in part["metrics"].items()})
+
+    return _result(
+        "🌀 Full Composite RippleWriter Analysis",
+        metrics=metrics,
+        notes=[f"First result after {first_ms:.0f} ms · wall time {wall_ms:.0f} ms."]
+        + [n for p in parts.values() if p.get("error") for n in p["notes"]],
+        findings=[f for p in parts.values() for f in p["findings"]],
+        recommendations=[r for p in parts.values() for r in p["recommendations"]],
+        rippletruth_report=parts["TruthScan"]["rippletruth_report"],
+        intent_metrics=parts["FILS"]["intent_metrics"],
+        insights_text="\n".join(p["insights_text"] for p in parts.values() if p["insights_text"]),
+        parts={name: parts[name] for name in finished},
+        timings={"first_result_ms": first_ms, "wall_ms": wall_ms, "modules_ms": finished},
+    )
+
+
+def _evidence_version():
+    return get_evidence_index().stats()[2]
+
+
+# Extra cache-key inputs for modes that read more than the draft
+MODE_INPUT_VERSIONS = {
+    MODE_TRUTH: _evidence_version,
+    MODE_COMPOSITE: _evidence_version,
+}
+
+MODE_RUNNERS = {
+    MODE_TRUTH: run_truth_scan,
+    MODE_INTENTION: run_intention_metrics,
+    MODE_STRUCTURE: run_structure_map,
+    MODE_FORCE: run_narrative_force,
+    MODE_COMPOSITE: run_composite,
+}
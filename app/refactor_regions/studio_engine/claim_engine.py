@@ -0,0 +1,213 @@
+# ==========================================================
+#  RippleWriter Studio — RippleTruth Claim Extraction
+#  Rule-based streaming sentence segmenter + lexical
+#  check-worthiness features. Claims are yielded as they are
+#  found, so long manuscripts stream instead of being split
+#  up front.
+#
+#  Features (per sentence):
+#    number       digits, percentages, currency, spelled counts
+#    quantity     number + unit ("3.9 percent", "2 million people")
+#    year         1900–2099
+#    attribution  "according to", "reported", "study", "data"…
+#    comparative  "more than", "-er than", "doubled", "highest"…
+#    entity       capitalized words after the first token
+#    source       links / DOIs / "source:"
+#    opinion      first-person stance, modals of obligation (−)
+#    question     interrogative sentence (−)
+# ==========================================================
+
+import re
+from dataclasses import dataclass, field
+
+CHECK_WORTHY_THRESHOLD = 0.5
+MIN_CLAIM_WORDS = 6
+
+# ----------------------------------------------------------
+# Segmentation
+# ----------------------------------------------------------
+ABBREVIATIONS = frozenset({
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "inc", "ltd",
+    "co", "corp", "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept",
+    "oct", "nov", "dec", "no", "fig", "eq", "approx", "est", "dept", "gov", "gen",
+    "e.g", "i.e", "u.s", "u.k", "u.n", "a.m", "p.m", "al",
+})
+
+# Sentence end: terminal punctuation (+ closing quotes/brackets) followed by
+# whitespace and a capital/digit/opening quote; blank lines; list items.
+_BOUNDARY_RE = re.compile(
+    r"""[.!?…]+["'”’)\]]*\s+(?=["'“‘(\[]?[A-Z0-9])"""
+    r"""|\n[ \t]*\n\s*"""
+    r"""|\n(?=[ \t]*(?:[-*•#]|\d+[.)])\s)"""
+)
+_LAST_WORD_RE = re.compile(r"([A-Za-z][A-Za-z.]*)\.[\"'”’)\]]*\s*$")
+
+# Keep at least this much unread text before trusting a boundary at the
+# end of a streamed chunk (the lookahead needs the next character).
+_STREAM_TAIL = 64
+
+
+@dataclass
+class Sentence:
+    text: str
+    start: int
+    end: int
+    index: int
+
+
+def _is_abbreviation(prefix):
+    m = _LAST_WORD_RE.search(prefix[-24:])
+    if not m:
+        return False
+    word = m.group(1).lower()
+    # single-letter initials ("J. Smith") and known abbreviations
+    return len(word) == 1 or word in ABBREVIATIONS
+
+
+def iter_sentences(source):
+    """
+    Yield Sentence objects from a string or an iterable of text chunks
+    (e.g. lines of a file). Offsets are relative to the joined text.
+    """
+    chunks = [source] if isinstance(source, str) else source
+    buf = ""
+    base = 0          # offset of buf[0] in the full text
+    index = 0
+
+    def emit(seg, seg_start):
+        nonlocal index
+        stripped = seg.strip()
+        if not stripped:
+            return None
+        lead = len(seg) - len(seg.lstrip())
+        s = Sentence(stripped, seg_start + lead, seg_start + lead + len(stripped), index)
+        index += 1
+        return s
+
+    chunks = iter(chunks)
+    exhausted = False
+    while not exhausted:
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+        else:
+            buf += chunk
+            if len(buf) < _STREAM_TAIL:
+                continue
+
+        pos = 0
+        limit = len(buf) if exhausted else len(buf) - _STREAM_TAIL
+        for m in _BOUNDARY_RE.finditer(buf):
+            if m.start() > limit:
+                break
+            if m.group()[0] in ".!?…" and _is_abbreviation(buf[pos:m.end()]):
+                continue
+            s = emit(buf[pos:m.start() + len(m.group().rstrip())], base + pos)
+            if s:
+                yield s
+            pos = m.end()
+
+        buf = buf[pos:]
+        base += pos
+
+    s = emit(buf, base)
+    if s:
+        yield s
+
+
+# ----------------------------------------------------------
+# Check-worthiness features
+# ----------------------------------------------------------
+_NUMBER_RE = re.compile(
+    r"[$€£]\s?\d|\d[\d,]*(?:\.\d+)?\s?%|\b\d[\d,]*(?:\.\d+)?\b"
+    r"|\b(?:half|twice|double|triple|dozens?|hundreds?|thousands?|millions?|billions?)\b",
+    re.I,
+)
+_QUANTITY_RE = re.compile(
+    r"\b\d[\d,]*(?:\.\d+)?\s?(?:%|percent|per\s?cent|percentage points?|"
+    r"(?:thousand|million|billion|trillion)s?|people|residents|users|patients|workers|jobs|"
+    r"dollars|euros|pounds|tons|tonnes|kg|km|miles|hours|days|weeks|months|years|"
+    r"times|fold|degrees|cases|deaths|votes|seats)\b",
+    re.I,
+)
+_YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+_ATTRIBUTION_RE = re.compile(
+    r"\b(?:according to|said|says|stated|reported|reports|announced|estimated|estimates|"
+    r"found|finds|showed|shows|published|survey|study|studies|research(?:ers)?|data|"
+    r"census|analysis|poll|report|statistics|official(?:s)?|ministry|agency|bureau)\b",
+    re.I,
+)
+_COMPARATIVE_RE = re.compile(
+    r"\b(?:more|less|fewer|greater|higher|lower|larger|smaller|faster|slower)\s+than\b"
+    r"|\b\w+er than\b"
+    r"|\b(?:most|least|highest|lowest|largest|smallest|fastest|record|doubled|tripled|halved|"
+    r"increased|decreased|rose|fell|grew|declined|dropped|surged|outpaced)\b",
+    re.I,
+)
+_SOURCE_RE = re.compile(r"https?://|\bdoi\b|source:", re.I)
+_OPINION_RE = re.compile(
+    r"\b(?:i think|i believe|i feel|we believe|in my (?:view|opinion)|should|must|ought to|"
+    r"beautiful|terrible|amazing|wonderful|awful|perhaps|maybe|imagine)\b",
+    re.I,
+)
+_ENTITY_RE = re.compile(r"(?<=\s)[A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*")
+
+FEATURE_WEIGHTS = {
+    "number": 0.25,
+    "quantity": 0.25,
+    "year": 0.15,
+    "attribution": 0.25,
+    "comparative": 0.2,
+    "entity": 0.15,
+    "source": 0.2,
+    "opinion": -0.3,
+    "question": -0.5,
+}
+
+
+@dataclass
+class Claim:
+    text: str
+    score: float
+    features: dict = field(default_factory=dict)
+    start: int = 0
+    end: int = 0
+    sentence_index: int = 0
+
+    @property
+    def needs_evidence(self):
+        """Factual-looking but carries no attribution or source."""
+        return not (self.features.get("attribution") or self.features.get("source"))
+
+
+def claim_features(sentence):
+    return {
+        "number": bool(_NUMBER_RE.search(sentence)),
+        "quantity": bool(_QUANTITY_RE.search(sentence)),
+        "year": bool(_YEAR_RE.search(sentence)),
+        "attribution": bool(_ATTRIBUTION_RE.search(sentence)),
+        "comparative": bool(_COMPARATIVE_RE.search(sentence)),
+        "entity": bool(_ENTITY_RE.search(sentence)),
+        "source": bool(_SOURCE_RE.search(sentence)),
+        "opinion": bool(_OPINION_RE.search(sentence)),
+        "question": sentence.rstrip("\"'”’)] ").endswith("?"),
+    }
+
+
+def check_worthiness(features):
+    score = sum(FEATURE_WEIGHTS[k] for k, on in features.items() if on)
+    return max(0.0, min(1.0, score))
+
+
+# ----------------------------------------------------------
+# Public API
+# ----------------------------------------------------------
+def claims_from_sentences(sentences, threshold=CHECK_WORTHY_THRESHOLD, min_words=MIN_CLAIM_WORDS):
+    """Yield check-worthy Claims from already segmented Sentences."""
+    for sent in sentences:
+        if sent.text.count(" ") + 1 < min_words:
+            continue
+        features = claim_features(sent.text)
+        score = check_worthiness(features)
+        if score >= threshold:
+            yield Claim(sent.text, round(score, 3), features, sent.start, sent.end, sent.index)
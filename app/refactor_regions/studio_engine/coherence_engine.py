@@ -0,0 +1,221 @@
+# ==========================================================
+#  RippleWriter Studio — Structural Coherence Map
+#  Paragraph similarity graph on sparse TF-IDF vectors.
+#  Each paragraph keeps only its top-k neighbours, found via
+#  an inverted index (term -> postings), so memory is linear
+#  in paragraph count — no dense n×n matrix is built.
+#
+#  From the graph:
+#    section cohesion   mean best in-section similarity
+#    orphan paragraphs  no neighbour above ORPHAN_SIM
+#    transition breaks  adjacent paragraphs (same section)
+#                       below BREAK_SIM
+#  Sections come from markdown headings in the draft, matched
+#  to the draft YAML `sections` (or `outline` / format).
+# ==========================================================
+
+import re
+from collections import defaultdict
+
+import numpy as np
+
+from app.utils.yaml_tools import load_system
+from app.refactor_regions.studio_engine.term_vectors import IdfSnapshot, cosine, term_counts, tfidf
+
+TOP_K = 5
+ORPHAN_SIM = 0.08
+BREAK_SIM = 0.04
+
+_HEADING_RE = re.compile(r"^\s{0,3}#{1,6}\s+(.+?)\s*#*\s*$")
+
+
+# ----------------------------------------------------------
+# Sections
+# ----------------------------------------------------------
+def sections_from_yaml(data):
+    """Section names from a draft YAML: sections, else outline, else its format."""
+    if not isinstance(data, dict):
+        return []
+    for key in ("sections", "outline"):
+        items = data.get(key)
+        if isinstance(items, list) and items:
+            return [str(s) for s in items if str(s).strip()]
+
+    fmt = data.get("format")
+    if fmt:
+        formats = (load_system("formats.yaml") or {}).get("formats") or {}
+        return [str(s) for s in (formats.get(fmt) or {}).get("sections") or []]
+    return []
+
+
+def _section_key(name):
+    return re.sub(r"[^a-z0-9 ]+", " ", name.split(":")[0].lower()).strip()
+
+
+def _match_section(heading, sections):
+    key = _section_key(heading)
+    for name in sections:
+        other = _section_key(name)
+        if other and (key == other or key.startswith(other) or other.startswith(key)):
+            return name
+    return heading
+
+
+def assign_sections(paragraphs, sections=None):
+    """
+    Strip heading lines and label each remaining paragraph with a section.
+    Returns (texts, labels). Without headings, paragraphs are spread over
+    the YAML sections in order; with neither, everything is "Document".
+    """
+    sections = list(sections or [])
+    texts, labels = [], []
+    current = None
+    saw_heading = False
+
+    for para in paragraphs:
+        lines = para.splitlines()
+        m = _HEADING_RE.match(lines[0]) if lines else None
+        if m:
+            saw_heading = True
+            current = _match_section(m.group(1), sections)
+            lines = lines[1:]
+        body = "\n".join(lines).strip()
+        if body:
+            texts.append(body)
+            labels.append(current)
+
+    if saw_heading:
+        first = sections[0] if sections else "Introduction"
+        labels = [label or first for label in labels]
+    elif sections and texts:
+        n, s = len(texts), len(sections)
+        labels = [sections[min(s - 1, i * s // n)] for i in range(n)]
+    else:
+        labels = ["Document"] * len(texts)
+    return texts, labels
+
+
+# ----------------------------------------------------------
+# Similarity graph
+# ----------------------------------------------------------
+def paragraph_vectors(paragraphs):
+    counts = [term_counts(p) for p in paragraphs]
+    idf = IdfSnapshot(counts)
+    return [tfidf(c, idf) for c in counts]
+
+
+def similarity_graph(vectors, k=TOP_K):
+    """
+    Exact top-k neighbours per paragraph: [[(sim, j), ...], ...] sorted
+    by sim. Postings are stored term-major (an inverted index); each
+    paragraph's scores are accumulated from the postings of its own
+    terms with one bincount, so working memory stays O(n).
+    """
+    n = len(vectors)
+    vocab = {}
+    rows, cols, vals = [], [], []
+    for i, vec in enumerate(vectors):
+        for term, w in vec.items():
+            rows.append(i)
+            cols.append(vocab.setdefault(term, len(vocab)))
+            vals.append(w)
+    if not rows:
+        return [[] for _ in range(n)]
+
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    vals = np.asarray(vals, dtype=np.float64)
+
+    # term-major postings: term t owns post_rows[ptr[t]:ptr[t + 1]]
+    order = np.argsort(cols, kind="stable")
+    post_rows, post_vals = rows[order], vals[order]
+    ptr = np.concatenate(([0], np.cumsum(np.bincount(cols, minlength=len(vocab)))))
+
+    # paragraph-major entries (rows were appended in order)
+    row_ptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n))))
+
+    graph = []
+    for i in range(n):
+        terms = cols[row_ptr[i]:row_ptr[i + 1]]
+        weights = vals[row_ptr[i]:row_ptr[i + 1]]
+        if not len(terms):
+            graph.append([])
+            continue
+
+        starts, lengths = ptr[terms], ptr[terms + 1] - ptr[terms]
+        offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+        idx = offsets + np.arange(lengths.sum())
+        scores = np.bincount(post_rows[idx], weights=np.repeat(weights, lengths) * post_vals[idx], minlength=n)
+        scores[i] = 0.0
+
+        top = np.flatnonzero(scores > 0)
+        if len(top) > k:
+            top = top[np.argpartition(scores[top], -k)[-k:]]
+        graph.append(sorted(((float(scores[j]), int(j)) for j in top), reverse=True))
+    return graph
+
+
+# ----------------------------------------------------------
+# Coherence map
+# ----------------------------------------------------------
+def build_coherence_map(paragraphs, sections=None, k=TOP_K):
+    """
+    Returns {
+      paragraphs: [{paragraph, section, words, next_sim, best_sim, best_match, orphan}],
+      sections:   [{section, paragraphs, cohesion}],
+      orphans:    [paragraph numbers],
+      breaks:     [(a, b, sim)]  — adjacent pairs inside one section,
+      edges:      number of graph edges kept,
+    }
+    Paragraph numbers are 1-based over the non-heading paragraphs.
+    """
+    texts, labels = assign_sections(paragraphs, sections)
+    vectors = paragraph_vectors(texts)
+    graph = similarity_graph(vectors, k)
+
+    rows, orphans, breaks = [], [], []
+    for i, neighbours in enumerate(graph):
+        best_sim, best = neighbours[0] if neighbours else (0.0, None)
+        next_sim = cosine(vectors[i], vectors[i + 1]) if i + 1 < len(vectors) else None
+        orphan = best_sim < ORPHAN_SIM and len(texts) > 1
+        if orphan:
+            orphans.append(i + 1)
+        if next_sim is not None and next_sim < BREAK_SIM and labels[i] == labels[i + 1]:
+            breaks.append((i + 1, i + 2, round(next_sim, 3)))
+        rows.append({
+            "paragraph": i + 1,
+            "section": labels[i],
+            "words": len(texts[i].split()),
+            "next_sim": None if next_sim is None else round(next_sim, 3),
+            "best_sim": round(best_sim, 3),
+            "best_match": None if best is None else best + 1,
+            "orphan": orphan,
+        })
+
+    by_section = defaultdict(list)
+    for i, label in enumerate(labels):
+        by_section[label].append(i)
+
+    section_rows = []
+    for label in dict.fromkeys(labels):
+        members = by_section[label]
+        inside = set(members)
+        if len(members) > 1:
+            best_inside = [max((s for s, j in graph[i] if j in inside), default=0.0) for i in members]
+            cohesion = round(sum(best_inside) / len(best_inside), 3)
+        else:
+            cohesion = None
+        section_rows.append({"section": label, "paragraphs": len(members), "cohesion": cohesion})
+
+    # YAML sections with no matching paragraphs
+    for name in sections or []:
+        if name not in by_section:
+            section_rows.append({"section": name, "paragraphs": 0, "cohesion": None})
+
+    return {
+        "paragraphs": rows,
+        "sections": section_rows,
+        "orphans": orphans,
+        "breaks": breaks,
+        "edges": sum(len(n) for n in graph),
+    }
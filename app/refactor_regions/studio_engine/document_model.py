@@ -0,0 +1,139 @@
+# ==========================================================
+#  RippleWriter Studio — Document Model
+#  One parsed view of a draft, keyed by content hash and
+#  shared by scoring, Analyze and Export (which caches its
+#  parsed AST under the same digest). Each form is
+#  built on first use and then kept on the model:
+#
+#    text          normalized (LF line endings, outer blanks cut)
+#    paragraphs    + paragraph hashes and TextStats (paragraph LRU)
+#    stats         whole-text TextStats merged from paragraphs,
+#                  rebased on the previous model when most
+#                  paragraphs are unchanged (a live edit)
+#    signals       draft-profile RippleScore signals
+#    sentences     claim_engine.Sentence objects
+#    tokens        lowercase words
+#
+#  Models sit in a process-wide LRU bounded by model count and
+#  total characters, so memory stays bounded however many
+#  drafts a session touches.
+# ==========================================================
+
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import cached_property
+
+from app.refactor_regions.studio_engine.signal_engine import DEFAULT_ENGINE
+from app.refactor_regions.studio_engine.paragraph_cache import (
+    aggregate_stats,
+    paragraph_hash,
+    paragraph_stats,
+    rebase_aggregate,
+    split_paragraphs,
+)
+from app.refactor_regions.studio_engine.claim_engine import iter_sentences
+from app.refactor_regions.studio_engine.force_engine import words_of
+
+MAX_DOCUMENTS = 32
+MAX_CACHED_CHARS = 4_000_000
+
+
+def normalize_text(text):
+    return (text or "").replace("\r\n", "\n").replace("\r", "\n").strip()
+
+
+def document_hash(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# ----------------------------------------------------------
+# Model
+# ----------------------------------------------------------
+class DocumentModel:
+    """
+    Lazily parsed forms of one normalized text. Shared between
+    callers, so sequences are tuples. Use get_document().
+    """
+
+    def __init__(self, text, digest=None, base=None):
+        self.text = text
+        self.digest = digest or document_hash(text)
+        self._base = base       # previous model with stats built, dropped once used
+
+    @cached_property
+    def paragraphs(self):
+        return tuple(split_paragraphs(self.text))
+
+    @cached_property
+    def paragraph_hashes(self):
+        return tuple(paragraph_hash(p) for p in self.paragraphs)
+
+    @cached_property
+    def paragraph_stats(self):
+        return tuple(paragraph_stats(p, h) for p, h in zip(self.paragraphs, self.paragraph_hashes))
+
+    @cached_property
+    def stats(self):
+        base, self._base = self._base, None
+        base_stats = base.__dict__.get("stats") if base is not None else None
+        if base_stats is not None:
+            kept = len(set(base.paragraph_hashes) & set(self.paragraph_hashes))
+            if kept * 2 >= len(self.paragraph_hashes):
+                return rebase_aggregate(base_stats, base.paragraph_hashes, base.paragraph_stats,
+                                        self.paragraph_hashes, self.paragraph_stats)
+        return aggregate_stats(self.paragraph_stats)
+
+    @cached_property
+    def signals(self):
+        return DEFAULT_ENGINE.draft_signals_from_stats(self.stats)
+
+    @cached_property
+    def sentences(self):
+        return tuple(iter_sentences(self.text))
+
+    @cached_property
+    def tokens(self):
+        return words_of(self.text)
+
+    @property
+    def word_count(self):
+        return self.stats.words
+
+
+# ----------------------------------------------------------
+# Process-wide LRU
+# ----------------------------------------------------------
+_DOCUMENTS = OrderedDict()
+_DOCUMENTS_LOCK = threading.Lock()
+_cached_chars = 0
+
+
+def get_document(text):
+    """The shared DocumentModel for `text` (created on first request)."""
+    global _cached_chars
+    text = normalize_text(text)
+    digest = document_hash(text)
+
+    with _DOCUMENTS_LOCK:
+        doc = _DOCUMENTS.get(digest)
+        if doc is not None:
+            _DOCUMENTS.move_to_end(digest)
+            return doc
+
+        # the most recent model is usually the previous keystroke's version
+        latest = _DOCUMENTS[next(reversed(_DOCUMENTS))] if _DOCUMENTS else None
+        base = latest if latest is not None and "stats" in latest.__dict__ else None
+        doc = _DOCUMENTS[digest] = DocumentModel(text, digest, base)
+        _cached_chars += len(text)
+        while len(_DOCUMENTS) > 1 and (len(_DOCUMENTS) > MAX_DOCUMENTS or _cached_chars > MAX_CACHED_CHARS):
+            _, old = _DOCUMENTS.popitem(last=False)
+            _cached_chars -= len(old.text)
+        return doc
+
+
+def clear_documents():
+    global _cached_chars
+    with _DOCUMENTS_LOCK:
+        _DOCUMENTS.clear()
+        _cached_chars = 0
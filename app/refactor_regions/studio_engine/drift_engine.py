@@ -0,0 +1,125 @@
+# ==========================================================
+#  RippleWriter Studio — Narrative Drift Engine
+#  Drift = divergence of sliding paragraph windows from the
+#  thesis, measured on sparse TF-IDF vectors:
+#    drift[i] = 1 - cos(window_i, thesis)
+#    shift[i] = 1 - cos(window_i, window_{i-1})
+#  window_i covers paragraphs i-W+1 .. i, so editing one
+#  paragraph only invalidates the W windows that contain it.
+#  Cost is linear in paragraph count (no pairwise matrix).
+# ==========================================================
+
+import threading
+from collections import Counter
+
+from app.refactor_regions.studio_engine.paragraph_cache import paragraph_hash
+from app.refactor_regions.studio_engine.term_vectors import (
+    IdfSnapshot,
+    cosine,
+    term_counts,
+    terms_of,
+    tfidf,
+)
+
+DRIFT_WINDOW = 3
+# Re-snapshot IDF (and rebuild every window) once the paragraph count has
+# moved this far from the snapshot; small edits reuse the frozen IDF.
+IDF_REFRESH_RATIO = 0.25
+
+
+class DriftTracker:
+    """
+    Per-paragraph drift series for one evolving draft.
+    update() recomputes only windows whose paragraph hashes changed;
+    a changed thesis resets the IDF snapshot and every window.
+    """
+
+    def __init__(self, window=DRIFT_WINDOW):
+        self.window = max(1, int(window))
+        self._idf = None
+        self._idf_size = 0
+        self._vectors = {}      # window key (paragraph hashes) -> tfidf vector
+        self._drift = {}        # window key -> drift vs current thesis
+        self._shift = {}        # (prev key, key) -> shift
+        self._thesis_key = None
+        self.last_recomputed = 0
+        self.lock = threading.Lock()   # update() mutates the window caches
+
+    def _needs_idf_refresh(self, n):
+        return self._idf is None or abs(n - self._idf_size) > IDF_REFRESH_RATIO * max(1, self._idf_size)
+
+    def update(self, paragraphs, thesis=None):
+        """
+        paragraphs: paragraph texts in order. thesis: optional thesis
+        text (defaults to the first paragraph). Returns
+        [{paragraph, drift, shift}] with 1-based paragraph numbers.
+        """
+        hashes = [paragraph_hash(p) for p in paragraphs]
+        counts = [term_counts(p, h) for p, h in zip(paragraphs, hashes)]
+        if not counts:
+            self.last_recomputed = 0
+            return []
+
+        thesis_counts = Counter(terms_of(thesis)) if thesis else counts[0]
+        thesis_key = paragraph_hash(thesis) if thesis else hashes[0]
+        if thesis_key != self._thesis_key:
+            # a new thesis is a different draft: never reuse its IDF or windows
+            self._thesis_key = thesis_key
+            self._idf = None
+
+        if self._needs_idf_refresh(len(counts)):
+            self._idf = IdfSnapshot(counts)
+            self._idf_size = len(counts)
+            self._vectors, self._drift, self._shift = {}, {}, {}
+        thesis_vec = tfidf(thesis_counts, self._idf)
+
+        vectors, drifts, shifts = {}, {}, {}
+        recomputed = 0
+        series = []
+        prev_key = None
+
+        for i in range(len(counts)):
+            lo = max(0, i - self.window + 1)
+            key = tuple(hashes[lo:i + 1])
+
+            vec = vectors.get(key) or self._vectors.get(key)
+            if vec is None:
+                total = Counter()
+                for c in counts[lo:i + 1]:
+                    total.update(c)
+                vec = tfidf(total, self._idf)
+                recomputed += 1
+            vectors[key] = vec
+
+            drift = drifts.get(key, self._drift.get(key))
+            if drift is None:
+                drift = 1.0 - cosine(vec, thesis_vec) if thesis_vec else 0.0
+            drifts[key] = drift
+
+            shift = 0.0
+            if prev_key is not None:
+                pair = (prev_key, key)
+                shift = shifts.get(pair, self._shift.get(pair))
+                if shift is None:
+                    shift = 1.0 - cosine(vec, vectors[prev_key])
+                shifts[pair] = shift
+
+            series.append({"paragraph": i + 1, "drift": round(drift, 4), "shift": round(shift, 4)})
+            prev_key = key
+
+        # Keep only live windows so memory stays linear in paragraph count
+        self._vectors, self._drift, self._shift = vectors, drifts, shifts
+        self.last_recomputed = recomputed
+        return series
+
+
+def drift_summary(series, threshold=0.85):
+    """Mean / max drift and the paragraphs whose windows exceed threshold."""
+    if not series:
+        return {"mean": 0.0, "max": 0.0, "drifting": []}
+    drifts = [row["drift"] for row in series]
+    return {
+        "mean": sum(drifts) / len(drifts),
+        "max": max(drifts),
+        "drifting": [row["paragraph"] for row in series[1:] if row["drift"] > threshold],
+    }
@@ -0,0 +1,402 @@
+# ==========================================================
+#  RippleWriter Studio — RippleTruth Evidence Index
+#  Local, offline corpus for claim verification:
+#    articles/  +  output/posts/  +  ingested Monitor items
+#  Passages live in an on-disk SQLite inverted index and are
+#  ranked with BM25. Claims are matched in parallel and each
+#  claim's top-k is cached by claim hash (across drafts) until
+#  the corpus changes. Saved copies of the draft being checked
+#  are excluded so a claim can't corroborate itself.
+# ==========================================================
+
+import hashlib
+import html
+import json
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import yaml
+
+from app.refactor_regions.studio_engine.paragraph_cache import split_paragraphs
+from app.refactor_regions.studio_engine.term_vectors import terms_of
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+CORPUS_DIRS = (PROJECT_ROOT / "articles", PROJECT_ROOT / "output" / "posts")
+CORPUS_SUFFIXES = {".md", ".txt", ".html", ".htm", ".yaml", ".yml"}
+# prose fields of a YAML draft (articles/*.yaml), in reading order
+DRAFT_TEXT_KEYS = (
+    "title", "subtitle", "deck", "summary", "thesis", "lede",
+    "draft", "draft_text", "body", "content", "text", "counterpoints", "counterpoints_limits", "conclusion",
+)
+INDEX_PATH = PROJECT_ROOT / "app" / "refactor_regions" / "studio_state" / "evidence_index.sqlite3"
+
+PASSAGE_WORDS = 80
+BM25_K1 = 1.2
+BM25_B = 0.75
+SUPPORT_COVERAGE = 0.5      # share of claim terms a passage must contain
+COPY_SHARE = 0.5            # share of a draft's passages that marks a source as its copy
+MAX_CACHED_CLAIMS = 2048
+
+# SQLite releases the GIL while it reads, so claims are matched on threads
+_SEARCH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rw-evidence")
+
+_TAG_RE = re.compile(r"<(script|style)\b.*?</\1>|<[^>]+>", re.S | re.I)
+_BLOCK_TAG_RE = re.compile(r"</?(?:p|div|h[1-6]|li|br|tr|section|article|blockquote)\b[^>]*>", re.I)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY, source TEXT UNIQUE, signature TEXT
+);
+CREATE TABLE IF NOT EXISTS passages (
+    id INTEGER PRIMARY KEY, doc_id INTEGER, text TEXT, length INTEGER, digest TEXT
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT, passage_id INTEGER, tf INTEGER
+);
+CREATE INDEX IF NOT EXISTS postings_term ON postings (term);
+CREATE INDEX IF NOT EXISTS postings_passage ON postings (passage_id);
+CREATE INDEX IF NOT EXISTS passages_doc ON passages (doc_id);
+CREATE INDEX IF NOT EXISTS passages_digest ON passages (digest);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS claim_cache (
+    claim_hash TEXT PRIMARY KEY, version INTEGER, results TEXT
+);
+"""
+
+
+def claim_hash(claim):
+    return hashlib.blake2b(" ".join(claim.lower().split()).encode("utf-8"), digest_size=16).hexdigest()
+
+
+# passages are fingerprinted the same way, so a draft's paragraphs can be found in the index
+passage_hash = claim_hash
+
+
+def _exclusion_key(exclude):
+    if not exclude:
+        return ""
+    joined = "\n".join(sorted(exclude)).encode("utf-8")
+    return ":" + hashlib.blake2b(joined, digest_size=8).hexdigest()
+
+
+def html_to_text(raw):
+    raw = _BLOCK_TAG_RE.sub("\n\n", raw)
+    return html.unescape(_TAG_RE.sub(" ", raw))
+
+
+def split_passages(text, size=PASSAGE_WORDS):
+    """Paragraphs, with long paragraphs cut into ~size-word windows."""
+    out = []
+    for para in split_paragraphs(text):
+        words = para.split()
+        for i in range(0, len(words), size):
+            chunk = " ".join(words[i:i + size])
+            if len(chunk) > 20:
+                out.append(chunk)
+    return out
+
+
+def _section_texts(sections):
+    for sec in sections or []:
+        if isinstance(sec, dict):
+            for key in ("heading", "hed", "content", "copy", "text"):
+                if isinstance(sec.get(key), str):
+                    yield sec[key]
+            yield from _section_texts(sec.get("subsections"))
+        elif isinstance(sec, str):
+            yield sec
+
+
+def draft_text(data):
+    """Prose of a YAML draft: body fields, generated_sections, sections[] and claims."""
+    parts = [data[k] for k in DRAFT_TEXT_KEYS if isinstance(data.get(k), str)]
+    gen = data.get("generated_sections")
+    if isinstance(gen, dict):
+        parts.extend(v if isinstance(v, str) else "\n".join(map(str, v)) for v in gen.values() if v)
+    parts.extend(_section_texts(data.get("sections")))
+    for claim in data.get("claims") or []:
+        text = claim.get("claim") if isinstance(claim, dict) else claim
+        if isinstance(text, str):
+            parts.append(text)
+    return "\n\n".join(p.strip() for p in parts if p and p.strip())
+
+
+def _read_corpus_file(path):
+    raw = path.read_text(encoding="utf-8", errors="ignore")
+    suffix = path.suffix.lower()
+    if suffix in (".html", ".htm"):
+        return html_to_text(raw)
+    if suffix in (".yaml", ".yml"):
+        try:
+            data = yaml.safe_load(raw)
+        except yaml.YAMLError:
+            return ""
+        return draft_text(data) if isinstance(data, dict) else ""
+    return raw
+
+
+def _monitor_item_text(item):
+    return "\n\n".join(str(item.get(k) or "") for k in ("title", "summary"))
+
+
+# ----------------------------------------------------------
+# Index
+# ----------------------------------------------------------
+class EvidenceIndex:
+    """
+    BM25 over passages stored in SQLite. sync() re-indexes only
+    sources whose signature changed; search() is thread-safe
+    (one connection per thread).
+    """
+
+    def __init__(self, path=INDEX_PATH, corpus_dirs=CORPUS_DIRS):
+        self.path = Path(path)
+        self.corpus_dirs = tuple(Path(d) for d in corpus_dirs)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._cache = OrderedDict()     # (claim_hash, k, version) -> results
+        self._cache_lock = threading.Lock()
+        self._stats = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(passages)")}
+        if columns and "digest" not in columns:
+            # index built before passage digests: rebuild it on the next sync()
+            conn.executescript(
+                "DROP TABLE passages; DROP TABLE IF EXISTS postings; "
+                "DROP TABLE IF EXISTS docs; DROP TABLE IF EXISTS claim_cache;"
+            )
+        conn.executescript(_SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")     # readers don't block the writer
+            self._local.conn = conn
+        return conn
+
+    # ------------------------------------------------------
+    # Building
+    # ------------------------------------------------------
+    def _file_sources(self):
+        for d in self.corpus_dirs:
+            if not d.is_dir():
+                continue
+            for path in sorted(d.rglob("*")):
+                if path.suffix.lower() in CORPUS_SUFFIXES and path.is_file():
+                    st = path.stat()
+                    yield str(path), f"{st.st_mtime_ns}:{st.st_size}", path
+
+    def sync(self, monitor_items=None):
+        """
+        Bring the index up to date with the corpus folders (and, when
+        given, the current Monitor items). Returns the number of
+        sources (re)indexed.
+        """
+        wanted = {src: (sig, lambda p=path: _read_corpus_file(p)) for src, sig, path in self._file_sources()}
+        prefixes = ("file",)
+
+        if monitor_items is not None:
+            prefixes = ("file", "monitor")
+            for item in monitor_items:
+                text = _monitor_item_text(item)
+                src = "monitor:" + (item.get("url") or item.get("title") or "")
+                sig = hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+                wanted[src] = (sig, lambda t=text: t)
+
+        with self._write_lock:
+            conn = self._conn()
+            have = {src: (doc_id, sig) for doc_id, src, sig in conn.execute("SELECT id, source, signature FROM docs")}
+
+            stale = [
+                doc_id for src, (doc_id, sig) in have.items()
+                if (src not in wanted and _kind(src) in prefixes) or (src in wanted and wanted[src][0] != sig)
+            ]
+            fresh = [src for src, (sig, _) in wanted.items() if src not in have or have[src][1] != sig]
+            if not stale and not fresh:
+                return 0
+
+            with conn:
+                for doc_id in stale:
+                    conn.execute(
+                        "DELETE FROM postings WHERE passage_id IN (SELECT id FROM passages WHERE doc_id = ?)",
+                        (doc_id,),
+                    )
+                    conn.execute("DELETE FROM passages WHERE doc_id = ?", (doc_id,))
+                    conn.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+
+                for src in fresh:
+                    sig, read = wanted[src]
+                    doc_id = conn.execute(
+                        "INSERT INTO docs (source, signature) VALUES (?, ?)", (src, sig)
+                    ).lastrowid
+                    for passage in split_passages(read()):
+                        terms = terms_of(passage)
+                        pid = conn.execute(
+                            "INSERT INTO passages (doc_id, text, length, digest) VALUES (?, ?, ?, ?)",
+                            (doc_id, passage, len(terms), passage_hash(passage)),
+                        ).lastrowid
+                        conn.executemany(
+                            "INSERT INTO postings (term, passage_id, tf) VALUES (?, ?, ?)",
+                            [(t, pid, n) for t, n in Counter(terms).items()],
+                        )
+
+                version = int(self._meta("version", 0)) + 1
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(version),))
+                conn.execute("DELETE FROM claim_cache")
+
+            self._stats = None
+            with self._cache_lock:
+                self._cache.clear()
+            return len(fresh)
+
+    def _meta(self, key, default=None):
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def stats(self):
+        """(passage count, average passage length, corpus version)."""
+        if self._stats is None:
+            n, avg = self._conn().execute("SELECT COUNT(*), AVG(length) FROM passages").fetchone()
+            self._stats = (n or 0, avg or 0.0, int(self._meta("version", 0)))
+        return self._stats
+
+    def draft_sources(self, text):
+        """
+        Indexed sources holding most of this draft's passages, i.e.
+        its saved copies. A source quoting one paragraph isn't one.
+        """
+        digests = sorted({passage_hash(p) for p in split_passages(text)})
+        conn = self._conn()
+        shared = Counter()
+        for i in range(0, len(digests), 500):
+            batch = digests[i:i + 500]
+            shared.update(src for src, _digest in conn.execute(
+                f"SELECT DISTINCT d.source, s.digest FROM passages s JOIN docs d ON d.id = s.doc_id "
+                f"WHERE s.digest IN ({','.join('?' * len(batch))})",
+                batch,
+            ))
+        return frozenset(src for src, n in shared.items() if n > COPY_SHARE * len(digests))
+
+    # ------------------------------------------------------
+    # Search
+    # ------------------------------------------------------
+    def search(self, claim, k=3, exclude=()):
+        """
+        Top-k passages for one claim: [{source, text, score, coverage}].
+        Passages from the sources in exclude are skipped.
+        """
+        n_passages, avgdl, version = self.stats()
+        exclude = frozenset(exclude)
+        key = (claim_hash(claim), k, version, exclude)
+        cache_id = f"{key[0]}:{k}{_exclusion_key(exclude)}"
+
+        with self._cache_lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+                return hit
+
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT results FROM claim_cache WHERE claim_hash = ? AND version = ?", (cache_id, version)
+        ).fetchone()
+        if row:
+            results = json.loads(row[0])
+        else:
+            results = self._rank(conn, claim, k, n_passages, avgdl, exclude)
+            with self._write_lock, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO claim_cache VALUES (?, ?, ?)",
+                    (cache_id, version, json.dumps(results)),
+                )
+
+        with self._cache_lock:
+            self._cache[key] = results
+            if len(self._cache) > MAX_CACHED_CLAIMS:
+                self._cache.popitem(last=False)
+        return results
+
+    def _rank(self, conn, claim, k, n_passages, avgdl, exclude=frozenset()):
+        query = sorted(set(terms_of(claim)))
+        if not query or not n_passages:
+            return []
+
+        marks = ",".join("?" * len(query))
+        rows = conn.execute(
+            f"SELECT p.term, p.passage_id, p.tf, s.length, d.source FROM postings p "
+            f"JOIN passages s ON s.id = p.passage_id JOIN docs d ON d.id = s.doc_id WHERE p.term IN ({marks})",
+            query,
+        ).fetchall()
+
+        # document frequencies cover the whole corpus, so excluding a source doesn't shift scores
+        df = Counter(term for term, *_ in rows)
+        scores = Counter()
+        matched = Counter()
+        for term, pid, tf, length, source in rows:
+            if source in exclude:
+                continue
+            idf = math.log(1 + (n_passages - df[term] + 0.5) / (df[term] + 0.5))
+            norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * length / (avgdl or 1))
+            scores[pid] += idf * tf * (BM25_K1 + 1) / norm
+            matched[pid] += 1
+
+        out = []
+        for pid, score in scores.most_common(k):
+            text, source = conn.execute(
+                "SELECT s.text, d.source FROM passages s JOIN docs d ON d.id = s.doc_id WHERE s.id = ?", (pid,)
+            ).fetchone()
+            out.append({
+                "source": _display_source(source),
+                "text": text,
+                "score": round(score, 3),
+                "coverage": round(matched[pid] / len(query), 3),
+            })
+        return out
+
+    def verify_claims(self, claims, k=3, exclude=()):
+        """Top-k evidence for every claim, matched in parallel (input order)."""
+        claims = list(claims)
+        exclude = frozenset(exclude)
+        if len(claims) <= 1:
+            return [self.search(c, k, exclude) for c in claims]
+        return list(_SEARCH_POOL.map(lambda c: self.search(c, k, exclude), claims))
+
+
+def _kind(source):
+    return "monitor" if source.startswith("monitor:") else "file"
+
+
+def _display_source(source):
+    if source.startswith("monitor:"):
+        return source
+    try:
+        return str(Path(source).relative_to(PROJECT_ROOT))
+    except ValueError:
+        return source
+
+
+def is_supported(evidence):
+    """True if the best passage covers enough of the claim's terms."""
+    return bool(evidence) and evidence[0]["coverage"] >= SUPPORT_COVERAGE
+
+
+# ----------------------------------------------------------
+# Shared instance
+# ----------------------------------------------------------
+_INDEX = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_evidence_index():
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = EvidenceIndex()
+        return _INDEX
@@ -0,0 +1,160 @@
+# ==========================================================
+#  RippleWriter Studio — Narrative Force Analyzer
+#  Lexicons from yaml/models/narrative_force.yaml are compiled
+#  into one word-level trie. Text is tokenized once per
+#  sentence and matched left-to-right (longest phrase wins),
+#  so every hit is whole-word and the cost per word depends
+#  on phrase length, not on lexicon size.
+#
+#  Per sentence: hit counts per lexicon.
+#  Per section:  force vector over the YAML dimensions
+#                (tone, momentum, pressure by default).
+# ==========================================================
+
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+from app.utils.yaml_tools import load_model
+from app.refactor_regions.studio_engine.claim_engine import iter_sentences
+
+DEFAULT_SCALE = 10.0
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_END = "\0"     # trie key marking "a phrase ends here" -> set of lexicons
+
+
+def words_of(text):
+    return _WORD_RE.findall(text.lower().replace("’", "'"))
+
+
+# ----------------------------------------------------------
+# Compilation
+# ----------------------------------------------------------
+class LexiconMatcher:
+    """All lexicons in one trie keyed by word."""
+
+    def __init__(self, lexicons):
+        self.lexicons = sorted(lexicons)
+        self.root = {}
+        self.entries = 0
+        for name, phrases in lexicons.items():
+            for phrase in phrases or []:
+                words = words_of(str(phrase)) if phrase is not None else []     # YAML "- " is null
+                if not words:
+                    continue
+                node = self.root
+                for w in words:
+                    node = node.setdefault(w, {})
+                node.setdefault(_END, set()).add(name)
+                self.entries += 1
+
+    def match(self, words):
+        """
+        Non-overlapping longest matches over a word list.
+        Returns [(start, end, lexicons)] with word offsets.
+        """
+        hits = []
+        i, n = 0, len(words)
+        root = self.root
+        while i < n:
+            node = root.get(words[i])
+            if node is None:
+                i += 1
+                continue
+            best = None
+            j = i
+            while node is not None:
+                j += 1
+                if _END in node:
+                    best = (j, node[_END])
+                node = node.get(words[j]) if j < n else None
+            if best:
+                hits.append((i, best[0], best[1]))
+                i = best[0]
+            else:
+                i += 1
+        return hits
+
+    def count(self, words):
+        counts = Counter()
+        for _s, _e, names in self.match(words):
+            counts.update(names)
+        return counts
+
+
+@lru_cache(maxsize=4)
+def load_force_model(name="narrative_force.yaml"):
+    """(matcher, dimensions, scale) compiled once per model file."""
+    cfg = load_model(name) or {}
+    if "error" in cfg:
+        cfg = {}
+    matcher = LexiconMatcher(cfg.get("lexicons") or {})
+    dimensions = cfg.get("dimensions") or {}
+    return matcher, dimensions, float(cfg.get("scale", DEFAULT_SCALE))
+
+
+# ----------------------------------------------------------
+# Analysis
+# ----------------------------------------------------------
+def force_vector(counts, words, dimensions, scale=DEFAULT_SCALE):
+    """{dimension: value in [-1, 1]} from lexicon hit counts."""
+    out = {}
+    for dim, spec in dimensions.items():
+        net = counts.get(spec.get("drive"), 0) - counts.get(spec.get("oppose"), 0)
+        out[dim] = max(-1.0, min(1.0, net / max(1, words) * scale))
+    return out
+
+
+def analyze_force(paragraphs, labels=None, model="narrative_force.yaml"):
+    """
+    paragraphs: texts in order; labels: section per paragraph (optional).
+    Returns {
+      sentences: [{sentence, paragraph, section, text, words, hits}],
+      sections:  [{section, words, counts, force}],
+      document:  {words, counts, force},
+    }
+    """
+    matcher, dimensions, scale = load_force_model(model)
+    labels = labels or ["Document"] * len(paragraphs)
+
+    sentences = []
+    section_counts = defaultdict(Counter)
+    section_words = Counter()
+
+    n = 0
+    for p, (para, label) in enumerate(zip(paragraphs, labels), start=1):
+        for sent in iter_sentences(para):
+            words = words_of(sent.text)
+            hits = matcher.count(words)
+            n += 1
+            sentences.append({
+                "sentence": n,
+                "paragraph": p,
+                "section": label,
+                "text": sent.text,
+                "words": len(words),
+                "hits": dict(hits),
+            })
+            section_counts[label].update(hits)
+            section_words[label] += len(words)
+
+    sections = []
+    total = Counter()
+    for label in dict.fromkeys(labels):
+        counts = section_counts[label]
+        total.update(counts)
+        sections.append({
+            "section": label,
+            "words": section_words[label],
+            "counts": dict(counts),
+            "force": force_vector(counts, section_words[label], dimensions, scale),
+        })
+
+    words = sum(section_words.values())
+    return {
+        "sentences": sentences,
+        "sections": sections,
+        "document": {"words": words, "counts": dict(total), "force": force_vector(total, words, dimensions, scale)},
+        "dimensions": list(dimensions),
+    }
@@ -0,0 +1,218 @@
+# ==========================================================
+#  RippleWriter Studio — Intention Equation Compiler
+#  Turns yaml/models/intention.yaml expressions such as
+#  "Clarity × Credibility × Resonance" into cached,
+#  vectorized callables over (N, 5) signal matrices.
+#
+#  Semantics:
+#    factor   = weighted blend of signals (intention.yaml `factors`)
+#    A × B    = weighted geometric mean of the factors,
+#               exponents = factor weights / sum of weights
+#    0.4 A    = numeric coefficient on a term
+#    T1 + T2  = coefficient-weighted mean of the terms
+# ==========================================================
+
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from app.utils.yaml_tools import load_model
+from app.refactor_regions.studio_engine.signal_engine import SIGNAL_KEYS
+
+DEFAULT_FACTOR_WEIGHT = 0.25
+_EPS = 1e-9
+
+_TOKEN_RE = re.compile(r"\s*(?:(\d+(?:\.\d+)?)|([A-Za-z][A-Za-z_-]*)|([×*·+]))")
+
+
+# ----------------------------------------------------------
+# Parsing
+# ----------------------------------------------------------
+def parse_expression(expr):
+    """
+    Parse an equation string into [(coefficient, (factor, ...)), ...].
+    Raises ValueError on malformed input.
+    """
+    terms = []
+    coef, factors = 1.0, []
+    pos = 0
+    dangling = False
+    expr = (expr or "").strip()
+
+    while pos < len(expr):
+        m = _TOKEN_RE.match(expr, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"Unexpected character in equation {expr!r} at {pos}")
+        pos = m.end()
+        number, name, op = m.groups()
+        dangling = op is not None
+
+        if number is not None:
+            coef *= float(number)
+        elif name is not None:
+            factors.append(name.strip().title())
+        elif op == "+":
+            if not factors:
+                raise ValueError(f"Empty term in equation {expr!r}")
+            terms.append((coef, tuple(factors)))
+            coef, factors = 1.0, []
+
+    if not factors or dangling:
+        raise ValueError(f"Empty term in equation {expr!r}")
+    terms.append((coef, tuple(factors)))
+    return terms
+
+
+# ----------------------------------------------------------
+# Compiled equations
+# ----------------------------------------------------------
+class CompiledEquation:
+    """One equation lowered to matrices; call with an (N, 5) signal matrix."""
+
+    def __init__(self, expression, factor_map, exponents, coefficients):
+        self.expression = expression
+        self.factor_map = factor_map        # (5, K) signals -> factors
+        self.exponents = exponents          # (K, T) log-space term exponents
+        self.coefficients = coefficients    # (T,)   normalized term weights
+
+    def __call__(self, S):
+        S = np.atleast_2d(np.asarray(S, dtype=np.float64))
+        F = np.clip(S @ self.factor_map, _EPS, 1.0)
+        return np.exp(np.log(F) @ self.exponents) @ self.coefficients
+
+
+def _factor_matrix(names, factor_table):
+    M = np.zeros((len(SIGNAL_KEYS), len(names)), dtype=np.float64)
+    for j, name in enumerate(names):
+        blend = factor_table.get(name)
+        if not blend:
+            raise ValueError(f"Unknown intention factor {name!r}")
+        total = sum(abs(float(v)) for v in blend.values()) or 1.0
+        for sig, w in blend.items():
+            M[SIGNAL_KEYS.index(sig), j] = float(w) / total
+    return M
+
+
+@lru_cache(maxsize=256)
+def _compile_cached(expression, weights_items, factor_items):
+    weights = dict(weights_items)
+    factor_table = {name: dict(blend) for name, blend in factor_items}
+
+    terms = parse_expression(expression)
+    names = sorted({f for _c, fs in terms for f in fs})
+    col = {n: j for j, n in enumerate(names)}
+
+    E = np.zeros((len(names), len(terms)), dtype=np.float64)
+    C = np.zeros(len(terms), dtype=np.float64)
+    for t, (coef, fs) in enumerate(terms):
+        w = np.array([float(weights.get(f, DEFAULT_FACTOR_WEIGHT)) for f in fs])
+        w = w / (w.sum() or 1.0)
+        for f, wf in zip(fs, w):
+            E[col[f], t] += wf
+        C[t] = coef
+    C = C / (np.abs(C).sum() or 1.0)
+
+    return CompiledEquation(expression, _factor_matrix(names, factor_table), E, C)
+
+
+def _freeze(table):
+    return tuple(sorted((k, tuple(sorted(v.items())) if isinstance(v, dict) else v) for k, v in table.items()))
+
+
+def compile_equation(expression, weights, factor_table):
+    """Compile (and cache) one expression for a given weight/factor table."""
+    return _compile_cached(expression, _freeze(weights), _freeze(factor_table))
+
+
+# ----------------------------------------------------------
+# Equation bank — every format evaluated in one pass
+# ----------------------------------------------------------
+class EquationBank:
+    """
+    All intention.yaml equations stacked together.
+    evaluate(S) returns an (N, Q) matrix, one column per equation.
+    Equation `name` is compiled with `weights`, then
+    format_overrides[name], then `overrides` merged on top.
+    """
+
+    def __init__(self, equations, weights, factor_table, format_overrides=None, overrides=None):
+        self.names = list(equations)
+        self.expressions = [equations[n] for n in self.names]
+        self.weights = {n: equation_weights(n, weights, format_overrides, overrides) for n in self.names}
+        compiled = [compile_equation(equations[n], self.weights[n], factor_table) for n in self.names]
+
+        # Stack per-equation matrices block-diagonally so every format is
+        # evaluated with the same three matmuls.
+        self.factor_map = np.hstack([c.factor_map for c in compiled]) if compiled else np.zeros((len(SIGNAL_KEYS), 0))
+        k_total = self.factor_map.shape[1]
+        t_total = sum(c.exponents.shape[1] for c in compiled)
+
+        self.exponents = np.zeros((k_total, t_total))
+        self.coefficients = np.zeros((t_total, len(compiled)))
+        k0 = t0 = 0
+        for q, c in enumerate(compiled):
+            k, t = c.exponents.shape
+            self.exponents[k0:k0 + k, t0:t0 + t] = c.exponents
+            self.coefficients[t0:t0 + t, q] = c.coefficients
+            k0 += k
+            t0 += t
+
+    def evaluate(self, S):
+        S = np.atleast_2d(np.asarray(S, dtype=np.float64))
+        if not self.names:
+            return np.zeros((S.shape[0], 0))
+        F = np.clip(S @ self.factor_map, _EPS, 1.0)
+        return np.exp(np.log(F) @ self.exponents) @ self.coefficients
+
+    def score(self, signals):
+        """Score one signal dict -> {format: score}."""
+        row = self.evaluate([[float(signals.get(k, 0.0)) for k in SIGNAL_KEYS]])[0]
+        return {name: float(v) for name, v in zip(self.names, row)}
+
+
+def equation_weights(name, weights, format_overrides=None, overrides=None):
+    """Factor weights for one equation: base < format_overrides[name] < overrides."""
+    merged = dict(weights or {})
+    merged.update((format_overrides or {}).get(name) or {})
+    merged.update(overrides or {})
+    return merged
+
+
+def draft_weight_overrides(data):
+    """A draft YAML's own `intention_weights` ({factor: weight}), or {}."""
+    raw = (data or {}).get("intention_weights") if isinstance(data, dict) else None
+    if not isinstance(raw, dict):
+        return {}
+    out = {}
+    for factor, weight in raw.items():
+        try:
+            out[str(factor).strip().title()] = float(weight)
+        except (TypeError, ValueError):
+            continue
+    return out
+
+
+def load_intention_bank(overrides=None, extra_equations=None, name="intention.yaml"):
+    """
+    Build an EquationBank from intention.yaml. Each equation uses the
+    base `weights`, its own `format_overrides` entry, then `overrides`
+    (e.g. a draft's `intention_weights`). `extra_equations` adds named
+    expressions such as a draft's own `intention_equation`.
+    """
+    cfg = load_model(name) or {}
+    if "error" in cfg:
+        cfg = {}
+
+    equations = dict(cfg.get("equations") or {})
+    if cfg.get("default_equation"):
+        equations.setdefault("default", cfg["default_equation"])
+    equations.update(extra_equations or {})
+
+    return EquationBank(
+        equations,
+        cfg.get("weights") or {},
+        cfg.get("factors") or {},
+        format_overrides=cfg.get("format_overrides") or {},
+        overrides=overrides,
+    )
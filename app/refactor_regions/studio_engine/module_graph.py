@@ -0,0 +1,90 @@
+# ==========================================================
+#  RippleWriter Studio — Module Graph Scheduler
+#  Runs analysis modules declared as a small dependency graph.
+#  A module starts as soon as its upstream modules finish, so
+#  independent modules run concurrently on the given executor.
+#
+#  graph = {name: (fn, (dep, ...))}
+#  fn(doc, deps) -> result      deps = {dep: upstream result}
+#
+#  With on_error, a module that raises gets on_error(name, exc)
+#  as its result and the rest of the graph still runs; modules
+#  downstream of it are skipped the same way (UpstreamError).
+# ==========================================================
+
+from concurrent.futures import FIRST_COMPLETED, wait
+
+
+class UpstreamError(RuntimeError):
+    """A module was skipped because a module it depends on failed."""
+
+
+def validate_graph(graph):
+    """Raise ValueError on unknown dependencies or cycles."""
+    for name, (_fn, deps) in graph.items():
+        missing = [d for d in deps if d not in graph]
+        if missing:
+            raise ValueError(f"Module {name!r} depends on unknown modules {missing}")
+
+    state = {}
+
+    def visit(name, path):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "active":
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+        state[name] = "active"
+        for dep in graph[name][1]:
+            visit(dep, path + [name])
+        state[name] = "done"
+
+    for name in graph:
+        visit(name, [])
+
+
+def run_graph(graph, doc, executor, on_result=None, on_error=None):
+    """
+    Execute every module in `graph` against the shared `doc`.
+    on_result(name, result) is called as each module finishes
+    (in completion order). Without on_error the first exception
+    propagates. Returns {name: result}.
+    """
+    validate_graph(graph)
+
+    results = {}
+    failed = set()
+    pending = dict(graph)
+    running = {}
+
+    def finish(name, result):
+        results[name] = result
+        if on_result:
+            on_result(name, result)
+
+    while pending or running:
+        for name, (fn, deps) in list(pending.items()):
+            if not all(d in results for d in deps):
+                continue
+            del pending[name]
+            broken = [d for d in deps if d in failed]
+            if broken:
+                failed.add(name)
+                finish(name, on_error(name, UpstreamError(f"skipped: {', '.join(broken)} failed")))
+            else:
+                running[executor.submit(fn, doc, {d: results[d] for d in deps})] = name
+        if not running:
+            continue
+
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = running.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                if on_error is None:
+                    raise
+                failed.add(name)
+                result = on_error(name, e)
+            finish(name, result)
+
+    return results
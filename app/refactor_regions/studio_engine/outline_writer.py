@@ -0,0 +1,177 @@
+# ==========================================================
+#  RippleWriter Studio — Parallel Outline Writer
+#  One completion per outline item instead of one for the
+#  whole piece. Every request carries the same system prompt
+#  and brief (thesis, tone, audience, full outline) as its
+#  prefix; only the section to write differs. Requests run
+#  concurrently and are stitched back in outline order, then
+#  one short consistency pass rewrites section openings that
+#  do not follow from the section before.
+#
+#  Wall time ~ slowest section + the consistency pass, so long
+#  formats ("Dissertation Chapter") cost about one section.
+#
+#  Plan sources, first match wins: an explicit template
+#  (yaml/templates/*.yaml `sections`, nested `subsections`
+#  flattened), the article's outline, its `sections`, the
+#  section list of its format (yaml/system/formats.yaml), and
+#  finally lede / body / counterpoints / conclusion.
+# ==========================================================
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from llm_client import DEFAULT_SECTION_WORDS, POST_SECTIONS, SECTION_WORDS, LLMClient
+
+MAX_WORKERS = 8
+TARGET_WORDS = 1100     # whole piece, when neither the article nor the caller sets one
+MIN_SECTION_WORDS = 120
+
+POST_LABELS = {"lede": "Lede", "body": "Body", "counterpoints": "Counterpoints & Limits", "conclusion": "Conclusion"}
+
+_JOIN_RE = re.compile(r"^\s*\[(\d+)\]\s*(.+?)\s*$", re.MULTILINE)
+
+
+# ----------------------------------------------------------
+# Section plan
+# ----------------------------------------------------------
+def _plan_items(entries, level=2):
+    plan = []
+    for entry in entries or []:
+        if isinstance(entry, str):
+            if entry.strip():
+                plan.append({"heading": entry.strip(), "level": level, "guidance": ""})
+            continue
+        if not isinstance(entry, dict):
+            continue
+        heading = str(entry.get("hed") or entry.get("heading") or entry.get("title") or "").strip()
+        guidance = str(entry.get("copy") or entry.get("content") or entry.get("description") or "")
+        subs = _plan_items(entry.get("subsections"), level + 1)
+        if heading:
+            # a parent with subsections is only a heading; its children are drafted
+            plan.append({"heading": heading, "level": level, "guidance": guidance, "container": bool(subs)})
+        plan.extend(subs)
+    return plan
+
+
+def _format_sections(fmt):
+    if not fmt:
+        return []
+    try:
+        from app.utils.yaml_tools import load_system
+        formats = (load_system("formats.yaml") or {}).get("formats") or {}
+    except Exception:
+        return []
+    return (formats.get(fmt) or {}).get("sections") or []
+
+
+def section_plan(y, template=None):
+    """[{heading, level, guidance[, container]}] in outline order."""
+    for source in (
+        (template or {}).get("sections"),
+        y.get("outline"),
+        y.get("sections"),
+        _format_sections(y.get("format")),
+    ):
+        plan = _plan_items(source)
+        if plan:
+            return plan
+    return [{"heading": POST_LABELS[k], "level": 2, "guidance": ""} for k in POST_SECTIONS]
+
+
+def _section_words(y, plan, words):
+    if words:
+        return int(words)
+    drafted = sum(not item.get("container") for item in plan) or 1
+    total = int(y.get("target_words") or y.get("word_count") or TARGET_WORDS)
+    return max(MIN_SECTION_WORDS, total // drafted)
+
+
+# ----------------------------------------------------------
+# Consistency pass
+# ----------------------------------------------------------
+def _paragraphs(text):
+    return [p for p in re.split(r"\n\s*\n", text or "") if p.strip()]
+
+
+def smooth(y, sections, llm):
+    """Rewrite openings flagged by one short completion; returns the number changed."""
+    drafted = [i for i, s in enumerate(sections) if s["content"].strip()]
+    joins = []
+    for k in range(1, len(drafted)):
+        before = _paragraphs(sections[drafted[k - 1]]["content"])[-1]
+        after = _paragraphs(sections[drafted[k]]["content"])[0]
+        joins.append((k, before, after))
+    reply = llm.smooth_transitions(y, joins)
+
+    changed = 0
+    for m in _JOIN_RE.finditer(reply or ""):
+        k = int(m.group(1))
+        if not 1 <= k < len(drafted):
+            continue
+        section = sections[drafted[k]]
+        paras = _paragraphs(section["content"])
+        paras[0] = m.group(2)
+        section["content"] = "\n\n".join(paras)
+        changed += 1
+    return changed
+
+
+# ----------------------------------------------------------
+# Entry points
+# ----------------------------------------------------------
+def write_outline(y, plan=None, template=None, llm=None, words=None, workers=MAX_WORKERS,
+                  consistency=True, report=None):
+    """
+    Draft every planned section concurrently. Returns
+    [{heading, level, content}] in plan order.
+    report(fraction, message) is called as sections finish.
+    """
+    plan = plan or section_plan(y, template)
+    llm = llm or LLMClient()
+    headings = [item["heading"] for item in plan]
+    per_section = _section_words(y, plan, words)
+    todo = [i for i, item in enumerate(plan) if not item.get("container")]
+
+    sections = [{"heading": item["heading"], "level": item["level"], "content": ""} for item in plan]
+    if not todo:
+        return sections
+
+    def draft(i):
+        item = plan[i]
+        n = item.get("words") or per_section
+        return i, llm.write_outline_section(y, headings, i, item.get("guidance", ""), n)
+
+    steps = len(todo) + (1 if consistency else 0)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(todo)))) as pool:
+        for done, (i, text) in enumerate(pool.map(draft, todo), 1):
+            sections[i]["content"] = text
+            if report:
+                report(done / steps, f"Drafted {done}/{len(todo)}: {headings[i]}")
+
+    if consistency and len(todo) > 1:
+        changed = smooth(y, sections, llm)
+        if report:
+            report(1.0, f"Consistency pass: {changed} opening(s) revised")
+    return sections
+
+
+def stitch(sections, title=None):
+    """Markdown draft: optional # title, then one heading per section."""
+    parts = [f"# {title}"] if title else []
+    for s in sections:
+        parts.append(f"{'#' * s['level']} {s['heading']}")
+        if s["content"].strip():
+            parts.append(s["content"].strip())
+    return "\n\n".join(parts) + "\n"
+
+
+def write_post_sections_parallel(y, llm=None, workers=MAX_WORKERS):
+    """Parallel counterpart of LLMClient.write_post_sections (same keys)."""
+    plan = [
+        {"heading": POST_LABELS[k], "level": 2, "guidance": "",
+         "words": SECTION_WORDS.get(k, DEFAULT_SECTION_WORDS)}
+        for k in POST_SECTIONS
+    ]
+    sections = write_outline(y, plan=plan, llm=llm, workers=workers)
+    return {k: s["content"].strip() for k, s in zip(POST_SECTIONS, sections)}
@@ -0,0 +1,165 @@
+# ==========================================================
+#  RippleWriter Studio — Paragraph Scoring Cache
+#  Live drafts are split into content-hashed paragraphs;
+#  each paragraph is scanned once and its TextStats cached.
+#  Document-level stats are running aggregates: a new version
+#  of a draft is rebased on the previous one, so an edit only
+#  rescans and re-adds the changed paragraphs.
+# ==========================================================
+
+import hashlib
+import re
+import threading
+from collections import Counter, OrderedDict
+
+from app.refactor_regions.studio_engine.signal_engine import scan
+
+PARAGRAPH_SPLIT_RE = re.compile(r"\n[ \t\r\f\v]*\n\s*")
+MAX_CACHED_PARAGRAPHS = 4096
+
+_ADDITIVE = ("words", "chars", "citation_hits", "ref_hits", "digits", "ellipses", "unicode_ellipses")
+
+
+def split_paragraphs(text):
+    """Split on blank lines. Separators are whitespace only, so the
+    paragraph stats merge back to exactly the whole-text stats."""
+    return [p for p in PARAGRAPH_SPLIT_RE.split(text or "") if p.strip()]
+
+
+def paragraph_hash(paragraph):
+    return hashlib.blake2b(paragraph.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# ----------------------------------------------------------
+# Process-wide LRU of paragraph hash -> TextStats
+# ----------------------------------------------------------
+_STATS_CACHE = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def paragraph_stats(paragraph, digest=None):
+    digest = digest or paragraph_hash(paragraph)
+    with _cache_lock:
+        st = _STATS_CACHE.get(digest)
+        if st is not None:
+            _STATS_CACHE.move_to_end(digest)
+            return st
+
+    st = scan(paragraph)    # outside the lock; a concurrent duplicate scan is harmless
+    with _cache_lock:
+        _STATS_CACHE[digest] = st
+        _STATS_CACHE.move_to_end(digest)
+        while len(_STATS_CACHE) > MAX_CACHED_PARAGRAPHS:
+            _STATS_CACHE.popitem(last=False)
+    return st
+
+
+# ----------------------------------------------------------
+# Aggregate view (duck-types TextStats for the signal formulas)
+# ----------------------------------------------------------
+class _DocumentAggregate:
+
+    def __init__(self):
+        for name in _ADDITIVE:
+            setattr(self, name, 0)
+        # document frequency per key; len() == number of distinct keys
+        self.terms = Counter()
+        self.tokens = Counter()
+        self.positive = Counter()
+        self.negative = Counter()
+        self._sentences = (0, 0)
+
+    def add(self, st, sign):
+        for name in _ADDITIVE:
+            setattr(self, name, getattr(self, name) + sign * getattr(st, name))
+        for name in ("terms", "tokens", "positive", "negative"):
+            df = getattr(self, name)
+            for key in getattr(st, name):
+                df[key] += sign
+                if df[key] <= 0:
+                    del df[key]
+
+    def copy(self):
+        other = _DocumentAggregate()
+        for name in _ADDITIVE:
+            setattr(other, name, getattr(self, name))
+        for name in ("terms", "tokens", "positive", "negative"):
+            setattr(other, name, getattr(self, name).copy())
+        other._sentences = self._sentences
+        return other
+
+    def sentence_lengths_total(self):
+        return self._sentences
+
+
+def sentence_shares(stats):
+    """
+    Per-paragraph (n_sentences, words) of the paragraphs joined by
+    whitespace: a sentence spanning paragraphs (e.g. a heading with no
+    full stop run into the next line) is credited to the paragraph
+    that closes it. The shares sum to the legacy whole-text totals.
+    """
+    shares = [[0, 0] for _ in stats]
+    open_words = 0
+    last = None
+    for i, st in enumerate(stats):
+        if not st.has_break:
+            open_words += st.lead_words
+            if st.lead_words:
+                last = i
+            continue
+        head = open_words + st.lead_words
+        if head:
+            shares[i][0] += 1
+            shares[i][1] += head
+        shares[i][0] += st.sent_count
+        shares[i][1] += st.sent_words
+        open_words = st.trail_words
+        last = i
+    if open_words:
+        shares[last][0] += 1
+        shares[last][1] += open_words
+    return [tuple(x) for x in shares]
+
+
+def _join_sentences(stats):
+    """Exact legacy sentence totals for paragraphs joined by whitespace."""
+    shares = sentence_shares(stats)
+    return sum(n for n, _ in shares), sum(w for _, w in shares)
+
+
+def _finish(agg, stats):
+    # blank-line separators and cross-paragraph sentences depend on order
+    agg.chars = sum(st.chars for st in stats) + 2 * max(0, len(stats) - 1)
+    agg._sentences = _join_sentences(stats)
+    return agg
+
+
+def aggregate_stats(stats):
+    """Whole-text stats view of paragraphs joined by blank lines."""
+    agg = _DocumentAggregate()
+    for st in stats:
+        agg.add(st, +1)
+    return _finish(agg, stats)
+
+
+def rebase_aggregate(base, old_hashes, old_stats, hashes, stats):
+    """
+    aggregate_stats(stats) derived from `base` = aggregate_stats(old_stats):
+    removed paragraphs are subtracted and added ones added, so an edit
+    costs the changed paragraphs, not the document. `base` is not modified.
+    """
+    agg = base.copy()
+    old, new = Counter(old_hashes), Counter(hashes)
+    by_hash = dict(zip(old_hashes, old_stats))
+
+    for digest, n in (old - new).items():
+        for _ in range(n):
+            agg.add(by_hash[digest], -1)
+
+    added = new - old
+    for digest, st in zip(hashes, stats):
+        if added.get(digest):
+            agg.add(st, +1)
+            added[digest] -= 1
+    return _finish(agg, stats)
@@ -0,0 +1,124 @@
+# ==========================================================
+#  RippleWriter Studio — RippleScore Engine
+#  Signal extraction + equation scoring (batch / vectorized)
+#  Ported from core_app so panels can import it without
+#  pulling in the legacy Streamlit script.
+# ==========================================================
+
+import numpy as np
+
+from app.utils.yaml_tools import load_model
+from app.refactor_regions.studio_engine.signal_engine import (
+    DEFAULT_ENGINE,
+    SIGNAL_KEYS,
+    extract_sections,
+)
+from app.refactor_regions.studio_engine.document_model import get_document
+
+
+# ----------------------------------------------------------
+# Equation table (yaml/models/equations.yaml)
+# ----------------------------------------------------------
+def normalize_equations(raw):
+    """
+    Return equations as a list of {id, name, desc, weights} dicts.
+    Accepts the list form used by equations.yaml as well as the
+    {NAME: {weights: {...}}} mapping form.
+    """
+    if isinstance(raw, dict) and "equations" in raw:
+        raw = raw["equations"]
+
+    out = []
+    if isinstance(raw, list):
+        for i, item in enumerate(raw):
+            if not isinstance(item, dict):
+                continue
+            eq_id = str(item.get("id") or item.get("name") or f"eq_{i + 1}")
+            out.append({
+                "id": eq_id,
+                "name": item.get("name", eq_id),
+                "desc": item.get("desc", ""),
+                "weights": item.get("weights") or {},
+            })
+    elif isinstance(raw, dict):
+        for eq_id, item in raw.items():
+            if isinstance(item, dict):
+                out.append({
+                    "id": str(eq_id),
+                    "name": item.get("name", str(eq_id)),
+                    "desc": item.get("desc", ""),
+                    "weights": item.get("weights") or {},
+                })
+    return out
+
+
+def load_equations(name="equations.yaml"):
+    raw = load_model(name)
+    if isinstance(raw, dict) and "error" in raw:
+        return []
+    return normalize_equations(raw)
+
+
+def weight_matrix(equations):
+    """
+    Stack equation weights into an (E, S) matrix aligned with SIGNAL_KEYS.
+    Rows are divided by sum(|w|) over *all* of an equation's weights, as
+    apply_equation does (a key with no signal scores 0 but still counts),
+    so a single matmul reproduces it.
+    """
+    column = {key: j for j, key in enumerate(SIGNAL_KEYS)}
+    W = np.zeros((len(equations), len(SIGNAL_KEYS)), dtype=np.float64)
+    den = np.zeros((len(equations), 1), dtype=np.float64)
+    for i, eq in enumerate(equations):
+        for key, w in (eq.get("weights") or {}).items():
+            den[i] += abs(float(w))
+            if key in column:
+                W[i, column[key]] = float(w)
+    return np.divide(W, den, out=np.zeros_like(W), where=den > 0)
+
+
+# ----------------------------------------------------------
+# Signals (delegates to the single-pass signal engine)
+# ----------------------------------------------------------
+def extract_signals(article):
+    """Same values as core_app.extract_signals (content parsed via the shared document model)."""
+    sec = extract_sections(article)
+    return DEFAULT_ENGINE.article_signals_from_stats(get_document(sec["content"]).stats, sec["outline"])
+
+
+def apply_equation(signals, weights):
+    """Weighted sum over shared keys, clamped to [0, 1]."""
+    num = 0.0
+    den = 0.0
+    for k, w in weights.items():
+        num += w * float(signals.get(k, 0.0))
+        den += abs(w)
+    if den == 0:
+        return 0.0
+    return max(0.0, min(1.0, num / den))
+
+
+# ----------------------------------------------------------
+# Batch scoring
+# ----------------------------------------------------------
+def signal_matrix(articles):
+    """(N, S) matrix of signals for N article dicts, columns = SIGNAL_KEYS."""
+    return DEFAULT_ENGINE.article_matrix(articles)
+
+
+def score_matrix(S, W):
+    """(N, E) RippleScores for every item x equation in one matmul."""
+    if S.size == 0 or W.size == 0:
+        return np.zeros((S.shape[0], W.shape[0]), dtype=np.float64)
+    return np.clip(S @ W.T, 0.0, 1.0)
+
+
+def score_articles(articles, equations=None):
+    """
+    Score every article against every equation.
+    Returns (equation_ids, signals (N, S), scores (N, E)).
+    """
+    equations = load_equations() if equations is None else equations
+    S = signal_matrix(articles)
+    scores = score_matrix(S, weight_matrix(equations))
+    return [eq["id"] for eq in equations], S, scores
@@ -0,0 +1,418 @@
+# ==========================================================
+#  RippleWriter Studio — Corpus Score Store
+#  Signals and equation scores for every saved revision of
+#  every draft and post, kept in SQLite (one row per revision)
+#  and mirrored into in-memory NumPy columns:
+#
+#    saved_at (N,)   draft / author / format codes (N,)
+#    signals  (N, S) scores (N, E), NaN where not recorded
+#    tags     (T,)   pairs (row, tag code)
+#
+#  A refresh only reads rows with id > last seen id, so a save
+#  costs one INSERT and the next aggregation appends one row.
+#  Tag and score reads are bounded by the newest revision read,
+#  so rows committed mid-refresh wait for the next one.
+#  Trends and summaries are single bincounts over the columns.
+# ==========================================================
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+from app.refactor_regions.studio_engine.evidence_index import draft_text, html_to_text
+from app.refactor_regions.studio_engine.signal_engine import DEFAULT_ENGINE, SIGNAL_KEYS
+from app.refactor_regions.studio_engine.ripple_score import load_equations, score_matrix, weight_matrix
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+STORE_PATH = PROJECT_ROOT / "app" / "refactor_regions" / "studio_state" / "score_store.sqlite3"
+ARTICLES_DIR = PROJECT_ROOT / "articles"
+POSTS_DIR = PROJECT_ROOT / "output" / "posts"
+POST_SUFFIXES = {".md", ".txt", ".html", ".htm"}
+
+GROUPINGS = ("author", "format", "tag", "draft")
+BUCKETS = ("day", "week", "month")
+UNKNOWN = "(none)"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS revisions (
+    id INTEGER PRIMARY KEY, draft TEXT, revision INTEGER, saved_at REAL,
+    author TEXT, format TEXT, content_hash TEXT, words INTEGER,
+    coherence REAL, evidence REAL, novelty REAL, clarity REAL, sentiment REAL
+);
+CREATE INDEX IF NOT EXISTS revisions_draft ON revisions (draft, revision);
+CREATE TABLE IF NOT EXISTS revision_tags (revision_id INTEGER, tag TEXT);
+CREATE TABLE IF NOT EXISTS revision_scores (revision_id INTEGER, equation TEXT, score REAL);
+"""
+
+
+def parse_tags(tags):
+    """Tags from a list or a comma / semicolon separated string."""
+    if isinstance(tags, str):
+        tags = tags.replace(";", ",").split(",")
+    return sorted({str(t).strip().lower() for t in tags or [] if str(t).strip()})
+
+
+def _content_hash(text, author, fmt, tags):
+    h = hashlib.blake2b(digest_size=16)
+    for part in (text, author, fmt, ",".join(tags)):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class _Codes:
+    """Label <-> small-int code table for one categorical column."""
+
+    def __init__(self):
+        self.index = {}
+        self.labels = []
+
+    def code(self, label):
+        code = self.index.get(label)
+        if code is None:
+            code = self.index[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+
+# ----------------------------------------------------------
+# Store
+# ----------------------------------------------------------
+class ScoreStore:
+    """
+    record() appends a revision when a draft's content or metadata
+    changed; trend() / summary() aggregate the columnar view.
+    Thread-safe (one SQLite connection per thread).
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = Path(path)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._view_lock = threading.Lock()
+        self._reset_view()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    # ------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------
+    def record(self, draft, text, author="", fmt="", tags=None, signals=None, saved_at=None, equations=None,
+               words=None):
+        """
+        Store one revision of `draft`. Returns the new revision id, or
+        None when nothing changed since the draft's latest revision.
+        `signals` and `words` may be passed in when the caller already
+        has them (or `text` is not the prose, e.g. a dumped YAML draft).
+        """
+        author = (author or "").strip() or UNKNOWN
+        fmt = (fmt or "").strip() or UNKNOWN
+        tags = parse_tags(tags)
+        digest = _content_hash(text, author, fmt, tags)
+
+        with self._write_lock:
+            conn = self._conn()
+            last = conn.execute(
+                "SELECT content_hash, revision FROM revisions WHERE draft = ? ORDER BY revision DESC LIMIT 1",
+                (draft,),
+            ).fetchone()
+            if last and last[0] == digest:
+                return None
+
+            signals = signals or DEFAULT_ENGINE.draft_signals(text)
+            equations = load_equations() if equations is None else equations
+            S = np.array([[float(signals.get(k, 0.0)) for k in SIGNAL_KEYS]])
+            scores = score_matrix(S, weight_matrix(equations))[0]
+
+            with conn:
+                rev_id = conn.execute(
+                    "INSERT INTO revisions (draft, revision, saved_at, author, format, content_hash, words, "
+                    f"{', '.join(SIGNAL_KEYS)}) VALUES (?, ?, ?, ?, ?, ?, ?, {', '.join('?' * len(SIGNAL_KEYS))})",
+                    (draft, (last[1] + 1) if last else 1, saved_at or time.time(), author, fmt, digest,
+                     len(text.split()) if words is None else int(words), *S[0].tolist()),
+                ).lastrowid
+                conn.executemany("INSERT INTO revision_tags VALUES (?, ?)", [(rev_id, t) for t in tags])
+                conn.executemany(
+                    "INSERT INTO revision_scores VALUES (?, ?, ?)",
+                    [(rev_id, eq["id"], float(s)) for eq, s in zip(equations, scores)],
+                )
+            return rev_id
+
+    def sync_corpus(self, articles_dir=ARTICLES_DIR, posts_dir=POSTS_DIR):
+        """
+        Record the current state of articles/*.yaml and output/posts/.
+        Unchanged files are skipped by the content hash. Returns the
+        number of new revisions.
+        """
+        equations = load_equations()
+        added = 0
+
+        # signal rows are cached by (path, mtime, size): only edited files are rescored
+        paths, signal_rows = DEFAULT_ENGINE.corpus_matrix(articles_dir)
+        for path, row in zip(paths, signal_rows):
+            try:
+                data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+            except Exception:
+                continue
+            if not isinstance(data, dict):
+                continue
+            signals = dict(zip(SIGNAL_KEYS, row.tolist()))
+            text = yaml.safe_dump(data, sort_keys=True, allow_unicode=True)
+            meta = data.get("meta") if isinstance(data.get("meta"), dict) else {}
+            added += self.record(
+                f"articles/{path.name}", text,
+                author=str(data.get("author") or meta.get("author") or ""),
+                fmt=str(data.get("format") or meta.get("format") or ""),
+                tags=data.get("tags") or meta.get("tags"),
+                signals=signals, saved_at=path.stat().st_mtime, equations=equations,
+                words=len(draft_text(data).split()),
+            ) is not None
+
+        posts_dir = Path(posts_dir)
+        if posts_dir.is_dir():
+            for path in sorted(posts_dir.rglob("*")):
+                if path.suffix.lower() not in POST_SUFFIXES or not path.is_file():
+                    continue
+                raw = path.read_text(encoding="utf-8", errors="ignore")
+                text = html_to_text(raw) if path.suffix.lower() in (".html", ".htm") else raw
+                added += self.record(
+                    f"posts/{path.relative_to(posts_dir)}", text, fmt="post",
+                    saved_at=path.stat().st_mtime, equations=equations,
+                ) is not None
+        return added
+
+    # ------------------------------------------------------
+    # Columnar view
+    # ------------------------------------------------------
+    def _reset_view(self):
+        self._last_id = 0
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._saved_at = np.zeros(0, dtype=np.float64)
+        self._revision = np.zeros(0, dtype=np.int64)
+        self._signals = np.zeros((0, len(SIGNAL_KEYS)), dtype=np.float64)
+        self._scores = np.zeros((0, 0), dtype=np.float64)
+        self._cols = {"draft": np.zeros(0, dtype=np.int64), "author": np.zeros(0, dtype=np.int64),
+                      "format": np.zeros(0, dtype=np.int64)}
+        self._tag_rows = np.zeros(0, dtype=np.int64)
+        self._tag_codes = np.zeros(0, dtype=np.int64)
+        self._codes = {name: _Codes() for name in ("draft", "author", "format", "tag", "equation")}
+
+    def refresh(self):
+        """Append revisions stored since the last refresh. Returns the row count."""
+        with self._view_lock:
+            conn = self._conn()
+            rows = conn.execute(
+                f"SELECT id, revision, saved_at, draft, author, format, {', '.join(SIGNAL_KEYS)} "
+                "FROM revisions WHERE id > ? ORDER BY id",
+                (self._last_id,),
+            ).fetchall()
+            if not rows:
+                return len(self._ids)
+
+            start = len(self._ids)
+            ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+            last = int(ids[-1])     # tags/scores commit with their revision
+            self._ids = np.concatenate((self._ids, ids))
+            self._revision = np.concatenate((self._revision, np.fromiter((r[1] for r in rows), np.int64, len(rows))))
+            self._saved_at = np.concatenate((self._saved_at, np.fromiter((r[2] for r in rows), np.float64, len(rows))))
+            for j, name in enumerate(("draft", "author", "format"), start=3):
+                codes = self._codes[name]
+                new = np.fromiter((codes.code(r[j]) for r in rows), np.int64, len(rows))
+                self._cols[name] = np.concatenate((self._cols[name], new))
+            self._signals = np.vstack((self._signals, np.array([r[6:] for r in rows], dtype=np.float64)))
+
+            tags = conn.execute(
+                "SELECT revision_id, tag FROM revision_tags WHERE revision_id > ? AND revision_id <= ?",
+                (self._last_id, last),
+            ).fetchall()
+            if tags:
+                rid = np.fromiter((t[0] for t in tags), np.int64, len(tags))
+                codes = self._codes["tag"]
+                self._tag_rows = np.concatenate((self._tag_rows, np.searchsorted(self._ids, rid)))
+                self._tag_codes = np.concatenate(
+                    (self._tag_codes, np.fromiter((codes.code(t[1]) for t in tags), np.int64, len(tags)))
+                )
+
+            scores = conn.execute(
+                "SELECT revision_id, equation, score FROM revision_scores WHERE revision_id > ? AND revision_id <= ?",
+                (self._last_id, last),
+            ).fetchall()
+            eq_codes = self._codes["equation"]
+            eq = np.fromiter((eq_codes.code(s[1]) for s in scores), np.int64, len(scores))
+            grown = np.full((len(self._ids), len(eq_codes.labels)), np.nan)
+            grown[:start, :self._scores.shape[1]] = self._scores
+            if scores:
+                rid = np.fromiter((s[0] for s in scores), np.int64, len(scores))
+                grown[np.searchsorted(self._ids, rid), eq] = np.fromiter((s[2] for s in scores), np.float64, len(scores))
+            self._scores = grown
+
+            self._last_id = last
+            return len(self._ids)
+
+    def metrics(self):
+        """Metric names usable in trend()/summary(): signals, then equation ids."""
+        self.refresh()
+        return list(SIGNAL_KEYS) + list(self._codes["equation"].labels)
+
+    def _metric(self, metric):
+        if metric in SIGNAL_KEYS:
+            return self._signals[:, SIGNAL_KEYS.index(metric)]
+        code = self._codes["equation"].index.get(metric)
+        if code is None:
+            raise KeyError(f"Unknown metric: {metric}")
+        return self._scores[:, code]
+
+    def _groups(self, by, rows):
+        """(row indices, group codes, labels) for a grouping, tags expanded."""
+        if by not in GROUPINGS:
+            raise KeyError(f"Unknown grouping: {by}")
+        if by == "tag":
+            keep = np.isin(self._tag_rows, rows)
+            return self._tag_rows[keep], self._tag_codes[keep], self._codes["tag"].labels
+        return rows, self._cols[by][rows], self._codes[by].labels
+
+    def _latest_rows(self):
+        """Row index of each draft's newest revision."""
+        drafts = self._cols["draft"]
+        order = np.lexsort((self._revision, drafts))
+        last = np.r_[drafts[order][1:] != drafts[order][:-1], True]
+        return np.sort(order[last])
+
+    # ------------------------------------------------------
+    # Aggregation
+    # ------------------------------------------------------
+    def trend(self, metric, by="author", bucket="week", since=None):
+        """
+        Mean `metric` per group per time bucket over all revisions.
+        Returns {buckets: [ISO dates], series: {group: [mean or None]},
+        counts: {group: revisions}}.
+        """
+        self.refresh()
+        with self._view_lock:
+            rows = np.arange(len(self._ids))
+            if since is not None:
+                rows = rows[self._saved_at >= since]
+            rows, groups, labels = self._groups(by, rows)
+            values = self._metric(metric)[rows]
+            ok = ~np.isnan(values)
+            rows, groups, values = rows[ok], groups[ok], values[ok]
+            if not len(rows):
+                return {"buckets": [], "series": {}, "counts": {}}
+
+            keys, to_label = _bucket_keys(self._saved_at[rows], bucket)
+            uniq, b = np.unique(keys, return_inverse=True)
+            cell = groups * len(uniq) + b
+            size = len(labels) * len(uniq)
+            n = np.bincount(cell, minlength=size).reshape(len(labels), len(uniq))
+            total = np.bincount(cell, weights=values, minlength=size).reshape(len(labels), len(uniq))
+
+        means = np.round(np.divide(total, n, out=np.zeros(total.shape), where=n > 0), 4).astype(object)
+        means[n == 0] = None
+        present = np.flatnonzero(n.sum(axis=1))
+        series = means[present].tolist()
+        return {
+            "buckets": [to_label(k) for k in uniq],
+            "series": {labels[g]: row for g, row in zip(present, series)},
+            "counts": {labels[g]: int(n[g].sum()) for g in present},
+        }
+
+    def summary(self, metric, by="author", latest_only=True):
+        """
+        Per group: drafts, revisions, mean / min / max `metric`.
+        latest_only uses each draft's newest revision (current state);
+        otherwise every revision counts. Sorted by mean, best first.
+        """
+        self.refresh()
+        with self._view_lock:
+            rows = self._latest_rows() if latest_only else np.arange(len(self._ids))
+            rows, groups, labels = self._groups(by, rows)
+            values = self._metric(metric)[rows]
+            ok = ~np.isnan(values)
+            rows, groups, values = rows[ok], groups[ok], values[ok]
+            if not len(rows):
+                return []
+
+            size = len(labels)
+            n = np.bincount(groups, minlength=size)
+            mean = np.bincount(groups, weights=values, minlength=size) / np.maximum(n, 1)
+            lo = np.full(size, np.inf)
+            hi = np.full(size, -np.inf)
+            np.minimum.at(lo, groups, values)
+            np.maximum.at(hi, groups, values)
+            drafts = self._cols["draft"][rows]
+            pairs = np.unique(groups * len(self._codes["draft"].labels) + drafts)
+            n_drafts = np.bincount(pairs // len(self._codes["draft"].labels), minlength=size)
+
+        out = [
+            {by: labels[g], "drafts": int(n_drafts[g]), "revisions": int(n[g]),
+             "mean": round(float(mean[g]), 4), "min": round(float(lo[g]), 4), "max": round(float(hi[g]), 4)}
+            for g in np.flatnonzero(n)
+        ]
+        return sorted(out, key=lambda r: r["mean"], reverse=True)
+
+    def history(self, draft, metric):
+        """[(revision, saved_at, value)] for one draft, oldest first."""
+        self.refresh()
+        with self._view_lock:
+            code = self._codes["draft"].index.get(draft)
+            if code is None:
+                return []
+            rows = np.flatnonzero(self._cols["draft"] == code)
+            rows = rows[np.argsort(self._revision[rows])]
+            values = self._metric(metric)[rows]
+            return [(int(self._revision[r]), float(self._saved_at[r]), float(v)) for r, v in zip(rows, values)]
+
+    def latest_signals(self):
+        """(draft ids, (N, S) signals) of each draft's newest revision."""
+        self.refresh()
+        with self._view_lock:
+            rows = self._latest_rows()
+            labels = self._codes["draft"].labels
+            return [labels[c] for c in self._cols["draft"][rows]], self._signals[rows].copy()
+
+    def counts(self):
+        """(revisions, drafts) currently stored."""
+        self.refresh()
+        return len(self._ids), len(self._codes["draft"].labels)
+
+
+def _bucket_keys(saved_at, bucket):
+    """Integer bucket keys for epoch seconds, plus key -> ISO label."""
+    days = np.floor(saved_at / 86400.0).astype(np.int64)
+    if bucket == "day":
+        return days, lambda k: str(np.datetime64(int(k), "D"))
+    if bucket == "week":
+        # 1970-01-01 was a Thursday; weeks start on Monday
+        return days - (days + 3) % 7, lambda k: str(np.datetime64(int(k), "D"))
+    if bucket == "month":
+        months = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        return months, lambda k: str(np.datetime64(int(k), "M"))
+    raise KeyError(f"Unknown bucket: {bucket}")
+
+
+# ----------------------------------------------------------
+# Shared instance
+# ----------------------------------------------------------
+_STORE = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_score_store():
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = ScoreStore()
+        return _STORE
@@ -0,0 +1,126 @@
+# ==========================================================
+#  RippleWriter Studio — RippleScore Uncertainty (Bootstrap)
+#  Resamples a draft's paragraphs with replacement and
+#  re-derives the five signals for every replicate at once:
+#
+#    idx  (R, P)  random paragraph indices
+#    M    (R, P)  multiplicities   — one bincount over idx
+#    M @ F        replicate totals of the additive features
+#
+#  Distinct-term novelty is not additive. Terms found in one
+#  paragraph only are counted exactly (present @ unique_p);
+#  a term shared by d paragraphs is counted with probability
+#  1 - (1 - f)^d, f = share of paragraphs present in the
+#  replicate — exact when every paragraph is present.
+# ==========================================================
+
+from collections import Counter
+
+import numpy as np
+
+from app.refactor_regions.studio_engine.paragraph_cache import sentence_shares
+from app.refactor_regions.studio_engine.signal_engine import NEGATIVE_CUES, POSITIVE_CUES, SIGNAL_KEYS
+from app.refactor_regions.studio_engine.ripple_score import load_equations, score_matrix, weight_matrix
+
+N_REPLICATES = 2000
+CONFIDENCE = 0.95
+
+# Feature columns of the per-paragraph matrix
+_WORDS, _CITES, _SENTS, _SENT_WORDS, _DISTINCT = range(5)
+_POS = slice(5, 5 + len(POSITIVE_CUES))
+_NEG = slice(_POS.stop, _POS.stop + len(NEGATIVE_CUES))
+
+
+def paragraph_feature_matrix(stats):
+    """
+    (P, F) additive features per paragraph TextStats, plus a histogram
+    {d: number of terms shared by exactly d paragraphs} for d >= 2.
+    Column _DISTINCT holds the terms unique to each paragraph. Sentence
+    columns use the point score's joining rule (sentence_shares), so
+    drawing every paragraph once reproduces the point signals.
+    """
+    df = Counter()
+    for st in stats:
+        df.update(st.terms)
+
+    F = np.zeros((len(stats), _NEG.stop), dtype=np.float64)
+    for i, (st, (n, total)) in enumerate(zip(stats, sentence_shares(stats))):
+        unique = sum(1 for t in st.terms if df[t] == 1)
+        F[i, :5] = (st.words, st.citation_hits, n, total, unique)
+        F[i, _POS] = [w in st.positive for w in POSITIVE_CUES]
+        F[i, _NEG] = [w in st.negative for w in NEGATIVE_CUES]
+
+    shared = Counter(d for d in df.values() if d > 1)
+    return F, shared
+
+
+def resample_multiplicities(n_paragraphs, n_replicates=N_REPLICATES, seed=0):
+    """(R, P) counts of how often each paragraph is drawn per replicate."""
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, n_paragraphs, size=(n_replicates, n_paragraphs))
+    flat = idx + (np.arange(n_replicates) * n_paragraphs)[:, None]
+    return np.bincount(flat.ravel(), minlength=n_replicates * n_paragraphs).reshape(n_replicates, n_paragraphs)
+
+
+def replicate_signal_matrix(stats, n_replicates=N_REPLICATES, seed=0):
+    """(R, 5) draft signals (SIGNAL_KEYS order) for R bootstrap replicates."""
+    if not stats:
+        return np.zeros((0, len(SIGNAL_KEYS)))
+    return signals_for_multiplicities(stats, resample_multiplicities(len(stats), n_replicates, seed))
+
+
+def signals_for_multiplicities(stats, M):
+    """(R, 5) draft signals for an (R, P) paragraph multiplicity matrix."""
+    F, shared = paragraph_feature_matrix(stats)
+    M = np.asarray(M, dtype=np.float64)
+    n_replicates = M.shape[0]
+    T = M @ F
+    present = (M > 0).astype(np.float64)
+
+    distinct = present @ F[:, _DISTINCT]
+    if shared:
+        d = np.fromiter(shared.keys(), dtype=np.float64)
+        counts = np.fromiter(shared.values(), dtype=np.float64)
+        f = present.mean(axis=1, keepdims=True)
+        distinct += (1.0 - (1.0 - f) ** d) @ counts
+
+    S = np.empty((n_replicates, len(SIGNAL_KEYS)))
+    S[:, 0] = np.minimum(1.0, T[:, _WORDS] / 800.0)
+    S[:, 1] = np.minimum(1.0, T[:, _CITES] / 6.0)
+    S[:, 2] = np.minimum(1.0, distinct / 800.0)
+
+    # clarity: legacy sentence-length band, 0.5 without sentences
+    n = T[:, _SENTS]
+    avg = np.divide(T[:, _SENT_WORDS], n, out=np.zeros_like(n), where=n > 0)
+    clarity = np.where((avg >= 12) & (avg <= 22), 1.0, np.maximum(0.0, 1.0 - np.abs(avg - 17) / 25.0))
+    S[:, 3] = np.where(n > 0, clarity, 0.5)
+
+    # sentiment: distinct cue words present in the replicate
+    pos = (present @ F[:, _POS] > 0).sum(axis=1)
+    neg = (present @ F[:, _NEG] > 0).sum(axis=1)
+    total = pos + neg
+    balance = np.divide(pos - neg, total, out=np.zeros(n_replicates), where=total > 0)
+    S[:, 4] = np.where(total > 0, np.clip(balance * 0.5 + 0.5, 0.0, 1.0), 0.6)
+    return S
+
+
+def intervals(replicate_scores, names, confidence=CONFIDENCE):
+    """{name: (low, high)} percentile intervals from an (R, Q) score matrix."""
+    if not len(replicate_scores):
+        return {}
+    tail = (1.0 - confidence) / 2.0 * 100.0
+    lo, hi = np.percentile(replicate_scores, [tail, 100.0 - tail], axis=0)
+    return {name: (float(a), float(b)) for name, a, b in zip(names, lo, hi)}
+
+
+def bootstrap_equation_intervals(stats, equations=None, n_replicates=N_REPLICATES, confidence=CONFIDENCE, seed=0):
+    """RippleScore intervals for every equations.yaml entry."""
+    equations = load_equations() if equations is None else equations
+    S = replicate_signal_matrix(stats, n_replicates, seed)
+    return intervals(score_matrix(S, weight_matrix(equations)), [eq["id"] for eq in equations], confidence)
+
+
+def bootstrap_bank_intervals(stats, bank, n_replicates=N_REPLICATES, confidence=CONFIDENCE, seed=0):
+    """Intention-equation intervals for an EquationBank."""
+    S = replicate_signal_matrix(stats, n_replicates, seed)
+    return intervals(bank.evaluate(S) if len(S) else S, bank.names, confidence)
@@ -0,0 +1,144 @@
+# ==========================================================
+#  RippleWriter Studio — Section Regeneration
+#  Rewrites ONE named section of an article with one short
+#  completion instead of regenerating the whole piece:
+#
+#    "lede" / "body" / "counterpoints" / "conclusion"
+#                        -> y["generated_sections"][name]
+#    int i               -> y["sections"][i]["content"]
+#
+#  Sections are cached under (article key, section id); the
+#  article key hashes the brief (title, thesis, audience, tone,
+#  outline, claims), so editing the brief starts a fresh set.
+#  The neighbours of the section are sent as context: their
+#  text in the article dict (which may be hand-edited), or the
+#  cached text when the dict has none.
+# ==========================================================
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from llm_client import POST_SECTIONS, LLMClient, post_brief
+
+MAX_CACHED_SECTIONS = 512
+
+_LOCK = threading.Lock()
+_SECTIONS = OrderedDict()   # (article key, section id) -> text
+
+
+def article_key(y):
+    return hashlib.blake2b(post_brief(y).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def section_id(name):
+    return f"sections[{name}]" if isinstance(name, int) else str(name).lower()
+
+
+def section_key(y, name):
+    return article_key(y), section_id(name)
+
+
+# ----------------------------------------------------------
+# Section cache
+# ----------------------------------------------------------
+def _store(key, text):
+    with _LOCK:
+        _SECTIONS[key] = text
+        _SECTIONS.move_to_end(key)
+        while len(_SECTIONS) > MAX_CACHED_SECTIONS:
+            _SECTIONS.popitem(last=False)
+
+
+def cached_section(y, name):
+    with _LOCK:
+        return _SECTIONS.get(section_key(y, name))
+
+
+def remember_sections(y, sections=None):
+    """Seed the cache from a full generation (or from y itself)."""
+    for name, text in (sections or y.get("generated_sections") or {}).items():
+        _store(section_key(y, name), text or "")
+    for i, sec in enumerate(y.get("sections") or []):
+        if isinstance(sec, dict):
+            _store(section_key(y, i), sec.get("content") or "")
+
+
+def _yaml_sections(y):
+    return [s for s in (y.get("sections") or []) if isinstance(s, dict)]
+
+
+def _label(y, name):
+    if isinstance(name, int):
+        return str(_yaml_sections(y)[name].get("heading") or f"Section {name + 1}")
+    return str(name)
+
+
+def _current(y, name):
+    if isinstance(name, int):
+        text = _yaml_sections(y)[name].get("content")
+    else:
+        text = (y.get("generated_sections") or {}).get(name)
+    if text:
+        return text
+    return cached_section(y, name) or ""
+
+
+def _order(y, name):
+    if isinstance(name, int):
+        return list(range(len(_yaml_sections(y))))
+    return list(POST_SECTIONS)
+
+
+def neighbour_context(y, name):
+    """{label: text} for the sections either side of `name` plus its current text."""
+    order = _order(y, name)
+    i = order.index(name)
+    context = {}
+    if i > 0:
+        context[f"previous: {_label(y, order[i - 1])}"] = _current(y, order[i - 1])
+    context[f"current draft of {_label(y, name)}"] = _current(y, name)
+    if i + 1 < len(order):
+        context[f"next: {_label(y, order[i + 1])}"] = _current(y, order[i + 1])
+    return context
+
+
+# ----------------------------------------------------------
+# Entry point
+# ----------------------------------------------------------
+def regenerate_section(y, name, llm=None, instruction=""):
+    """
+    Regenerate only section `name` of article dict `y`. The new text
+    is cached under section_key(y, name), written back into `y`, and
+    returned.
+    """
+    if isinstance(name, str) and name.lower() not in POST_SECTIONS:
+        raise ValueError(f"Unknown section {name!r}; expected one of {POST_SECTIONS} or a sections[] index")
+    if isinstance(name, str):
+        name = name.lower()
+    elif not 0 <= name < len(_yaml_sections(y)):
+        raise IndexError(f"sections[{name}] out of range")
+
+    llm = llm or LLMClient()
+    text = llm.write_section(y, _label(y, name), neighbour_context(y, name), instruction)
+
+    _store(section_key(y, name), text)
+    if isinstance(name, int):
+        _yaml_sections(y)[name]["content"] = text
+    else:
+        y.setdefault("generated_sections", {})[name] = text
+    return text
+
+
+def regenerate_article_section(data, name, brief, llm=None, instruction=""):
+    """
+    Regenerate section `name` of the saved article `data`, sending
+    `brief` (the article dict built for the LLM) with data's current
+    sections, which also seed the cache. Only that section changes;
+    returns the generated_sections to save.
+    """
+    brief["generated_sections"] = dict(data.get("generated_sections") or {})
+    brief["sections"] = data.get("sections") or []
+    remember_sections(brief)
+    regenerate_section(brief, name, llm, instruction)
+    return brief["generated_sections"]
@@ -0,0 +1,253 @@
+# ==========================================================
+#  RippleWriter Studio — Signal Engine
+#  One tokenization pass per text -> TextStats, from which
+#  every RippleScore signal is derived.
+#
+#  Profiles:
+#    article  — core_app.extract_signals (article dicts)
+#    claims   — core_app._score_signal (claim text blobs)
+#    draft    — raw draft text (Write / Analyze tabs)
+#
+#  compat=True reproduces the legacy heuristics exactly,
+#  including the coherence quirk in _score_signal where
+#  t.count("") counts every character boundary.
+# ==========================================================
+
+import re
+from dataclasses import dataclass
+from operator import methodcaller
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+SIGNAL_KEYS = ("coherence", "evidence", "novelty", "clarity", "sentiment")
+
+CITATION_HINTS = ("http://", "https://", "[", "](", "doi:", "arxiv.org", "source", "citation", "references")
+REF_HINTS = ("http", "doi", "source:")
+POSITIVE_CUES = ("excellent", "good", "clear", "strong", "improve", "win")
+NEGATIVE_CUES = ("bad", "poor", "unclear", "weak", "worse", "lose")
+
+_TERM_RE = re.compile(r"[a-zA-Z]{4,}")
+_NON_ASCII_RE = re.compile(r"[^\x00-\x7f]")
+_SENT_BREAK_RE = re.compile(r"[.?!]")
+_strip_token = methodcaller("strip", ".,:;!?'\"()[]")
+
+
+# ----------------------------------------------------------
+# Per-text statistics (mergeable across paragraphs)
+# ----------------------------------------------------------
+@dataclass
+class TextStats:
+    words: int = 0
+    chars: int = 0
+    citation_hits: int = 0
+    ref_hits: int = 0
+    digits: int = 0
+    ellipses: int = 0
+    unicode_ellipses: int = 0
+    terms: frozenset = frozenset()
+    tokens: frozenset = frozenset()
+    positive: frozenset = frozenset()
+    negative: frozenset = frozenset()
+
+    # Sentence structure. A text is: lead fragment, closed sentences,
+    # trail fragment. Without any break the lead *is* the trail.
+    sent_count: int = 0
+    sent_words: int = 0
+    lead_words: int = 0
+    trail_words: int = 0
+    has_break: bool = False
+
+    def sentence_lengths_total(self):
+        """Return (n_sentences, total_words) as the legacy splitter sees them."""
+        if not self.has_break:
+            return (1, self.lead_words) if self.lead_words else (0, 0)
+        n, total = self.sent_count, self.sent_words
+        for frag in (self.lead_words, self.trail_words):
+            if frag:
+                n += 1
+                total += frag
+        return n, total
+
+
+def _count_digits(low):
+    n = sum(low.count(d) for d in "0123456789")
+    if not low.isascii():
+        n += sum(1 for ch in _NON_ASCII_RE.findall(low) if ch.isdigit())
+    return n
+
+
+def scan(text):
+    """Tokenize once and collect every statistic the signal profiles need."""
+    text = text or ""
+    low = text.lower()
+
+    st = TextStats(
+        chars=len(low),
+        citation_hits=sum(low.count(h) for h in CITATION_HINTS),
+        ref_hits=sum(low.count(h) for h in REF_HINTS),
+        digits=_count_digits(low),
+        ellipses=low.count("..."),
+        unicode_ellipses=low.count("…"),
+        terms=frozenset(map(str.lower, set(_TERM_RE.findall(text)))),
+        positive=frozenset(w for w in POSITIVE_CUES if w in low),
+        negative=frozenset(w for w in NEGATIVE_CUES if w in low),
+    )
+
+    toks = low.split()
+    st.words = len(toks)
+    st.tokens = frozenset(map(_strip_token, set(toks)))
+
+    # Sentence segments as the legacy splitter sees them: break on . ? !
+    # and count whitespace tokens per segment.
+    seg_words = list(map(len, map(str.split, _SENT_BREAK_RE.split(low))))
+    if len(seg_words) == 1:
+        st.lead_words = st.trail_words = seg_words[0]
+    else:
+        st.has_break = True
+        st.lead_words, st.trail_words = seg_words[0], seg_words[-1]
+        middle = [n for n in seg_words[1:-1] if n]
+        st.sent_count = len(middle)
+        st.sent_words = sum(middle)
+    return st
+
+
+# ----------------------------------------------------------
+# Signal formulas (pure functions of TextStats)
+# ----------------------------------------------------------
+def _clarity_from_sentences(st):
+    n, total = st.sentence_lengths_total()
+    if not n:
+        return 0.5
+    avg = total / n
+    if 12 <= avg <= 22:
+        return 1.0
+    return max(0.0, 1.0 - (abs(avg - 17) / 25.0))
+
+
+def _sentiment_from_cues(st):
+    pos, neg = len(st.positive), len(st.negative)
+    total = pos + neg
+    if total == 0:
+        return 0.6
+    return max(0.0, min(1.0, (pos - neg) / total * 0.5 + 0.5))
+
+
+def extract_sections(article):
+    """Return the thesis / outline / content text buckets to analyze."""
+    txt = []
+    gen = article.get("generated_sections", {}) or {}
+    for k in ("lede", "body", "counterpoints", "conclusion"):
+        v = gen.get(k, "")
+        if isinstance(v, list):
+            v = "\n".join(v)
+        txt.append(v or "")
+    return {
+        "thesis": article.get("thesis", "") or "",
+        "outline": "\n".join(article.get("outline", []) or []),
+        "content": "\n\n".join(txt).strip(),
+    }
+
+
+def _count_bullets(outline):
+    return sum(1 for line in outline.splitlines() if line.strip().startswith(("-", "*", "1.", "2.", "3.")))
+
+
+class SignalEngine:
+    """Derives RippleScore signals from TextStats for each profile."""
+
+    def __init__(self, compat=True):
+        self.compat = compat
+        self._corpus_cache = {}
+
+    # ------------------------------------------------------
+    # Profiles
+    # ------------------------------------------------------
+    def article_signals_from_stats(self, content, outline=""):
+        return {
+            "coherence": min(1.0, content.words / 800.0),
+            "evidence": min(1.0, content.citation_hits / 6.0),
+            "novelty": min(1.0, len(content.terms) / 800.0),
+            "clarity": min(1.0, _count_bullets(outline) / 8.0),
+            "sentiment": 0.7,
+        }
+
+    def claim_signals_from_stats(self, st):
+        if not st.chars:
+            return {k: 0.0 for k in SIGNAL_KEYS}
+
+        if self.compat:
+            # legacy: t.count("...") + t.count("") == ellipses + len(t) + 1
+            dots = st.ellipses + st.chars + 1
+        else:
+            dots = st.ellipses + st.unicode_ellipses
+
+        return {
+            "coherence": max(0.0, 1.0 - min(1.0, dots / 3.0)),
+            "evidence": min(1.0, (st.digits * 0.02) + (st.ref_hits * 0.25)),
+            "novelty": min(1.0, len(st.tokens) / max(8, st.words)),
+            "clarity": _clarity_from_sentences(st),
+            "sentiment": _sentiment_from_cues(st),
+        }
+
+    def draft_signals_from_stats(self, st):
+        return {
+            "coherence": min(1.0, st.words / 800.0),
+            "evidence": min(1.0, st.citation_hits / 6.0),
+            "novelty": min(1.0, len(st.terms) / 800.0),
+            "clarity": _clarity_from_sentences(st),
+            "sentiment": _sentiment_from_cues(st),
+        }
+
+    def article_signals(self, article):
+        sec = extract_sections(article)
+        return self.article_signals_from_stats(scan(sec["content"]), sec["outline"])
+
+    def claim_signals(self, text):
+        return self.claim_signals_from_stats(scan(text))
+
+    def draft_signals(self, text):
+        return self.draft_signals_from_stats(scan(text))
+
+    # ------------------------------------------------------
+    # Batch API — (N, S) matrices aligned with SIGNAL_KEYS
+    # ------------------------------------------------------
+    @staticmethod
+    def _to_matrix(rows):
+        M = np.zeros((len(rows), len(SIGNAL_KEYS)), dtype=np.float64)
+        for i, sig in enumerate(rows):
+            M[i] = [sig[k] for k in SIGNAL_KEYS]
+        return M
+
+    def article_matrix(self, articles):
+        return self._to_matrix([self.article_signals(a) for a in articles])
+
+    # ------------------------------------------------------
+    # Corpus scoring (articles/*.yaml) — rescans changed files only
+    # ------------------------------------------------------
+    def corpus_matrix(self, directory):
+        """
+        Return (paths, (N, S) signals) for every YAML draft in `directory`.
+        Rows are cached by (path, mtime, size) so a save only rescans one file.
+        """
+        paths = sorted(Path(directory).glob("*.yaml"))
+        fresh = {}
+        for p in paths:
+            stat = p.stat()
+            key = (str(p), stat.st_mtime_ns, stat.st_size)
+            sig = self._corpus_cache.get(key)
+            if sig is None:
+                try:
+                    article = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+                except Exception:
+                    article = {}
+                sig = self.article_signals(article if isinstance(article, dict) else {})
+            fresh[key] = sig
+
+        # Drop rows for files that were changed or removed since the last call
+        self._corpus_cache = fresh
+        return paths, self._to_matrix(list(fresh.values()))
+
+
+DEFAULT_ENGINE = SignalEngine(compat=True)
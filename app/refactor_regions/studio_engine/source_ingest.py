@@ -0,0 +1,215 @@
+# ==========================================================
+#  RippleWriter Studio — Source Ingestion (map-reduce)
+#  Long sources (transcripts, reports) are read in full
+#  instead of being cut at a character offset:
+#
+#    chunk    paragraphs packed to an estimated token budget
+#             (sentences / words split when one is too long)
+#    map      one short summary per chunk, concurrently,
+#             cached by chunk hash
+#    reduce   summaries merged in groups until one remains
+#
+#  The budget is fixed: chunk size grows with the source up
+#  to MAX_CHUNK_TOKENS so the map stays at MAX_CHUNKS calls;
+#  past that, chunks are sampled evenly across the source and
+#  the digest says so ("sampled") rather than dropping the tail.
+#  Tokens are estimated (~4 chars or ~0.75 words per token).
+# ==========================================================
+
+import hashlib
+import math
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from llm_client import LLMClient
+from app.refactor_regions.studio_engine.paragraph_cache import split_paragraphs
+
+CHUNK_TOKENS = 1500
+MAX_CHUNK_TOKENS = 6000
+MAX_CHUNKS = 24
+SUMMARY_WORDS = 120
+REDUCE_TOKENS = 3000        # summaries merged per reduce call
+DIGEST_WORDS = 250
+MAX_WORKERS = 8
+MAX_CACHED_SUMMARIES = 1024
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[]?[A-Z0-9])")
+
+
+def estimate_tokens(text):
+    text = text or ""
+    return max(len(text) // 4, math.ceil(len(text.split()) * 4 / 3))
+
+
+def chunk_hash(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# ----------------------------------------------------------
+# Chunking
+# ----------------------------------------------------------
+def _pieces(paragraph, budget):
+    """Split one paragraph into pieces under `budget` (sentences, then words)."""
+    if estimate_tokens(paragraph) <= budget:
+        return [paragraph]
+    pieces = []
+    for sentence in _SENTENCE_RE.split(paragraph):
+        if estimate_tokens(sentence) <= budget:
+            pieces.append(sentence)
+            continue
+        words = sentence.split()
+        step = max(1, budget * 3 // 4)
+        for i in range(0, len(words), step):
+            piece = " ".join(words[i:i + step])
+            width = budget * 4      # unbroken runs (URLs, tables): cut by characters
+            pieces.extend(piece[j:j + width] for j in range(0, len(piece), width))
+    return pieces
+
+
+def chunk_text(text, budget=CHUNK_TOKENS):
+    """Consecutive chunks of whole paragraphs, each about `budget` tokens or less."""
+    chunks, current, size = [], [], 0
+    for paragraph in split_paragraphs(text):
+        for piece in _pieces(paragraph.strip(), budget):
+            cost = estimate_tokens(piece)
+            if current and size + cost > budget:
+                chunks.append("\n\n".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += cost
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def plan_chunks(text):
+    """(chunks, sampled): at most MAX_CHUNKS chunks, evenly sampled when the source is too long."""
+    budget = min(MAX_CHUNK_TOKENS, max(CHUNK_TOKENS, math.ceil(estimate_tokens(text) / MAX_CHUNKS)))
+    chunks = chunk_text(text, budget)
+    while len(chunks) > MAX_CHUNKS and budget < MAX_CHUNK_TOKENS:   # packing slack
+        budget = min(MAX_CHUNK_TOKENS, budget * 5 // 4)
+        chunks = chunk_text(text, budget)
+    if len(chunks) <= MAX_CHUNKS:
+        return chunks, False
+    step = len(chunks) / MAX_CHUNKS
+    return [chunks[int(i * step)] for i in range(MAX_CHUNKS)], True
+
+
+# ----------------------------------------------------------
+# Summary cache (chunk hash -> summary)
+# ----------------------------------------------------------
+_LOCK = threading.Lock()
+_SUMMARIES = OrderedDict()
+
+
+def _cached(key):
+    with _LOCK:
+        hit = _SUMMARIES.get(key)
+        if hit is not None:
+            _SUMMARIES.move_to_end(key)
+        return hit
+
+
+def _store(key, summary):
+    with _LOCK:
+        _SUMMARIES[key] = summary
+        while len(_SUMMARIES) > MAX_CACHED_SUMMARIES:
+            _SUMMARIES.popitem(last=False)
+
+
+def clear_summary_cache():
+    with _LOCK:
+        _SUMMARIES.clear()
+
+
+# ----------------------------------------------------------
+# Map / reduce
+# ----------------------------------------------------------
+def _summarize(llm, text, words, role):
+    key = chunk_hash(f"{role}:{words}:{text}")
+    hit = _cached(key)
+    if hit is not None:
+        return hit, True
+    system = (
+        f"You summarize {role} for a writer. Keep concrete claims, names, numbers and "
+        f"disagreements; drop filler. About {words} words, plain prose."
+    )
+    summary = llm.complete(system, text, max_tokens=words * 2).strip()
+    _store(key, summary)
+    return summary, False
+
+
+def _groups(summaries, budget):
+    group, size = [], 0
+    for s in summaries:
+        cost = estimate_tokens(s)
+        if group and size + cost > budget:
+            yield group
+            group, size = [], 0
+        group.append(s)
+        size += cost
+    if group:
+        yield group
+
+
+def ingest_source(text, llm=None, workers=MAX_WORKERS, report=None):
+    """
+    Map-reduce digest of a source text. Returns
+    {"summary", "chunks", "tokens", "sampled", "cached", "calls"}.
+    report(fraction, message) is called as chunks are summarized.
+    """
+    llm = llm or LLMClient()
+    chunks, sampled = plan_chunks(text)
+    digest = {"summary": "", "chunks": len(chunks), "tokens": estimate_tokens(text),
+              "sampled": sampled, "cached": 0, "calls": 0}
+    if not chunks:
+        return digest
+    role = "consecutive summaries of one source"
+    if len(chunks) == 1 and estimate_tokens(chunks[0]) <= REDUCE_TOKENS:
+        summaries, role = chunks, "a source"    # short source: one call on the text itself
+    else:
+        summaries = [None] * len(chunks)
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks)))) as pool:
+            futures = pool.map(lambda c: _summarize(llm, c, SUMMARY_WORDS, "one excerpt of a longer source"), chunks)
+            for i, (summary, cached) in enumerate(futures):
+                summaries[i] = summary
+                digest["cached"] += cached
+                digest["calls"] += not cached
+                if report:
+                    report((i + 1) / (len(chunks) + 1), f"Summarized chunk {i + 1}/{len(chunks)}")
+
+    while True:
+        groups = list(_groups(summaries, REDUCE_TOKENS))
+        if len(groups) == len(summaries) > 1:     # oversized summaries: merge pairwise
+            groups = [summaries[i:i + 2] for i in range(0, len(summaries), 2)]
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(groups)))) as pool:
+            words = DIGEST_WORDS if len(groups) == 1 else SUMMARY_WORDS * 2
+            results = list(pool.map(
+                lambda g: _summarize(llm, "\n\n".join(g), words, role), groups
+            ))
+        digest["cached"] += sum(c for _, c in results)
+        digest["calls"] += sum(not c for _, c in results)
+        summaries = [s for s, _ in results]
+        role = "consecutive summaries of one source"
+        if len(summaries) == 1:
+            break
+
+    digest["summary"] = summaries[0]
+    if report:
+        report(1.0, f"Digest ready ({digest['chunks']} chunk(s), {digest['calls']} call(s))")
+    return digest
+
+
+def infer_thesis(summary, llm=None):
+    """One-sentence op-ed thesis from a source digest."""
+    llm = llm or LLMClient()
+    return llm.complete(
+        system=(
+            "You infer concise op-ed theses. "
+            "Return a single sentence (<=25 words) that captures the central claim."
+        ),
+        user=f"Source summary:\n{summary}\n\nReturn only the thesis sentence.",
+        max_tokens=60,
+    ).strip()
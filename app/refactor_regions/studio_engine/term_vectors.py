@@ -0,0 +1,84 @@
+# ==========================================================
+#  RippleWriter Studio — Sparse Term Vectors
+#  Shared tokenizer + TF-IDF helpers for drift, coherence and
+#  evidence search. Vectors are plain {term: weight} dicts, so
+#  memory grows with the terms actually used, never with the
+#  vocabulary or the number of paragraph pairs.
+# ==========================================================
+
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+
+from app.refactor_regions.studio_engine.paragraph_cache import paragraph_hash
+
+MAX_CACHED_COUNTS = 8192
+
+STOPWORDS = frozenset(
+    "a an and are as at be been but by for from has have he her his i in is it its "
+    "of on or our she that the their them there these they this to was we were which "
+    "who will with would you your not no so than then also into about over after".split()
+)
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+def terms_of(text):
+    return [t for t in _WORD_RE.findall(text.lower()) if t not in STOPWORDS and len(t) > 1]
+
+
+# ----------------------------------------------------------
+# Per-paragraph term counts (process-wide LRU by content hash)
+# ----------------------------------------------------------
+_COUNTS_CACHE = OrderedDict()
+_COUNTS_LOCK = threading.Lock()
+
+
+def term_counts(paragraph, digest=None):
+    digest = digest or paragraph_hash(paragraph)
+    with _COUNTS_LOCK:
+        counts = _COUNTS_CACHE.get(digest)
+        if counts is not None:
+            _COUNTS_CACHE.move_to_end(digest)
+            return counts
+
+    counts = Counter(terms_of(paragraph))
+    with _COUNTS_LOCK:
+        _COUNTS_CACHE[digest] = counts
+        if len(_COUNTS_CACHE) > MAX_CACHED_COUNTS:
+            _COUNTS_CACHE.popitem(last=False)
+    return counts
+
+
+# ----------------------------------------------------------
+# IDF snapshot
+# ----------------------------------------------------------
+class IdfSnapshot:
+    """Smoothed IDF frozen over a set of paragraphs (documents)."""
+
+    def __init__(self, paragraph_counts):
+        df = Counter()
+        for counts in paragraph_counts:
+            df.update(counts.keys())
+        self.n_docs = len(paragraph_counts)
+        self._df = df
+
+    def idf(self, term):
+        return math.log((1 + self.n_docs) / (1 + self._df.get(term, 0))) + 1.0
+
+
+def tfidf(counts, idf):
+    """L2-normalized sparse TF-IDF vector from a term Counter."""
+    vec = {t: (1.0 + math.log(n)) * idf.idf(t) for t, n in counts.items() if n > 0}
+    norm = math.sqrt(sum(w * w for w in vec.values()))
+    if not norm:
+        return {}
+    return {t: w / norm for t, w in vec.items()}
+
+
+def cosine(a, b):
+    """Dot product of two L2-normalized sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(w * b.get(t, 0.0) for t, w in a.items())
@@ -0,0 +1,392 @@
+# ==========================================================
+#  RippleWriter Studio — Equation Weight Tuning
+#  Searches RippleScore weight space against engagement
+#  labels and appends the best weight sets to equations.yaml.
+#
+#    S  (N, 5)   latest signals per labelled draft / post
+#    W  (C, 5)   candidate weights on the simplex (Dirichlet
+#                random search or a simplex grid, with
+#                per-signal min / max / fixed constraints)
+#
+#  Screening: Pearson(S w, rank(y)) for every candidate in
+#  closed form — w·cov / sqrt(wᵀ Σ w) — so cost is O(C·S²)
+#  regardless of corpus size. The shortlist is then ranked by
+#  exact Spearman ρ and checked on a held-out split.
+#
+#  python -m app.refactor_regions.studio_engine.weight_tuning labels.csv
+# ==========================================================
+
+import argparse
+import csv
+import datetime
+import json
+import sys
+from itertools import combinations
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+from app.utils.yaml_tools import MODELS_DIR
+from app.refactor_regions.studio_engine.signal_engine import SIGNAL_KEYS
+from app.refactor_regions.studio_engine.ripple_score import load_equations, normalize_equations, weight_matrix
+from app.refactor_regions.studio_engine.score_store import get_score_store
+
+EQUATIONS_PATH = MODELS_DIR / "equations.yaml"
+
+N_CANDIDATES = 1_000_000
+GRID_STEP = 0.05
+SHORTLIST = 2000
+TOP = 5
+HOLDOUT = 0.25
+MIN_HOLDOUT_ROWS = 8
+_CHUNK = 250_000
+
+
+# ----------------------------------------------------------
+# Labels
+# ----------------------------------------------------------
+def _key(draft_id):
+    return Path(str(draft_id)).stem.strip().lower()
+
+
+def load_labels(path, column="engagement", id_column=None):
+    """
+    {draft id: label} from a CSV (id column + label column) or a
+    YAML / JSON mapping. The CSV id column defaults to the first of
+    draft / id / slug / path / file / title that is present.
+    """
+    path = Path(path)
+    if path.suffix.lower() in (".yaml", ".yml", ".json"):
+        raw = path.read_text(encoding="utf-8")
+        data = json.loads(raw) if path.suffix.lower() == ".json" else yaml.safe_load(raw)
+        return {str(k): float(v) for k, v in (data or {}).items() if v is not None}
+
+    labels = {}
+    with path.open(newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        fields = reader.fieldnames or []
+        if id_column is None:
+            id_column = next((c for c in ("draft", "id", "slug", "path", "file", "title") if c in fields), None)
+        if id_column not in fields or column not in fields:
+            raise ValueError(f"{path.name} needs columns '{id_column or 'draft'}' and '{column}' (has {fields})")
+        for row in reader:
+            try:
+                labels[row[id_column]] = float(row[column])
+            except (TypeError, ValueError):
+                continue
+    return labels
+
+
+def match_labels(drafts, S, labels):
+    """
+    Rows of S with a label. A label key matches a draft id exactly or
+    by file stem (e.g. "my-post" matches posts/my-post.html).
+    Returns (draft ids, (N, S) signals, (N,) labels).
+    """
+    by_stem = {}
+    for i, d in enumerate(drafts):
+        by_stem.setdefault(_key(d), i)
+    index = {d: i for i, d in enumerate(drafts)}
+
+    rows, y = {}, {}
+    for key, value in labels.items():
+        i = index.get(key, by_stem.get(_key(key)))
+        if i is not None and i not in rows:
+            rows[i] = True
+            y[i] = value
+    picked = sorted(rows)
+    return [drafts[i] for i in picked], S[picked], np.array([y[i] for i in picked], dtype=np.float64)
+
+
+# ----------------------------------------------------------
+# Candidates
+# ----------------------------------------------------------
+def parse_bounds(items):
+    """["coherence=0.1", ...] -> {"coherence": 0.1}."""
+    out = {}
+    for item in items or []:
+        key, _, value = item.partition("=")
+        key = key.strip().lower()
+        if key not in SIGNAL_KEYS:
+            raise ValueError(f"Unknown signal '{key}' (expected one of {', '.join(SIGNAL_KEYS)})")
+        out[key] = float(value)
+    return out
+
+
+def _constrain(G, lower, upper, fixed):
+    """
+    Map points G (C, F) of the unit simplex over the free signals to
+    full (C, S) weight rows: fixed weights are pinned, lower bounds are
+    added on top of the remaining mass, rows over an upper bound dropped.
+    """
+    free = [k for k in SIGNAL_KEYS if k not in fixed]
+    lo = np.array([lower.get(k, 0.0) for k in free])
+    mass = 1.0 - sum(fixed.values()) - lo.sum()
+    if mass < -1e-12:
+        raise ValueError("Fixed weights and lower bounds add up to more than 1.")
+
+    W = np.zeros((len(G), len(SIGNAL_KEYS)))
+    for k, v in fixed.items():
+        W[:, SIGNAL_KEYS.index(k)] = v
+    W[:, [SIGNAL_KEYS.index(k) for k in free]] = lo + max(mass, 0.0) * G
+
+    ok = np.ones(len(W), dtype=bool)
+    for k, v in upper.items():
+        ok &= W[:, SIGNAL_KEYS.index(k)] <= v + 1e-12
+    return W[ok]
+
+
+def random_candidates(n=N_CANDIDATES, lower=None, upper=None, fixed=None, alpha=1.0, seed=0):
+    """
+    Up to n Dirichlet(alpha) weight rows satisfying the constraints.
+    alpha=1 is uniform over the constrained simplex.
+    """
+    lower, upper, fixed = lower or {}, upper or {}, fixed or {}
+    free = len(SIGNAL_KEYS) - len(fixed)
+    if free == 0:
+        return _constrain(np.zeros((1, 0)), lower, upper, fixed)
+
+    rng = np.random.default_rng(seed)
+    out, have = [], 0
+    for _ in range(20):     # rejection rounds for upper bounds
+        W = _constrain(rng.dirichlet(np.full(free, alpha), size=n), lower, upper, fixed)
+        out.append(W)
+        have += len(W)
+        if have >= n or not upper:
+            break
+    return np.concatenate(out)[:n]
+
+
+def grid_candidates(step=GRID_STEP, lower=None, upper=None, fixed=None):
+    """Every point of the simplex grid with spacing `step` (stars and bars)."""
+    lower, upper, fixed = lower or {}, upper or {}, fixed or {}
+    free = len(SIGNAL_KEYS) - len(fixed)
+    if free == 0:
+        return _constrain(np.zeros((1, 0)), lower, upper, fixed)
+
+    k = int(round(1.0 / step))
+    bars = np.array(list(combinations(range(k + free - 1), free - 1)), dtype=np.int64).reshape(-1, free - 1)
+    edges = np.hstack((np.full((len(bars), 1), -1), bars, np.full((len(bars), 1), k + free - 1)))
+    G = (np.diff(edges, axis=1) - 1) / k
+    return _constrain(G, lower, upper, fixed)
+
+
+# ----------------------------------------------------------
+# Rank correlation
+# ----------------------------------------------------------
+def rank_rows(M):
+    """0-based ranks along the last axis; ties share their mean rank."""
+    M = np.atleast_2d(np.asarray(M, dtype=np.float64))
+    C, N = M.shape
+    order = np.argsort(M, axis=1, kind="stable")
+    v = np.take_along_axis(M, order, axis=1)
+
+    new_run = np.ones((C, N), dtype=bool)
+    new_run[:, 1:] = v[:, 1:] != v[:, :-1]
+    run = np.cumsum(new_run.ravel()) - 1
+    pos = np.tile(np.arange(N, dtype=np.float64), C)
+    mean_pos = np.bincount(run, weights=pos) / np.bincount(run)
+
+    R = np.empty((C, N))
+    np.put_along_axis(R, order, mean_pos[run].reshape(C, N), axis=1)
+    return R
+
+
+def screen(S, y_rank, W):
+    """Pearson(S w, y_rank) for every row of W without forming S @ W.T."""
+    Sc = S - S.mean(axis=0)
+    yc = y_rank - y_rank.mean()
+    cov = Sc.T @ yc
+    sigma = Sc.T @ Sc
+    y_norm = np.sqrt(yc @ yc)
+
+    out = np.zeros(len(W))
+    for i in range(0, len(W), _CHUNK):
+        w = W[i:i + _CHUNK]
+        var = ((w @ sigma) * w).sum(axis=1)
+        out[i:i + _CHUNK] = np.divide(w @ cov, np.sqrt(var) * y_norm, out=np.zeros(len(w)), where=var > 1e-18)
+    return out
+
+
+def spearman(S, y, W):
+    """Exact Spearman ρ between S @ w and y for every row of W."""
+    if len(y) < 2:
+        return np.zeros(len(W))
+    yc = rank_rows(y)[0]
+    yc -= yc.mean()
+    y_norm = np.sqrt(yc @ yc)
+
+    out = np.zeros(len(W))
+    step = max(1, 4_000_000 // len(y))
+    for i in range(0, len(W), step):
+        R = rank_rows(W[i:i + step] @ S.T)
+        R -= R.mean(axis=1, keepdims=True)
+        den = np.sqrt((R * R).sum(axis=1)) * y_norm
+        out[i:i + step] = np.divide(R @ yc, den, out=np.zeros(len(R)), where=den > 0)
+    return out
+
+
+# ----------------------------------------------------------
+# Search
+# ----------------------------------------------------------
+def split_rows(n, holdout=HOLDOUT, seed=0):
+    """(train, test) row indices; no test split for small corpora."""
+    rows = np.random.default_rng(seed).permutation(n)
+    n_test = int(round(n * holdout))
+    if n_test < MIN_HOLDOUT_ROWS or n - n_test < MIN_HOLDOUT_ROWS:
+        return np.sort(rows), np.zeros(0, dtype=np.int64)
+    return np.sort(rows[n_test:]), np.sort(rows[:n_test])
+
+
+def tune(S, y, W, shortlist=SHORTLIST, top=TOP, holdout=HOLDOUT, seed=0):
+    """
+    Returns {
+      top:      [{weights, rho, rho_holdout}]  best by exact training ρ,
+      baseline: [{id, rho, rho_holdout}]       current equations.yaml,
+      rows, train, test, candidates,
+    }
+    """
+    train, test = split_rows(len(y), holdout, seed)
+    S_tr, y_tr = S[train], y[train]
+
+    approx = screen(S_tr, rank_rows(y_tr)[0], W)
+    keep = min(shortlist, len(W))
+    short = np.argpartition(-approx, keep - 1)[:keep] if keep < len(W) else np.arange(len(W))
+    rho = spearman(S_tr, y_tr, W[short])
+    best = short[np.argsort(-rho)[:top]]
+    best_rho = np.sort(rho)[::-1][:top]
+    held = spearman(S[test], y[test], W[best]) if len(test) else [None] * len(best)
+
+    baseline = []
+    equations = [eq for eq in load_equations() if any(eq["weights"].values())]
+    if equations:
+        B = weight_matrix(equations)
+        b_tr = spearman(S_tr, y_tr, B)
+        b_te = spearman(S[test], y[test], B) if len(test) else [None] * len(B)
+        baseline = [
+            {"id": eq["id"], "rho": float(a), "rho_holdout": None if b is None else float(b)}
+            for eq, a, b in zip(equations, b_tr, b_te)
+        ]
+
+    return {
+        "top": [
+            {"weights": dict(zip(SIGNAL_KEYS, W[i].tolist())), "rho": float(r),
+             "rho_holdout": None if h is None else float(h)}
+            for i, r, h in zip(best, best_rho, held)
+        ],
+        "baseline": baseline,
+        "rows": len(y),
+        "train": len(train),
+        "test": len(test),
+        "candidates": len(W),
+    }
+
+
+# ----------------------------------------------------------
+# equations.yaml
+# ----------------------------------------------------------
+def append_equations(results, label_name, method, path=EQUATIONS_PATH, prefix="tuned"):
+    """
+    Append result["top"] entries to equations.yaml as new equations
+    (text append, so existing entries and comments are untouched).
+    Returns the new ids.
+    """
+    text = Path(path).read_text(encoding="utf-8")
+    taken = {eq["id"] for eq in normalize_equations(yaml.safe_load(text))}
+    today = datetime.date.today().isoformat()
+    lines, ids = [], []
+    n = 1
+    for rank, cand in enumerate(results["top"], start=1):
+        while f"{prefix}-{label_name}-{n}" in taken:
+            n += 1
+        eq_id = f"{prefix}-{label_name}-{n}"
+        taken.add(eq_id)
+        ids.append(eq_id)
+
+        held = cand["rho_holdout"]
+        held_txt = f"; held-out ρ {held:.3f} on {results['test']}" if held is not None else ""
+        weights = ", ".join(f"{k}: {cand['weights'][k]:.3f}" for k in SIGNAL_KEYS)
+        lines += [
+            "",
+            f'  - id: "{eq_id}"',
+            f'    name: "Tuned #{rank} — {label_name} (ρ {cand["rho"]:.2f})"',
+            f'    desc: "{method} over {results["candidates"]:,} candidates, Spearman ρ {cand["rho"]:.3f} '
+            f'on {results["train"]} labelled drafts{held_txt} ({today})."',
+            f"    weights: {{ {weights} }}",
+        ]
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(("" if text.endswith("\n") else "\n") + "\n".join(lines) + "\n")
+    return ids
+
+
+# ----------------------------------------------------------
+# CLI
+# ----------------------------------------------------------
+def _fmt(value):
+    return "   —  " if value is None else f"{value:+.3f}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tune RippleScore equation weights against engagement labels.")
+    parser.add_argument("labels", help="CSV (id + label columns), YAML or JSON mapping of draft -> engagement")
+    parser.add_argument("--label", default="engagement", help="label column in a CSV (default: engagement)")
+    parser.add_argument("--id-column", default=None, help="draft id column in a CSV")
+    parser.add_argument("--search", choices=("random", "grid"), default="random")
+    parser.add_argument("--candidates", type=int, default=N_CANDIDATES, help="random search size")
+    parser.add_argument("--alpha", type=float, default=1.0, help="Dirichlet concentration (1 = uniform)")
+    parser.add_argument("--step", type=float, default=GRID_STEP, help="grid spacing")
+    parser.add_argument("--min", action="append", metavar="SIGNAL=W", help="lower bound on a weight")
+    parser.add_argument("--max", action="append", metavar="SIGNAL=W", help="upper bound on a weight")
+    parser.add_argument("--fix", action="append", metavar="SIGNAL=W", help="pin a weight")
+    parser.add_argument("--shortlist", type=int, default=SHORTLIST)
+    parser.add_argument("--top", type=int, default=TOP)
+    parser.add_argument("--holdout", type=float, default=HOLDOUT)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-sync", action="store_true", help="skip rescanning articles/ and output/posts/")
+    parser.add_argument("--write", action="store_true", help="append the top weight sets to equations.yaml")
+    args = parser.parse_args(argv)
+
+    store = get_score_store()
+    if not args.no_sync:
+        store.sync_corpus()
+    drafts, S_all = store.latest_signals()
+    names, S, y = match_labels(drafts, S_all, load_labels(args.labels, args.label, args.id_column))
+    if len(y) < 3:
+        print(f"Only {len(y)} labelled drafts matched the score store — need at least 3.")
+        return 1
+
+    lower, upper, fixed = parse_bounds(args.min), parse_bounds(args.max), parse_bounds(args.fix)
+    started = datetime.datetime.now()
+    if args.search == "grid":
+        W = grid_candidates(args.step, lower, upper, fixed)
+        method = f"Grid search (step {args.step:g})"
+    else:
+        W = random_candidates(args.candidates, lower, upper, fixed, args.alpha, args.seed)
+        method = "Random search"
+    if not len(W):
+        print("No candidate satisfies the constraints.")
+        return 1
+
+    results = tune(S, y, W, args.shortlist, args.top, args.holdout, args.seed)
+    elapsed = (datetime.datetime.now() - started).total_seconds()
+
+    print(f"{len(y)} labelled drafts ({results['train']} train / {results['test']} held out), "
+          f"{len(W):,} candidates in {elapsed:.2f}s\n")
+    header = "  ".join(f"{k[:9]:>9}" for k in SIGNAL_KEYS)
+    print(f"{'':24}{header}      ρ   held-out")
+    for i, cand in enumerate(results["top"], start=1):
+        row = "  ".join(f"{cand['weights'][k]:9.3f}" for k in SIGNAL_KEYS)
+        print(f"{'#' + str(i):24}{row}  {_fmt(cand['rho'])}  {_fmt(cand['rho_holdout'])}")
+    for base in results["baseline"]:
+        print(f"{base['id'][:24]:24}{'':{len(header)}}  {_fmt(base['rho'])}  {_fmt(base['rho_holdout'])}")
+
+    if args.write:
+        ids = append_equations(results, args.label, method)
+        print(f"\nAppended to {EQUATIONS_PATH.name}: {', '.join(ids)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,12 @@
+import re
+
 import yaml
 import streamlit as st
 
+from app.refactor_regions.studio_engine.section_regen import regenerate_section, remember_sections
+
+SECTION_HEADING_RE = re.compile(r"^(#{1,3})\s+(.+?)\s*#*\s*$")
+
 # ----------------------------------------------------------
 # WRITE ENGINE — Processes all WriteState flags
 # ----------------------------------------------------------
@@ -123,11 +129,46 @@ def write_and_render(draft_text):
     yaml_out = generate_structure(draft_text)
     return rendered, yaml_out
 
-def rewrite_section_logic(draft_text, section_name):
-    return draft_text.replace(
-        section_name,
-        section_name + " (rewritten via engine)"
-    )
+def _markdown_sections(draft_text):
+    """(title, [[heading, body], ...]) split on ## / ### headings."""
+    title, sections = "", []
+    for line in draft_text.splitlines():
+        m = SECTION_HEADING_RE.match(line)
+        if m and len(m.group(1)) == 1 and not title and not sections:
+            title = m.group(2).strip()
+        elif m and len(m.group(1)) > 1:
+            sections.append([m.group(2).strip(), []])
+        elif sections:
+            sections[-1][1].append(line)
+    return title, [[h, "\n".join(body).strip()] for h, body in sections]
+
+
+def rewrite_section_logic(draft_text, section_name, instruction=""):
+    """Regenerate only the `## section_name` block; the rest of the draft is untouched."""
+    title, sections = _markdown_sections(draft_text)
+    names = [h.lower() for h, _ in sections]
+    if section_name.strip().lower() not in names:
+        return draft_text
+    i = names.index(section_name.strip().lower())
+
+    y = {"title": title, "sections": [{"heading": h, "content": body} for h, body in sections]}
+    remember_sections(y)
+    text = regenerate_section(y, i, instruction=instruction)
+
+    lines, out, seen, skipping = draft_text.splitlines(), [], -1, False
+    for line in lines:
+        m = SECTION_HEADING_RE.match(line)
+        if m and len(m.group(1)) > 1:
+            seen += 1
+            if skipping:
+                skipping = False
+            if seen == i:
+                out += [line, "", text, ""]
+                skipping = True
+                continue
+        if not skipping:
+            out.append(line)
+    return "\n".join(out) + ("\n" if draft_text.endswith("\n") else "")
 
 def generate_preview_html(yaml_text):
     # Placeholder until NYT-style renderer
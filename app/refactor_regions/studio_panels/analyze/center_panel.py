@@ -1,109 +1,86 @@
+import time
+
 import streamlit as st
 
+from app.refactor_regions.studio_engine.analysis_jobs import get_job
+
+
+def publish_for_export(result):
+    """Copy report fields into the session keys the Export tab reads."""
+    st.session_state.rippletruth_report = result.get("rippletruth_report", "")
+    st.session_state.intent_metrics = result.get("intent_metrics", "")
+    st.session_state.insights_text = result.get("insights_text", "")
+
+
+def render_result(result):
+    st.subheader(result["title"])
+
+    metrics = result.get("metrics") or {}
+    if metrics:
+        cols = st.columns(min(4, len(metrics)))
+        for i, (label, value) in enumerate(metrics.items()):
+            cols[i % len(cols)].metric(label, value)
+
+    if result.get("chart"):
+        st.line_chart(result["chart"])
+
+    if result.get("table"):
+        st.dataframe(result["table"], use_container_width=True, hide_index=True)
+
+    for note in result.get("notes") or []:
+        st.caption(note)
+
+
+def render_parts(parts):
+    """Per-module results of a composite run (partial while running)."""
+    for name, part in parts:
+        with st.expander(f"{name} — {part['title']}", expanded=False):
+            render_result(part)
+
+
 def render_center_panel(col):
     with col:
         st.header("📚 Analysis Results", divider="gray")
 
         # Safety guard
-        if "analysis_trigger" not in st.session_state or not st.session_state.analysis_trigger:
-            st.info("Run an analysis using the left panel.")
-            return
-
         if "analysis_data" not in st.session_state or not st.session_state.analysis_data:
             st.warning("No draft loaded.")
             return
 
-        mode = st.session_state.get("analysis_mode", "RippleTruth Fact Scan")
-        draft = st.session_state.analysis_data
+        job = get_job(st.session_state.get("analysis_job_key"))
+        if job is None:
+            st.info("Run an analysis using the left panel.")
+            return
 
         # Display mode
-        st.markdown(f"**Selected Mode:** `{mode}`")
+        st.markdown(f"**Selected Mode:** `{job.mode}`")
         st.markdown("---")
 
-        # Placeholder for displayed results
-        result_container = st.container()
-
         # ---------------------------------------------------------
-        # MODE-SPECIFIC ANALYSIS (stub outputs)
+        # Job still running → show progress and poll
         # ---------------------------------------------------------
-        if mode == "RippleTruth Fact Scan":
-            with result_container:
-                st.subheader("🧪 RippleTruth Fact Scan")
-                st.info("Running fact-scan using RippleTruth engine…")
-                st.write("• (Future) Claim extraction engine will process this text.")
-                st.write("• (Future) Evidence score, reliability, and RippleScore will show here.")
-
-        elif mode == "Intentionality Metrics (FILS / UCIP / Drift)":
-            with result_container:
-                st.subheader("🌌 Intention Metrics")
-                st.info("Computing FILS, UCIP, Drift from intention equations…")
-                st.write("• (Future) FILS, UCIP amplitude, TTCF, Drift values will be displayed.")
-                st.write("• (Future) Narrative force map using UCIP slope.")
-
-        elif mode == "Structural Coherence Map":
-            with result_container:
-                st.subheader("🧩 Structural Coherence Map")
-                st.info("Analyzing outline, structure, section cohesion…")
-                st.write("• (Future) Section hierarchy + map visualization.")
-
-        elif mode == "Narrative Force Analysis":
-            with result_container:
-                st.subheader("⚡ Narrative Force Analysis")
-                st.info("Evaluating tone, momentum, pressure, and domain force.")
-                st.write("• (Future) Ripple coherence, pressure vectors, strength.")
-
-        elif mode == "Full Composite Analysis":
-            with result_container:
-                st.subheader("🌀 Full Composite RippleWriter Analysis")
-                st.info("Running all modules: TruthScan + FILS + Drift + Coherence…")
-                st.write("• (Future) Composite score, charts, and integrated map.")
+        if not job.finished:
+            st.progress(job.progress, text=job.message)
+            # Composite modules stream in as each one finishes
+            render_parts(list(job.partials.items()))
+            time.sleep(0.25)
+            st.rerun()
+
+        if job.status == "error":
+            st.error(f"Analysis failed: {job.error}")
+            return
+
+        render_result(job.result)
+        render_parts(list((job.result.get("parts") or {}).items()))
+
+        if job.cached:
+            st.caption("⚡ Loaded from cache (draft unchanged).")
+        else:
+            st.caption(f"Completed in {job.elapsed * 1000:.0f} ms.")
 
         # ---------------------------------------------------------
-        # NEW: STORE RESULTS FOR EXPORT (stub outputs)
+        # STORE RESULTS FOR EXPORT
         # ---------------------------------------------------------
-        if mode == "RippleTruth Fact Scan":
-            st.session_state.rippletruth_report = (
-                "RippleTruth scan completed.\n"
-                "(Future: claim extraction + evidence score + RippleScore)"
-            )
-            st.session_state.insights_text = ""
-            st.session_state.intent_metrics = ""
-
-        elif mode == "Intentionality Metrics (FILS / UCIP / Drift)":
-            st.session_state.intent_metrics = (
-                "Intention metrics computed (FILS/UCIP/Drift).\n"
-                "(Future: full intention metrics calculation)"
-            )
-            st.session_state.insights_text = ""
-            st.session_state.rippletruth_report = ""
-
-        elif mode == "Narrative Force Analysis":
-            st.session_state.insights_text = (
-                "Narrative force analysis completed.\n"
-                "(Future: tone, momentum, pressure vectors)"
-            )
-            st.session_state.rippletruth_report = ""
-            st.session_state.intent_metrics = ""
-
-        elif mode == "Structural Coherence Map":
-            st.session_state.insights_text = (
-                "Structural coherence map generated.\n"
-                "(Future: section hierarchy + cohesion analysis)"
-            )
-            st.session_state.rippletruth_report = ""
-            st.session_state.intent_metrics = ""
-
-        elif mode == "Full Composite Analysis":
-            st.session_state.insights_text = (
-                "Composite insights generated.\n"
-                "(Future: combined metrics & RippleForce map)"
-            )
-            st.session_state.rippletruth_report = (
-                "RippleTruth module completed (composite mode)."
-            )
-            st.session_state.intent_metrics = (
-                "Intention metrics computed (composite mode)."
-            )
-
-        # Reset trigger so page doesn’t re-run repeatedly
-        st.session_state.analysis_trigger = False
+        if st.session_state.get("analysis_trigger"):
+            publish_for_export(job.result)
+            st.session_state.analysis_trigger = False
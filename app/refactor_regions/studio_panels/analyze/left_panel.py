@@ -1,4 +1,10 @@
 import streamlit as st
+import yaml
+
+from app.refactor_regions.studio_engine.analysis_jobs import submit_analysis
+from app.refactor_regions.studio_engine.coherence_engine import sections_from_yaml
+from app.refactor_regions.studio_engine.intention_equations import draft_weight_overrides
+from app.refactor_regions.studio_state.write_state import WriteState
 
 def render_left_panel(col):
     with col:
@@ -17,10 +23,27 @@ def render_left_panel(col):
         if st.button("Load Into Analyzer", type="primary"):
             if draft_text.strip():
                 st.session_state.analysis_data = draft_text.strip()
+                st.session_state.analysis_sections = []
+                st.session_state.analysis_weights = {}
                 st.success("Draft loaded into analysis engine.")
             else:
                 st.warning("Please enter text first.")
 
+        # Write-tab draft + its YAML sections (coherence map) and intention_weights
+        if st.button("Load Current Write Draft"):
+            state = WriteState.load()
+            if state.draft_text.strip():
+                try:
+                    yaml_data = yaml.safe_load(state.yaml_text or "") or {}
+                except yaml.YAMLError:
+                    yaml_data = {}
+                st.session_state.analysis_data = state.draft_text.strip()
+                st.session_state.analysis_sections = sections_from_yaml(yaml_data)
+                st.session_state.analysis_weights = draft_weight_overrides(yaml_data)
+                st.success("Write draft loaded into analysis engine.")
+            else:
+                st.warning("The Write tab has no draft yet.")
+
         st.markdown("")
 
         # --------------------------------------------------
@@ -64,6 +87,7 @@ def render_left_panel(col):
 
         # Sync widget → shadow
         st.session_state[shadow_key] = mode
+        st.session_state.analysis_mode = mode
 
         st.markdown("")
 
@@ -76,8 +100,16 @@ def render_left_panel(col):
             if "analysis_data" not in st.session_state or not st.session_state.analysis_data:
                 st.error("No draft loaded.")
             else:
+                # Runs on the analysis thread pool; cached per (draft, mode)
+                job = submit_analysis(
+                    st.session_state.analysis_data,
+                    mode,
+                    sections=st.session_state.get("analysis_sections"),
+                    weights=st.session_state.get("analysis_weights"),
+                )
+                st.session_state.analysis_job_key = job.key
                 st.session_state.analysis_trigger = True
-                st.success("Analysis queued.")
+                st.success("Analysis loaded from cache." if job.cached else "Analysis queued.")
 
         st.markdown("---")
         st.caption("Analyze tab — left panel controls (2025 modular architecture)")
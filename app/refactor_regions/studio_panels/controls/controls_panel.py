@@ -7,6 +7,7 @@
 import streamlit as st
 import datetime
 from app.utils.yaml_tools import list_yaml_files, load_yaml
+from app.refactor_regions.studio_panels.controls.score_dashboard import render_score_dashboard
 
 def render_controls_panel():
     """
@@ -117,6 +118,11 @@ def render_controls_panel():
     st.caption("Determines equation availability in Write tab.")
     st.divider()
 
+    # ==================================================
+    # SCORE TRENDS
+    # ==================================================
+    render_score_dashboard()
+
     # ==================================================
     # USER GUIDE
     # ==================================================
@@ -129,6 +135,7 @@ Global application controls independent of article structure.
 - AI configuration  
 - Draft management  
 - Template/equation pack selection  
+- Corpus score trends  
 - Diagnostics  
 """)
 
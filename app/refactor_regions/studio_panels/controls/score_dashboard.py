@@ -0,0 +1,51 @@
+# ==========================================================
+#  RippleWriter Studio — Score Trends Dashboard (Controls Tab)
+#  Corpus-wide signal / RippleScore trends from the score
+#  store, grouped by author, format or tag.
+# ==========================================================
+
+import streamlit as st
+
+from app.refactor_regions.studio_engine.score_store import BUCKETS, GROUPINGS, get_score_store
+
+
+def render_score_dashboard():
+    st.subheader("📈 Score Trends")
+
+    store = get_score_store()
+
+    c1, c2 = st.columns([3, 1])
+    with c2:
+        if st.button("🔁 Rescan Articles & Posts", key="controls_scores_sync"):
+            added = store.sync_corpus()
+            st.success(f"{added} new revisions recorded.")
+
+    revisions, drafts = store.counts()
+    with c1:
+        st.markdown(f"**{revisions} revisions across {drafts} drafts and posts**")
+
+    if not revisions:
+        st.caption("Scores are recorded each time a draft is saved in the Write tab.")
+        st.divider()
+        return
+
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        metric = st.selectbox("Metric", store.metrics(), key="controls_scores_metric")
+    with c2:
+        by = st.selectbox("Group by", [g for g in GROUPINGS if g != "draft"], key="controls_scores_by")
+    with c3:
+        bucket = st.selectbox("Bucket", BUCKETS, index=1, key="controls_scores_bucket")
+
+    trend = store.trend(metric, by=by, bucket=bucket)
+    if trend["buckets"]:
+        # Most active groups only, so the chart stays readable
+        top = sorted(trend["counts"], key=trend["counts"].get, reverse=True)[:8]
+        chart = {"bucket": trend["buckets"]}
+        chart.update({group: trend["series"][group] for group in top})
+        st.line_chart(chart, x="bucket")
+
+    latest = st.toggle("Latest revision per draft only", value=True, key="controls_scores_latest")
+    st.dataframe(store.summary(metric, by=by, latest_only=latest), use_container_width=True, hide_index=True)
+    st.caption("Weekly buckets start on Monday. Tags are counted once per tagged revision.")
+    st.divider()
@@ -0,0 +1,72 @@
+import time
+
+import streamlit as st
+
+from app.refactor_regions.export_logic.batch_export import (
+    ARTICLES_DIR,
+    DEFAULT_FORMATS,
+    FORMATS,
+    collect_drafts,
+    get_batch_job,
+    submit_batch,
+)
+
+
+def render_batch_export():
+    """Batch export of many YAML drafts into one ZIP (worker processes)."""
+    with st.expander("🗂️ Batch Export", expanded=False):
+        st.caption(f"Drafts from `{ARTICLES_DIR.name}/` — every format rendered in parallel processes, streamed into a ZIP.")
+
+        tags = st.text_input("Tag filter (comma separated, optional)", key="batch_export_tags")
+        tag_list = [t for t in (tags or "").split(",") if t.strip()]
+        candidates = collect_drafts(tags=tag_list)
+
+        chosen = st.multiselect(
+            "Drafts",
+            [p.name for p in candidates],
+            default=[p.name for p in candidates],
+            key="batch_export_drafts",
+        )
+        formats = st.multiselect("Formats", list(FORMATS), default=list(DEFAULT_FORMATS), key="batch_export_formats")
+
+        job = get_batch_job(st.session_state.get("batch_export_job"))
+
+        if job is None or job.finished:
+            if st.button("Export batch", use_container_width=True, key="batch_export_run", disabled=not (chosen and formats)):
+                paths = [p for p in candidates if p.name in set(chosen)]
+                job = submit_batch(paths, formats)
+                st.session_state.batch_export_job = job.id
+
+        if job is None:
+            return
+
+        if not job.finished:
+            st.progress(job.progress, text=job.message)
+            time.sleep(0.5)
+            st.rerun()
+
+        if job.status == "error":
+            st.error(f"Batch export failed: {job.error}")
+            return
+
+        failed = [r for r in job.rows if r["status"] == "error"]
+        st.success(f"{len(job.rows)} draft(s) in {job.elapsed:.1f}s — {len(failed)} failed.")
+        st.dataframe(
+            [
+                {"draft": r["draft"], "status": r["status"], "seconds": r["seconds"].get("total", 0.0),
+                 "KB": round(r["bytes"] / 1024, 1), "error": r["error"] or ""}
+                for r in job.rows
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+        if job.target.exists():
+            with open(job.target, "rb") as f:
+                st.download_button(
+                    "⬇️ Download ZIP",
+                    data=f,
+                    file_name=job.target.name,
+                    mime="application/zip",
+                    use_container_width=True,
+                    key="batch_export_download",
+                )
@@ -9,6 +9,11 @@ import streamlit as st
 # Import the export builder
 try:
     from app.refactor_regions.export_logic.export_builder import build_export_output
+    from app.refactor_regions.export_logic.structured_export import (
+        STRUCTURED_FORMATS,
+        structured_bytes,
+        structured_preview,
+    )
 except Exception as e:
     st.error(f"Export builder import failed: {e}")
     build_export_output = None
@@ -69,9 +74,10 @@ def render_center_panel(col):
         }
 
         # ------------------------------------------------------
-        # 4. Export Format (HTML / DOCX / Markdown)
+        # 4. Export Format (HTML / Markdown / JSON / YAML)
         # ------------------------------------------------------
         export_format = st.session_state.get("export_format", "HTML")
+        structured_fmt = STRUCTURED_FORMATS.get(export_format)
 
         # ------------------------------------------------------
         # 5. LIVE PREVIEW ENGINE (Step 4 wiring)
@@ -103,6 +109,16 @@ def render_center_panel(col):
                 # Save into session_state for download panel
                 st.session_state.export_markdown = md_output
                 st.session_state.export_html = html_output
+                st.session_state.export_sections = sections
+
+                # JSON / YAML are streamed chunk by chunk into the bytes
+                if structured_fmt:
+                    st.session_state.export_structured = {
+                        "format": structured_fmt,
+                        "data": structured_bytes(structured_fmt, sections, metadata),
+                    }
+                else:
+                    st.session_state.pop("export_structured", None)
 
                 st.success("Export generated successfully!")
 
@@ -116,7 +132,11 @@ def render_center_panel(col):
         st.markdown("---")
         st.subheader("Preview 🔁")
 
-        md_tab, html_tab = st.tabs(["📝 Markdown", "🌐 HTML Preview"])
+        tab_names = ["📝 Markdown", "🌐 HTML Preview"]
+        if structured_fmt:
+            tab_names.append(f"🧾 {export_format}")
+        tabs = st.tabs(tab_names)
+        md_tab, html_tab = tabs[0], tabs[1]
 
         # -------- Markdown TAB --------
         with md_tab:
@@ -136,6 +156,14 @@ def render_center_panel(col):
             else:
                 st.info("HTML preview not available.")
 
+        # -------- JSON / YAML TAB (head only; generated lazily) --------
+        if structured_fmt:
+            with tabs[2]:
+                st.code(
+                    structured_preview(structured_fmt, sections, metadata),
+                    language=structured_fmt,
+                )
+
         # ------------------------------------------------------
         # Footer
         # ------------------------------------------------------
@@ -1,5 +1,7 @@
 import streamlit as st
 
+from app.refactor_regions.studio_panels.export.batch_panel import render_batch_export
+
 def render_left_panel(col):
     with col:
         st.header("📦 Export Controls", divider="gray")
@@ -62,4 +64,6 @@ def render_left_panel(col):
             st.success("Export generated.")
 
         st.markdown("---")
+        render_batch_export()
+
         st.caption("Export tab — left panel controls (2025 modular architecture)")
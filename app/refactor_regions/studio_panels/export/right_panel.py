@@ -1,6 +1,11 @@
+import time
+
 import streamlit as st
-from docx import Document
-from io import BytesIO
+
+from app.refactor_regions.export_logic.docx_jobs import cached_docx, get_docx_job, stamp_docx, submit_docx
+from app.refactor_regions.export_logic.export_builder import export_document, timestamp_fields
+from app.refactor_regions.export_logic.html_inline import DEFAULT_MAX_IMAGE_BYTES, inline_html, summarize
+from app.refactor_regions.export_logic.structured_export import MIME_TYPES
 
 
 def render_right_panel(col):
@@ -36,8 +41,22 @@ def render_right_panel(col):
             return
 
         # --------------------------------------------------------------------
-        # HTML Download
+        # HTML Download (single-file mode inlines stylesheets and images as
+        # data URIs; encoded assets are cached, so reruns only stat them)
         # --------------------------------------------------------------------
+        single_file = st.checkbox("Single-file HTML", value=True, key="export_single_file")
+        if single_file:
+            max_kb = st.number_input(
+                "Max image size (KB)",
+                min_value=16,
+                max_value=16384,
+                value=DEFAULT_MAX_IMAGE_BYTES // 1024,
+                step=64,
+                key="export_max_image_kb",
+            )
+            html, report = inline_html(html, max_image_bytes=int(max_kb) * 1024)
+            st.caption(f"HTML: {summarize(report)}")
+
         st.download_button(
             label="⬇️ Download HTML",
             data=html.encode("utf-8"),
@@ -58,48 +77,59 @@ def render_right_panel(col):
         )
 
         # --------------------------------------------------------------------
-        # DOCX Download (generated dynamically)
+        # JSON / YAML Download (when chosen in the left panel)
         # --------------------------------------------------------------------
-        docx_buffer = build_docx(title, subtitle, st.session_state.get("draft_text", ""), md)
-        st.download_button(
-            label="⬇️ Download DOCX",
-            data=docx_buffer,
-            file_name=f"{title.replace(' ', '_')}.docx",
-            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            use_container_width=True,
-        )
-
-        st.caption("Export tab — right panel controls (2025 modular architecture)")
-
+        structured = st.session_state.get("export_structured")
+        if structured:
+            fmt = structured["format"]
+            st.download_button(
+                label=f"⬇️ Download {fmt.upper()}",
+                data=structured["data"],
+                file_name=f"{title.replace(' ', '_')}.{fmt}",
+                mime=MIME_TYPES[fmt],
+                use_container_width=True,
+            )
 
-# ======================================================================
-# Build DOCX from markdown + metadata
-# ======================================================================
-def build_docx(title, subtitle, final_text, markdown_text):
-    """
-    Convert the exported content into a .docx binary stream.
-    """
-    doc = Document()
-
-    # Title
-    doc.add_heading(title, level=0)
-
-    # Subtitle
-    if subtitle:
-        doc.add_paragraph(subtitle)
-
-    doc.add_paragraph("")  # spacing
-
-    # The final text body
-    doc.add_heading("Final Draft", level=1)
-    doc.add_paragraph(final_text)
-
-    # Raw Markdown block (optional but extremely useful)
-    doc.add_heading("Markdown Source", level=1)
-    doc.add_paragraph(markdown_text)
+        # --------------------------------------------------------------------
+        # DOCX Download (walks the same document AST as MD / HTML; built on
+        # demand off the script thread and cached by export key — browsing
+        # this tab serializes nothing)
+        # --------------------------------------------------------------------
+        sections = st.session_state.get("export_sections") or {
+            "final_draft": st.session_state.get("draft_text", ""),
+        }
+        key, document = export_document(sections, {"title": title, "subtitle": subtitle})
+        fields = timestamp_fields()
+        docx_bytes = cached_docx(key, fields)
+
+        if docx_bytes is None:
+            job = get_docx_job(st.session_state.get("export_docx_job"))
+            if job is not None and job.key != key:
+                job = None     # inputs changed since this build was requested
+
+            if job is not None and job.status == "error":
+                st.error(f"DOCX build failed: {job.error}")
+
+            if job is None or job.status == "error":
+                if st.button("📄 Prepare DOCX", use_container_width=True, key="export_prepare_docx"):
+                    job = submit_docx(key, document, fields)
+                    st.session_state.export_docx_job = job.key
+
+            if job is not None and not job.finished:
+                st.progress(job.progress, text=job.message)
+                time.sleep(0.25)
+                st.rerun()
+
+            if job is not None and job.status == "done":
+                docx_bytes = stamp_docx(job.data, fields)
+
+        if docx_bytes is not None:
+            st.download_button(
+                label="⬇️ Download DOCX",
+                data=docx_bytes,
+                file_name=f"{title.replace(' ', '_')}.docx",
+                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                use_container_width=True,
+            )
 
-    # Write to memory buffer
-    buffer = BytesIO()
-    doc.save(buffer)
-    buffer.seek(0)
-    return buffer
+        st.caption("Export tab — right panel controls (2025 modular architecture)")
@@ -18,6 +18,11 @@ from app.utils.yaml_tools import (
     load_template,
     load_model
 )
+from app.refactor_regions.studio_engine.document_model import get_document
+from app.refactor_regions.studio_engine.intention_equations import draft_weight_overrides, load_intention_bank
+from app.refactor_regions.studio_engine.score_uncertainty import bootstrap_bank_intervals
+from app.refactor_regions.studio_engine.score_store import get_score_store
+from app.refactor_regions.studio_engine.outline_writer import section_plan, stitch, write_outline
 
 # =====================================================================
 # GLOBAL CSS — TIGHT LAYOUT, ZERO EMPTY SPACE
@@ -145,6 +150,67 @@ def render_yaml_import_gate(state: WriteState):
 
 
 
+# =====================================================================
+# LIVE INTENTION SCORES — every intention.yaml format at once
+# =====================================================================
+def render_intention_scores(draft_text: str, weights=None):
+
+    if not draft_text.strip():
+        st.caption("Start writing to see live intention scores.")
+        return None
+
+    # Shared document model: unchanged drafts are not re-parsed and only
+    # edited paragraphs are rescanned (paragraph LRU)
+    doc = get_document(draft_text)
+    signals = doc.signals
+
+    try:
+        bank = load_intention_bank(overrides=weights)
+        scores = bank.score(signals)
+    except ValueError as e:
+        st.warning(f"Intention equations could not be compiled: {e}")
+        return signals
+
+    # Paragraph bootstrap: how much each score depends on a few paragraphs
+    bands = bootstrap_bank_intervals(doc.paragraph_stats, bank) if len(doc.paragraphs) > 1 else {}
+
+    cols = st.columns(len(scores))
+    for col, (name, value) in zip(cols, scores.items()):
+        col.metric(name.title(), f"{value:.2f}")
+        if name in bands:
+            lo, hi = bands[name]
+            col.caption(f"95%: {lo:.2f}–{hi:.2f}")
+
+    return signals
+
+
+# =====================================================================
+# SCORE STORE — one revision per saved change
+# =====================================================================
+def record_revision(state: WriteState, signals=None):
+
+    try:
+        data = yaml.safe_load(state.yaml_text or "") or {}
+    except yaml.YAMLError:
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+
+    draft_id = state.last_saved_name or state.title or "untitled"
+
+    try:
+        get_score_store().record(
+            f"write/{draft_id}",
+            state.draft_text,
+            author=state.author,
+            fmt=str(data.get("format") or ""),
+            tags=state.tags or data.get("tags"),
+            signals=signals,
+        )
+    except Exception as e:
+        st.caption(f"Score history not recorded: {e}")
+
+
 # =====================================================================
 # MAIN WRITE PANEL
 # =====================================================================
@@ -249,11 +315,22 @@ def render_write_panel():
         height=320
     )
 
-    if updated != state.draft_text:
+    draft_changed = updated != state.draft_text
+    if draft_changed:
         state.draft_text = updated
         state.write_dirty = True
         state.save()
 
+    st.markdown("**Intention Scores (all formats)**")
+    try:
+        draft_yaml = yaml.safe_load(state.yaml_text or "") or {}
+    except yaml.YAMLError:
+        draft_yaml = {}
+    signals = render_intention_scores(state.draft_text, draft_weight_overrides(draft_yaml))
+
+    if draft_changed and state.draft_text.strip():
+        record_revision(state, signals)
+
     st.markdown("---")
 
 
@@ -262,17 +339,42 @@ def render_write_panel():
     # ------------------------------
     st.subheader("AI Writer")
 
+    ai_sections = st.checkbox(
+        "Write every section with AI (one request per section, in parallel)",
+        key="write_ai_sections",
+    )
+
     if st.button("✨ Generate Draft From Template"):
         if not selected_template:
             st.error("No template selected.")
         else:
-            sections = selected_template.get("sections", [])
-            outline = "\n\n".join([f"## {s}" for s in sections])
+            article = {
+                "title": state.title or selected_template.get("title"),
+                "thesis": state.deck or selected_template.get("subtitle") or selected_template.get("abstract"),
+                "audience": selected_template.get("audience"),
+                "tone": selected_template.get("tone"),
+                "format": selected_template.get("format"),
+            }
+            plan = section_plan(article, selected_template)
+
+            if ai_sections:
+                progress = st.progress(0.0, text="Drafting sections…")
+                try:
+                    sections = write_outline(
+                        article, plan=plan,
+                        report=lambda f, msg: progress.progress(min(f, 1.0), text=msg),
+                    )
+                except Exception as e:
+                    st.error(f"LLM error: {e}")
+                    sections = [{**item, "content": ""} for item in plan]
+                progress.empty()
+            else:
+                sections = [{**item, "content": ""} for item in plan]
 
             generated = (
                 f"# {state.title}\n\n"
                 f"### {state.deck}\n\n"
-                f"{outline}"
+                f"{stitch(sections)}"
             )
 
             state.draft_text = generated
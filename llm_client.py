@@ -2,7 +2,7 @@ import os
 import textwrap
 import yaml
 import pathlib
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 # --------------------------------------
 # Config loader
@@ -21,6 +21,34 @@ SETTINGS = load_settings()
 USE_MOCK = os.getenv("RIPPLEWRITER_MOCK", "0") == "1" or SETTINGS.get("mock", False)
 MODEL = os.getenv("RIPPLEWRITER_MODEL", SETTINGS.get("model", "gpt-4.1-mini"))
 
+POST_SECTIONS = ("lede", "body", "counterpoints", "conclusion")
+# Word budget when a single section is regenerated on its own
+SECTION_WORDS = {"lede": 120, "body": 600, "counterpoints": 200, "conclusion": 150}
+DEFAULT_SECTION_WORDS = 250
+CONTEXT_CHARS = 1200    # per neighbouring section passed as context
+# "single": one completion for the whole piece; "parallel": one per section
+GENERATION_STRATEGY = os.getenv("RIPPLEWRITER_STRATEGY", SETTINGS.get("generation_strategy", "single"))
+
+
+def post_brief(y: Dict[str, Any]) -> str:
+    """Title / thesis / audience / tone / outline / claims (/ source summary) prompt block."""
+    brief = (
+        f"Title: {y.get('title')}\n"
+        f"Thesis: {y.get('thesis')}\n"
+        f"Audience: {y.get('audience')}\n"
+        f"Tone: {y.get('tone')}\n"
+        f"Outline: {'; '.join(y.get('outline', []))}\n"
+        f"Claims: {'; '.join([c.get('claim', '') for c in y.get('claims', [])])}"
+    )
+    if y.get("source_summary"):
+        brief += f"\nSource summary: {y['source_summary']}"
+    return brief
+
+
+def _clip(text: str, limit: int) -> str:
+    text = (text or "").strip()
+    return text if len(text) <= limit else text[:limit].rsplit(" ", 1)[0] + " ..."
+
 # --------------------------------------
 # LLM Client Class
 # --------------------------------------
@@ -58,11 +86,12 @@ class LLMClient:
     # --------------------------
     # Real Mode
     # --------------------------
-    def complete(self, system: str, user: str) -> str:
+    def complete(self, system: str, user: str, max_tokens: int | None = None) -> str:
         """Send structured system/user messages to the model."""
         if self.use_mock:
             return self._mock(user)
 
+        extra = {"max_tokens": max_tokens} if max_tokens else {}
         resp = self.client.chat.completions.create(
             model=MODEL,
             messages=[
@@ -70,28 +99,26 @@ class LLMClient:
                 {"role": "user", "content": user},
             ],
             temperature=0.6,
+            **extra,
         )
         return resp.choices[0].message.content.strip()
 
     # --------------------------
     # RippleWriter Section Builder
     # --------------------------
-    def write_post_sections(self, y: Dict[str, Any]) -> Dict[str, str]:
+    def write_post_sections(self, y: Dict[str, Any], strategy: str | None = None) -> Dict[str, str]:
         """Generate structured op-ed sections based on YAML input."""
+        if (strategy or GENERATION_STRATEGY) == "parallel":
+            from app.refactor_regions.studio_engine.outline_writer import write_post_sections_parallel
+            return write_post_sections_parallel(y, self)
+
         system = (
             "You are RippleWriter, a concise op-ed drafter. Structure output as:\n"
             "Lede:\nBody:\nCounterpoints:\nConclusion:\n"
-            "Follow the provided thesis, tone, audience, and outline. Keep between 7001100 words."
+            "Follow the provided thesis, tone, audience, and outline. Keep between 700–1100 words."
         )
 
-        user = (
-            f"Title: {y.get('title')}\n"
-            f"Thesis: {y.get('thesis')}\n"
-            f"Audience: {y.get('audience')}\n"
-            f"Tone: {y.get('tone')}\n"
-            f"Outline: {'; '.join(y.get('outline', []))}\n"
-            f"Claims: {'; '.join([c.get('claim', '') for c in y.get('claims', [])])}"
-        )
+        user = post_brief(y)
 
         full = self.complete(system, user)
         sections = {"lede": "", "body": "", "counterpoints": "", "conclusion": ""}
@@ -119,3 +146,86 @@ class LLMClient:
                 sections[current] += line + "\n"
 
         return {k: v.strip() for k, v in sections.items()}
+
+    # --------------------------
+    # Single-Section Rewrite
+    # --------------------------
+    def write_section(self, y: Dict[str, Any], name: str, context: Dict[str, str] | None = None,
+                      instruction: str = "") -> str:
+        """
+        Regenerate only section `name` (one short completion).
+        `context` maps neighbouring section labels to their current
+        text; they steer continuity and are not rewritten.
+        """
+        words = SECTION_WORDS.get(name.lower(), DEFAULT_SECTION_WORDS)
+        if self.use_mock:
+            return f"[MOCKED {name.upper()}] A rewritten {name} for: {y.get('thesis') or y.get('title')}."
+
+        system = (
+            "You are RippleWriter, a concise op-ed drafter. Rewrite ONLY the requested section "
+            f"of an existing piece, about {words} words. Keep continuity with the surrounding "
+            "sections, do not repeat them, and do not add a section label."
+        )
+        parts = [post_brief(y), ""]
+        for label, text in (context or {}).items():
+            if (text or "").strip():
+                parts.append(f"[{label}]\n{_clip(text, CONTEXT_CHARS)}\n")
+        parts.append(f"Rewrite section: {name}")
+        if instruction:
+            parts.append(f"Editor note: {instruction}")
+
+        out = self.complete(system, "\n".join(parts), max_tokens=words * 2)
+        head, sep, rest = out.partition(":")
+        if sep and head.strip().lower() == name.lower():
+            out = rest
+        return out.strip()
+
+    # --------------------------
+    # Per-Section Drafting (parallel strategy)
+    # --------------------------
+    def write_outline_section(self, y: Dict[str, Any], headings: List[str], index: int,
+                              guidance: str = "", words: int = DEFAULT_SECTION_WORDS) -> str:
+        """
+        Draft section `index` of `headings` on its own. The system prompt
+        and brief are identical for every section of a piece; only the
+        tail names the section, so requests share one prompt prefix.
+        """
+        heading = headings[index]
+        if self.use_mock:
+            return f"[MOCKED SECTION {index + 1}] {heading}: drafted for {y.get('thesis') or y.get('title')}."
+
+        system = (
+            "You are RippleWriter, a concise drafter. You write one section of a longer piece at a "
+            "time, in the given tone for the given audience, serving the thesis. Output only the "
+            "section's prose: no heading, no label, no preamble."
+        )
+        outline = "\n".join(f"{i + 1}. {h}" for i, h in enumerate(headings))
+        user = (
+            f"{post_brief(y)}\n"
+            f"Format: {y.get('format') or 'article'}\n"
+            f"Full outline:\n{outline}\n\n"
+            f"Write section {index + 1}: {heading} (about {words} words)."
+        )
+        if guidance:
+            user += f"\nGuidance: {guidance.strip()}"
+        return self.complete(system, user, max_tokens=words * 2).strip()
+
+    def smooth_transitions(self, y: Dict[str, Any], joins: List[tuple]) -> str:
+        """
+        Consistency pass over independently drafted sections. `joins` is
+        [(k, end of section k-1, opening of section k)]; the reply holds
+        "[k] revised opening" lines, or NONE.
+        """
+        if self.use_mock or not joins:
+            return "NONE"
+        system = (
+            "You are RippleWriter's copy editor. The sections of this piece were drafted separately. "
+            "For each numbered join, decide whether the opening paragraph of the next section follows "
+            "naturally from the end of the previous one (no repeated set-up, consistent terms and tone). "
+            "For joins that need it, reply with one line: [n] revised opening paragraph. "
+            "Reply NONE if every join reads well."
+        )
+        parts = [post_brief(y), ""]
+        for k, before, after in joins:
+            parts.append(f"[{k}]\nEnd of previous section: {_clip(before, 400)}\nOpening: {_clip(after, 600)}\n")
+        return self.complete(system, "\n".join(parts), max_tokens=160 * len(joins)).strip()
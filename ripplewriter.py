@@ -1,10 +1,16 @@
 from __future__ import annotations
 import os, sys, glob, pathlib, datetime
+from dataclasses import replace
+from html import escape
 from typing import Dict, Any, List
 import yaml
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from pydantic import BaseModel, Field, ValidationError
 from llm_client import LLMClient
+from app.refactor_regions.export_logic.document_ast import (
+    Heading, ListBlock, Paragraph, Rule, Run, build_document, render_html,
+)
+from app.refactor_regions.export_logic.html_inline import DEFAULT_MAX_IMAGE_BYTES, inline_html, summarize
 
 ROOT = pathlib.Path(__file__).parent
 ARTICLES = ROOT / "articles"
@@ -13,6 +19,13 @@ TEMPLATES = ROOT / "templates"
 POSTS_DIR = OUTPUT / "posts"
 CONFIG = ROOT / "config" / "settings.yaml"
 
+POST_SECTIONS = (
+    ("lede", "Lede"),
+    ("body", "Body"),
+    ("counterpoints", "Counterpoints & Limits"),
+    ("conclusion", "Conclusion"),
+)
+
 env = Environment(
     loader=FileSystemLoader(str(TEMPLATES)),
     autoescape=select_autoescape(["html", "xml", "md"])
@@ -44,7 +57,23 @@ def load_settings() -> Dict[str, Any]:
 def slugify(s: str) -> str:
     return "".join(c.lower() if c.isalnum() else "-" for c in s).strip("-")
 
-def render_post(y: Dict[str, Any], sections: Dict[str, str]) -> Dict[str, Any]:
+def post_document(y: Dict[str, Any], sections: Dict[str, str]):
+    """Document AST for a post: sections + YAML pull quotes, images, fact boxes."""
+    # LLM sections sometimes carry literal "\\n" escapes
+    body = "\n\n".join(
+        f"## {heading}\n\n" + (sections.get(key) or "").replace("\\n", "\n")
+        for key, heading in POST_SECTIONS
+    )
+    doc = build_document(body, y, title=y.get("title") or "")
+
+    notes = tuple(
+        (Paragraph((Run(f"{label}: {y.get(key) or ''}"),)),)
+        for key, label in (("audience", "Audience"), ("tone", "Tone"))
+    )
+    return replace(doc, blocks=doc.blocks + (Rule(), Heading(3, (Run("Notes & Sources"),)), ListBlock(False, notes)))
+
+def render_post(y: Dict[str, Any], sections: Dict[str, str], single_file: bool = False,
+                max_image_bytes: int = DEFAULT_MAX_IMAGE_BYTES) -> Dict[str, Any]:
     template = env.get_template("post.md.j2")
     ctx = {**y, **sections}
     md = template.render(**ctx)
@@ -55,46 +84,33 @@ def render_post(y: Dict[str, Any], sections: Dict[str, str]) -> Dict[str, Any]:
     md_path = POSTS_DIR / f"{slug}.md"
     md_path.write_text(md, encoding="utf-8")
 
-    # Escape newlines BEFORE putting into f-string to avoid backslash issues
-    def esc(text: str) -> str:
-        return text.replace("\\n", "<br/>").replace("\n", "<br/>")
-
-    lede = esc(sections.get("lede", ""))
-    body = esc(sections.get("body", ""))
-    counter = esc(sections.get("counterpoints", ""))
-    concl = esc(sections.get("conclusion", ""))
+    title = escape(y.get("title") or "")
+    author = escape(y.get("author") or "")
+    article = render_html(post_document(y, sections))
 
     html = f"""<!doctype html>
 <html><head>
   <meta charset='utf-8'>
   <meta name='viewport' content='width=device-width, initial-scale=1'>
-  <title>{y.get('title')}</title>
+  <title>{title}</title>
   <link rel='stylesheet' href='../styles.css' />
 </head>
 <body>
   <main>
-    <p><a href='../index.html'>? Back</a></p>
-    <h1>{y.get('title')}</h1>
-    <p><small>{date}  {y.get('author','')}</small></p>
+    <p><a href='../index.html'>← Back</a></p>
+    <h1>{title}</h1>
+    <p><small>{date} — {author}</small></p>
     <article>
-      <h2>Lede</h2>
-      <p>{lede}</p>
-      <h2>Body</h2>
-      <p>{body}</p>
-      <h2>Counterpoints & Limits</h2>
-      <p>{counter}</p>
-      <h2>Conclusion</h2>
-      <p>{concl}</p>
-      <hr/>
-      <h3>Notes & Sources</h3>
-      <ul>
-        <li>Audience: {y.get('audience','')}</li>
-        <li>Tone: {y.get('tone','')}</li>
-      </ul>
+{article}
     </article>
   </main>
 </body></html>"""
 
+    if single_file:
+        # styles.css and images inlined: the post opens without output/ around it
+        html, report = inline_html(html, POSTS_DIR, (ARTICLES, ROOT, TEMPLATES), max_image_bytes)
+        print(f"{slug}.html: {summarize(report)}")
+
     html_path = POSTS_DIR / f"{slug}.html"
     html_path.write_text(html, encoding="utf-8")
 
@@ -107,8 +123,10 @@ def render_index(posts: List[Dict[str, Any]]):
     (OUTPUT / "index.html").write_text(html, encoding="utf-8")
     (OUTPUT / "styles.css").write_text((TEMPLATES / "styles.css").read_text(encoding="utf-8"), encoding="utf-8")
 
-def main(paths: List[str] | None = None):
+def main(paths: List[str] | None = None, single_file: bool = False, max_image_kb: int | None = None,
+         strategy: str | None = None):
     _ = load_settings()
+    max_image_bytes = (max_image_kb or DEFAULT_MAX_IMAGE_BYTES // 1024) * 1024
     llm = LLMClient()
 
     yaml_files: List[str] = []
@@ -127,13 +145,20 @@ def main(paths: List[str] | None = None):
             print(f"Validation error in {yf}: {ve}")
             continue
         y = art.model_dump()
-        sections = llm.write_post_sections(y)
-        meta = render_post(y, sections)
+        sections = llm.write_post_sections(y, strategy)
+        meta = render_post(y, sections, single_file, max_image_bytes)
         posts_meta.append(meta)
 
     render_index(posts_meta)
     print(f"Rendered {len(posts_meta)} post(s) to {OUTPUT}")
 
 if __name__ == "__main__":
-    args = sys.argv[1:]
-    main(args if args else None)
+    import argparse
+    ap = argparse.ArgumentParser(description="Render article YAML into posts.")
+    ap.add_argument("paths", nargs="*", help="YAML files / globs (default: articles/*.yml)")
+    ap.add_argument("--single-file", action="store_true", help="inline CSS and images into each post's HTML")
+    ap.add_argument("--max-image-kb", type=int, default=None, help="per-image size cap for --single-file")
+    ap.add_argument("--parallel", action="store_const", const="parallel", dest="strategy",
+                    help="draft each section in its own concurrent request")
+    args = ap.parse_args()
+    main(args.paths or None, args.single_file, args.max_image_kb, args.strategy)
@@ -0,0 +1,81 @@
+import time
+from collections import OrderedDict
+
+import pytest
+
+from app.refactor_regions.studio_engine import analysis_jobs, analysis_modes
+from app.refactor_regions.studio_engine.analysis_jobs import job_key, submit_analysis
+from app.refactor_regions.studio_engine.analysis_modes import (
+    MODE_INPUT_VERSIONS,
+    MODE_RUNNERS,
+    MODE_STRUCTURE,
+    MODE_TRUTH,
+)
+from app.refactor_regions.studio_engine.evidence_index import EvidenceIndex
+
+DRAFT = "Fares rose 12% in May, the council said.\n\nRiders want the rise reversed by 2027."
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    monkeypatch.setattr(analysis_jobs, "_RESULTS", OrderedDict())
+    monkeypatch.setattr(analysis_jobs, "_JOBS", {})
+    calls = []
+
+    def runner(doc, report, publish=None):
+        calls.append(doc.text)
+        return {"run": len(calls)}
+
+    monkeypatch.setitem(MODE_RUNNERS, MODE_TRUTH, runner)
+    monkeypatch.setitem(MODE_RUNNERS, MODE_STRUCTURE, runner)
+    return calls
+
+
+def _wait(job):
+    deadline = time.monotonic() + 30
+    while not job.finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.status == "done", job.error
+    return job
+
+
+def test_evidence_version_change_invalidates_truth_results(runs, monkeypatch):
+    version = [1]
+    monkeypatch.setitem(MODE_INPUT_VERSIONS, MODE_TRUTH, lambda: version[0])
+
+    first = _wait(submit_analysis(DRAFT, MODE_TRUTH))
+    again = _wait(submit_analysis(DRAFT, MODE_TRUTH))
+    assert again.cached and again.result == first.result == {"run": 1}
+
+    version[0] = 2      # the evidence corpus changed
+    assert job_key(DRAFT, MODE_TRUTH) != first.key
+    rerun = _wait(submit_analysis(DRAFT, MODE_TRUTH))
+    assert not rerun.cached and rerun.result == {"run": 2}
+
+    # modes that only read the draft keep their results
+    structure = _wait(submit_analysis(DRAFT, MODE_STRUCTURE))
+    version[0] = 3
+    assert _wait(submit_analysis(DRAFT, MODE_STRUCTURE)).key == structure.key
+    assert len(runs) == 3
+
+
+def test_truth_key_follows_the_evidence_index_version(tmp_path, monkeypatch):
+    corpus = tmp_path / "articles"
+    corpus.mkdir()
+    index = EvidenceIndex(path=tmp_path / "index.sqlite3", corpus_dirs=[corpus])
+    monkeypatch.setattr(analysis_modes, "get_evidence_index", lambda: index)
+
+    before = job_key(DRAFT, MODE_TRUTH)
+    assert job_key(DRAFT, MODE_TRUTH) == before
+    (corpus / "notes.md").write_text("The council confirmed the 12% fare rise in May.", encoding="utf-8")
+    assert index.sync() == 1
+    assert job_key(DRAFT, MODE_TRUTH) != before
+    assert job_key(DRAFT, MODE_STRUCTURE)[-1] is None
+
+
+def test_key_covers_draft_sections_and_weights():
+    base = job_key(DRAFT, MODE_STRUCTURE, ["lede"], {"Clarity": 0.5})
+    assert job_key(DRAFT, MODE_STRUCTURE, ["lede"], {"Clarity": 0.5}) == base
+    assert job_key(DRAFT + " ", MODE_STRUCTURE, ["lede"], {"Clarity": 0.5}) != base
+    assert job_key(DRAFT, MODE_STRUCTURE, ["body"], {"Clarity": 0.5}) != base
+    assert job_key(DRAFT, MODE_STRUCTURE, ["lede"], {"Clarity": 0.6}) != base
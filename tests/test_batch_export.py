@@ -0,0 +1,60 @@
+import json
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import yaml
+
+from app.refactor_regions.export_logic import batch_export
+from app.refactor_regions.export_logic.batch_export import REPORT_NAME, export_draft, run_batch
+
+
+def _draft(path, title, body="Plain paragraph."):
+    path.write_text(yaml.safe_dump({"title": title, "draft": body}), encoding="utf-8")
+    return path
+
+
+def test_html_title_is_escaped(tmp_path):
+    path = _draft(tmp_path / "x.yaml", "Fares </title><script>alert(1)</script> & more")
+    res = export_draft(str(path), ("html",))
+    assert res["error"] is None
+    page = res["files"][0][1].decode("utf-8")
+    assert "<script>" not in page
+    assert "<title>Fares &lt;/title&gt;&lt;script&gt;alert(1)&lt;/script&gt; &amp; more</title>" in page
+
+
+class _CrashingPool:
+    """Stands in for a process pool whose worker dies on crash.yaml."""
+
+    def __init__(self):
+        self.broken = False
+
+    def submit(self, fn, path, formats):
+        if self.broken:
+            raise BrokenProcessPool("A process in the process pool was terminated abruptly")
+        future = Future()
+        if path.endswith("crash.yaml"):
+            self.broken = True
+            future.set_exception(BrokenProcessPool("worker died"))
+        else:
+            future.set_result(fn(path, formats))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def test_crashed_worker_fails_its_draft_and_the_rest_continue(tmp_path, monkeypatch):
+    pools = iter([_CrashingPool(), ThreadPoolExecutor(max_workers=1)])
+    monkeypatch.setattr(batch_export, "_pool", lambda workers: next(pools))
+    paths = [_draft(tmp_path / f"{name}.yaml", name.title()) for name in ("a", "crash", "b", "c")]
+
+    target = tmp_path / "out.zip"
+    rows = run_batch(paths, ("md",), target, workers=1)
+
+    assert sorted((r["draft"], r["status"]) for r in rows) == [
+        ("a.yaml", "ok"), ("b.yaml", "ok"), ("c.yaml", "ok"), ("crash.yaml", "error"),
+    ]
+    with zipfile.ZipFile(target) as zf:
+        assert sorted(n for n in zf.namelist() if n.endswith(".md")) == ["a/a.md", "b/b.md", "c/c.md"]
+        assert json.loads(zf.read(REPORT_NAME))["failed"] == 1
@@ -0,0 +1,57 @@
+import pytest
+
+from app.refactor_regions.studio_engine.claim_engine import claims_from_sentences, iter_sentences
+
+TEXT = """Dr. Smith met U.S. officials on Mar. 3 at 9 a.m. in Washington. "We will cut fares," she said. "Not soon." J. R. Jones disagreed, e.g. on cost.
+
+A new paragraph starts here... And continues? Yes! Finally (a note.) Then more.
+- list item one
+- list item two
+1. numbered item
+
+
+Fares rose 12 percent to $4.50 in 2024, according to the transit authority."""
+
+SENTENCES = [
+    "Dr. Smith met U.S. officials on Mar. 3 at 9 a.m. in Washington.",
+    '"We will cut fares," she said.',
+    '"Not soon."',
+    "J. R. Jones disagreed, e.g. on cost.",
+    "A new paragraph starts here...",
+    "And continues?",
+    "Yes!",
+    "Finally (a note.)",
+    "Then more.",
+    "- list item one",
+    "- list item two",
+    "1. numbered item",
+    "Fares rose 12 percent to $4.50 in 2024, according to the transit authority.",
+]
+
+
+def test_segments_abbreviations_quotes_and_paragraphs():
+    sentences = list(iter_sentences(TEXT))
+    assert [s.text for s in sentences] == SENTENCES
+    assert [s.index for s in sentences] == list(range(len(SENTENCES)))
+    for s in sentences:
+        assert TEXT[s.start:s.end] == s.text
+
+
+@pytest.mark.parametrize("size", [1, 7, 63, 64, 65, 200])
+def test_streamed_chunks_segment_like_the_whole_text(size):
+    chunks = [TEXT[i:i + size] for i in range(0, len(TEXT), size)]
+    whole = [(s.text, s.start, s.end) for s in iter_sentences(TEXT)]
+    assert [(s.text, s.start, s.end) for s in iter_sentences(chunks)] == whole
+
+
+def test_only_check_worthy_sentences_become_claims():
+    claims = list(claims_from_sentences(iter_sentences(TEXT)))
+    assert [c.text for c in claims] == [SENTENCES[0], SENTENCES[-1]]
+    last = claims[-1]
+    assert last.features["quantity"] and last.features["year"] and last.features["attribution"]
+    assert (last.start, last.end, last.sentence_index) == (TEXT.index("Fares rose"), len(TEXT), len(SENTENCES) - 1)
+
+
+def test_empty_and_blank_input():
+    assert list(iter_sentences("")) == []
+    assert list(iter_sentences(["", "  \n\n ", ""])) == []
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from app.refactor_regions.studio_engine.coherence_engine import paragraph_vectors, similarity_graph
+from app.refactor_regions.studio_engine.term_vectors import cosine
+
+WORDS = ("budget transit housing river school clinic ferry bridge harvest election "
+         "court museum market energy water forest library union").split()
+
+
+def _brute_force(vectors, k):
+    graph = []
+    for i, a in enumerate(vectors):
+        sims = [(cosine(a, b), j) for j, b in enumerate(vectors) if j != i]
+        graph.append(sorted((s for s in sims if s[0] > 0), reverse=True)[:k])
+    return graph
+
+
+def _random_vectors(rng, n):
+    vectors = []
+    for _ in range(n):
+        terms = rng.sample(WORDS, rng.randint(0, 6))
+        vectors.append({t: rng.random() for t in terms})
+    return vectors
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("k", [1, 3, 5, 50])
+def test_top_k_matches_brute_force(seed, k):
+    vectors = _random_vectors(random.Random(seed), 40)
+    graph = similarity_graph(vectors, k)
+    expected = _brute_force(vectors, k)
+    assert len(graph) == len(expected)
+    for got, want in zip(graph, expected):
+        assert [j for _s, j in got] == [j for _s, j in want]
+        assert [s for s, _j in got] == pytest.approx([s for s, _j in want])
+
+
+def test_real_paragraphs_with_ties_pick_equally_similar_neighbours():
+    rng = random.Random(3)
+    base = [" ".join(rng.choice(WORDS) for _ in range(15)) for _ in range(12)]
+    paragraphs = base + base[:4] + ["", "zzz unrelated tokens only"]
+    vectors = paragraph_vectors(paragraphs)
+
+    graph = similarity_graph(vectors, 3)
+    expected = _brute_force(vectors, 3)
+    for i, (got, want) in enumerate(zip(graph, expected)):
+        # duplicate paragraphs tie, so compare the similarity profile
+        assert [s for s, _j in got] == pytest.approx([s for s, _j in want])
+        for s, j in got:
+            assert j != i and cosine(vectors[i], vectors[j]) == pytest.approx(s)
+    assert graph[len(base) + 4] == []
+
+
+def test_empty_input():
+    assert similarity_graph([]) == []
+    assert similarity_graph([{}, {}]) == [[], []]
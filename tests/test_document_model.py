@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from app.refactor_regions.studio_engine import document_model
+from app.refactor_regions.studio_engine.document_model import clear_documents, get_document
+from app.refactor_regions.studio_engine.paragraph_cache import aggregate_stats
+
+WORDS = ("The council approved the budget. Transit fares rise in May! Critics say "
+         "housing costs 12% more, according to the report [3]. Is the plan fair? "
+         "Residents were hopeful… but the river project stalls").split()
+
+
+def _paragraph(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 40)))
+
+
+def _same(a, b):
+    for name in ("words", "chars", "citation_hits", "ref_hits", "digits", "ellipses", "unicode_ellipses"):
+        assert getattr(a, name) == getattr(b, name), name
+    for name in ("terms", "tokens", "positive", "negative"):
+        assert getattr(a, name) == getattr(b, name), name
+    assert a.sentence_lengths_total() == b.sentence_lengths_total()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_documents():
+    clear_documents()
+    yield
+    clear_documents()
+
+
+def test_edits_rebase_on_the_previous_model(monkeypatch):
+    rng = random.Random(7)
+    paragraphs = [_paragraph(rng) for _ in range(30)]
+    get_document("\n\n".join(paragraphs)).signals
+
+    # every later version must come from the incremental path
+    def full(_stats):
+        raise AssertionError("re-aggregated the whole document")
+
+    for step in range(12):
+        edit = rng.choice(("replace", "insert", "delete", "duplicate"))
+        i = rng.randrange(len(paragraphs))
+        if edit == "replace":
+            paragraphs[i] = _paragraph(rng)
+        elif edit == "insert":
+            paragraphs.insert(i, _paragraph(rng))
+        elif edit == "delete" and len(paragraphs) > 2:
+            del paragraphs[i]
+        else:
+            paragraphs.insert(i, paragraphs[i])
+
+        monkeypatch.setattr(document_model, "aggregate_stats", full)
+        doc = get_document("\n\n".join(paragraphs))
+        incremental = doc.stats
+        monkeypatch.undo()
+
+        _same(incremental, aggregate_stats(doc.paragraph_stats))
+        assert doc.signals == document_model.DEFAULT_ENGINE.draft_signals_from_stats(
+            aggregate_stats(doc.paragraph_stats)
+        )
+
+
+def test_rebase_does_not_touch_the_previous_model():
+    first = get_document("Alpha beta gamma.\n\nDelta epsilon.")
+    before = first.stats.words
+    second = get_document("Alpha beta gamma.\n\nZeta eta theta iota.")
+    assert second.stats.words == 7
+    assert first.stats.words == before == 5
+
+
+def test_unrelated_text_is_aggregated_from_scratch():
+    get_document("One paragraph here.\n\nAnd another one.").stats
+    doc = get_document("Completely different.\n\nNothing shared at all.")
+    assert doc._base is not None
+    _same(doc.stats, aggregate_stats(doc.paragraph_stats))
+    assert doc._base is None
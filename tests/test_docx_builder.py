@@ -0,0 +1,157 @@
+import struct
+import zlib
+
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph as DocxParagraph
+
+from app.refactor_regions.export_logic import docx_builder
+from app.refactor_regions.export_logic.document_ast import Document, Image, build_document
+from app.refactor_regions.export_logic.docx_builder import bulk_document, write_document
+
+BODY = """# Ferry fares
+
+The council voted **five to two**, *narrowly*, with `code` and a [source](https://example.org/a).
+A line
+break and ![inline chart](chart.png) text.
+
+1. First step
+2. Second step
+    - nested bullet
+    - another with [a link](https://example.org/b)
+        1. deep numbered
+3. Third step
+
+Between lists.
+
+- Loose item
+
+- Second loose item
+
+Another break.
+
+4. Starts at four
+5. Then five
+
+> Quoted paragraph one.
+>
+> Quoted paragraph two.
+
+Code follows.
+
+    def fare(x):
+        return x * 2
+
+---
+
+## Closing
+
+Final paragraph.
+"""
+
+
+def _png(path):
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0)
+    raw = zlib.compress(b"\x00\xff\x00\x00")
+    path.write_bytes(b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", raw) + chunk(b"IEND", b""))
+    return str(path)
+
+
+def _num_start(document, p):
+    num_id = p.find(f"{qn('w:pPr')}/{qn('w:numPr')}/{qn('w:numId')}")
+    if num_id is None:
+        return None
+    num = document.part.numbering_part.element.num_having_numId(int(num_id.get(qn("w:val"))))
+    start = num.find(f"{qn('w:lvlOverride')}/{qn('w:startOverride')}")
+    return "list" if start is None else int(start.get(qn("w:val")))
+
+
+def _runs(document, p):
+    out = []
+    for r in p.iter(qn("w:r")):
+        rpr = r.find(qn("w:rPr"))
+        fonts = rpr.find(qn("w:rFonts")) if rpr is not None else None
+        link = r.getparent() if r.getparent().tag == qn("w:hyperlink") else None
+        out.append((
+            "".join(t.text or "" for t in r.iter(qn("w:t"))),
+            rpr is not None and rpr.find(qn("w:b")) is not None,
+            rpr is not None and rpr.find(qn("w:i")) is not None,
+            fonts.get(qn("w:ascii")) if fonts is not None else None,
+            len(r.findall(qn("w:br"))),
+            len(list(r.iter(qn("w:drawing")))),
+            document.part.rels[link.get(qn("r:id"))].target_ref if link is not None else None,
+        ))
+    return out
+
+
+def _structure(document, container):
+    out = []
+    for el in container:
+        if el.tag == qn("w:tbl"):
+            cells = [tc for tc in el.iter(qn("w:tc"))]
+            out.append(("table", [_structure(document, tc) for tc in cells]))
+        elif el.tag == qn("w:p"):
+            p = DocxParagraph(el, document._body)
+            border = el.find(f"{qn('w:pPr')}/{qn('w:pBdr')}") is not None
+            out.append((p.style.name, _num_start(document, el), border, _runs(document, el)))
+    return out
+
+
+def test_bulk_writer_matches_reference_writer(tmp_path, monkeypatch):
+    monkeypatch.setattr(docx_builder, "IMAGE_ROOTS", (tmp_path,))
+    image = _png(tmp_path / "photo.png")
+    data = {
+        "pull_quotes": [{"text": "Fares are a choice.", "attribution": "A rider"}, "Unattributed quote"],
+        "images": [
+            {"src": image, "caption": "The ferry at dawn"},
+            {"src": str(tmp_path / "missing.png"), "alt": "missing"},
+        ],
+        "fact_boxes": [{"title": "By the numbers", "content": "- 12% rise\n- **3** routes\n\nSource: city."}],
+    }
+    ast = build_document(BODY, data, title="Ferry fares", subtitle="A vote")
+
+    bulk = bulk_document(ast)
+    reference = write_document(ast)
+
+    expected = _structure(reference, reference.element.body)
+    actual = _structure(bulk, bulk.element.body)
+    assert actual == expected
+
+    kinds = {style for style, *_ in expected if isinstance(style, str)}
+    assert {"Heading 1", "List Number", "List Bullet 2", "List Number 3", "Quote", "No Spacing",
+            "Intense Quote", "Caption"} <= kinds
+    assert any(entry[0] == "table" for entry in expected)
+    assert any(border for _s, _n, border, _r in (e for e in expected if e[0] != "table"))
+    assert sum(run[5] for e in expected if e[0] != "table" for run in e[3]) == 1
+    assert bulk.core_properties.title == reference.core_properties.title == "Ferry fares"
+
+
+def _pictures(document):
+    out = []
+    for el in document.element.body.iter(qn("w:p")):
+        drawings = len(list(el.iter(qn("w:drawing"))))
+        text = "".join(t.text or "" for t in el.iter(qn("w:t")))
+        if drawings or text.startswith("[Image:") or text.startswith("Photo"):
+            out.append("picture" if drawings else text)
+    return out
+
+
+def test_pictures_only_from_image_files_under_the_allowed_roots(tmp_path, monkeypatch):
+    allowed, outside = tmp_path / "allowed", tmp_path / "outside"
+    allowed.mkdir()
+    outside.mkdir()
+    monkeypatch.setattr(docx_builder, "IMAGE_ROOTS", (allowed,))
+    (allowed / "notes.png.txt").write_text("not an image")
+    blocks = (
+        Image(_png(allowed / "a.png"), "a", caption="Photo A"),
+        Image(_png(outside / "secret.png"), "secret"),
+        Image(str(allowed / "notes.png.txt"), "notes"),
+        Image(str(allowed / ".." / "outside" / "secret.png"), "escape"),
+        Image(_png(allowed / "b.png"), "b", caption="Photo B"),
+    )
+    ast = Document("Pictures", "", blocks)
+
+    expected = ["picture", "Photo A", "[Image: secret]", "[Image: notes]", "[Image: escape]", "picture", "Photo B"]
+    assert _pictures(bulk_document(ast)) == expected
+    assert _pictures(write_document(ast)) == expected
@@ -0,0 +1,104 @@
+import io
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from datetime import datetime
+
+import pytest
+
+from app.refactor_regions.export_logic import docx_jobs
+from app.refactor_regions.export_logic.docx_jobs import cached_docx, get_docx_job, submit_docx
+from app.refactor_regions.export_logic.export_builder import export_document, timestamp_fields
+
+SECTIONS = {"final_draft": "Fares rose in May.\n\nThe council voted five to two.", "insights": "Cut fares."}
+METADATA = {"title": "Ferry fares", "subtitle": "Part 1"}
+FIRST = timestamp_fields(datetime(2026, 1, 2, 3, 4))
+LATER = timestamp_fields(datetime(2026, 5, 6, 7, 8))
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    monkeypatch.setattr(docx_jobs, "_FILES", OrderedDict())
+    monkeypatch.setattr(docx_jobs, "_STAMPED", OrderedDict())
+    monkeypatch.setattr(docx_jobs, "_JOBS", {})
+    threads = []
+    build = docx_jobs.build_docx
+
+    def recording(document, fields=None, report=None):
+        threads.append(threading.current_thread().name)
+        return build(document, fields, report=report)
+
+    monkeypatch.setattr(docx_jobs, "build_docx", recording)
+    return threads
+
+
+def _wait(job):
+    deadline = time.monotonic() + 30
+    while not job.finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+def _document_xml(data):
+    return zipfile.ZipFile(io.BytesIO(data)).read("word/document.xml").decode("utf-8")
+
+
+def test_build_runs_on_the_worker_pool_and_reports_progress(builds):
+    key, document = export_document(SECTIONS, METADATA)
+    assert cached_docx(key, FIRST) is None
+
+    job = _wait(submit_docx(key, document, FIRST))
+    assert job.status == "done" and not job.cached
+    assert job.progress == 1.0 and job.message == "DOCX ready."
+    assert builds == [builds[0]] and builds[0].startswith("rw-docx")
+    assert threading.current_thread().name not in builds
+    assert get_docx_job(key) is job
+
+
+def test_generated_field_is_bound_when_the_bytes_are_fetched(builds):
+    key, document = export_document(SECTIONS, METADATA)
+    _wait(submit_docx(key, document, FIRST))
+
+    first = _document_xml(cached_docx(key, FIRST))
+    later = _document_xml(cached_docx(key, LATER))
+    assert FIRST["generated"] in first and LATER["generated"] not in first
+    assert LATER["generated"] in later and FIRST["generated"] not in later
+    assert "" not in first + later
+    assert len(builds) == 1
+    assert cached_docx(key, LATER) is cached_docx(key, LATER)
+
+
+def test_cache_hits_on_the_same_key_and_misses_on_new_input(builds):
+    key, document = export_document(SECTIONS, METADATA)
+    job = _wait(submit_docx(key, document, FIRST))
+    assert submit_docx(key, document, LATER) is job
+
+    docx_jobs._JOBS.clear()     # e.g. a new session: the bytes are still cached
+    again = submit_docx(key, document, LATER)
+    assert again is not job and again.cached and again.status == "done"
+    assert again.data == job.data
+    assert len(builds) == 1
+
+    changed_key, changed = export_document({**SECTIONS, "insights": "Keep fares."}, METADATA)
+    assert changed_key != key
+    assert not _wait(submit_docx(changed_key, changed, FIRST)).cached
+    assert len(builds) == 2
+
+
+def test_failed_build_is_reported_and_retried(builds, monkeypatch):
+    key, document = export_document(SECTIONS, METADATA)
+    working = docx_jobs.build_docx
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(docx_jobs, "build_docx", broken)
+    job = _wait(submit_docx(key, document, FIRST))
+    assert job.status == "error" and job.error == "disk full"
+    assert cached_docx(key, FIRST) is None
+
+    monkeypatch.setattr(docx_jobs, "build_docx", working)
+    retry = submit_docx(key, document, FIRST)
+    assert retry is not job
+    assert _wait(retry).status == "done" and len(builds) == 1
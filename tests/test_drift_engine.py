@@ -0,0 +1,46 @@
+import random
+
+from app.refactor_regions.studio_engine.drift_engine import DriftTracker
+
+WORDS = ("budget transit housing river school clinic tax ferry bridge harvest "
+         "election court museum market rail energy water forest library union").split()
+
+
+def _draft(seed, n):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(12, 30))) for _ in range(n)]
+
+
+def test_incremental_update_matches_full_recompute():
+    draft = _draft(1, 22)
+    tracker = DriftTracker()
+    tracker.update(draft)
+
+    edited = list(draft)
+    edited[10] = "a rewritten paragraph about ferry bridge harvest and the river"
+    incremental = tracker.update(edited)
+    assert 0 < tracker.last_recomputed <= tracker.window
+
+    # same IDF snapshot, nothing cached: every window rebuilt
+    full = DriftTracker()
+    full._idf, full._idf_size = tracker._idf, tracker._idf_size
+    full._thesis_key = tracker._thesis_key
+    assert full.update(edited) == incremental
+    assert full.last_recomputed == len(edited)
+
+
+def test_result_does_not_depend_on_previously_analysed_draft():
+    a, b = _draft(2, 22), _draft(3, 20)
+    fresh = DriftTracker().update(a)
+
+    shared = DriftTracker()
+    shared.update(b)
+    assert shared.update(a) == fresh
+
+
+def test_analysis_module_keeps_one_tracker_per_draft():
+    from app.refactor_regions.studio_engine.analysis_modes import drift_tracker
+
+    a, b = _draft(4, 22), _draft(5, 20)
+    assert drift_tracker(a) is drift_tracker(a)
+    assert drift_tracker(a) is not drift_tracker(b)
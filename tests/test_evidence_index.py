@@ -0,0 +1,105 @@
+import math
+from collections import Counter
+
+import yaml
+
+from app.refactor_regions.studio_engine.evidence_index import (
+    BM25_B,
+    BM25_K1,
+    EvidenceIndex,
+    is_supported,
+    split_passages,
+)
+from app.refactor_regions.studio_engine import analysis_modes
+from app.refactor_regions.studio_engine.term_vectors import terms_of
+
+
+def test_split_passages_keeps_paragraphs_and_windows_long_ones():
+    long_para = " ".join(f"word{i}" for i in range(200))
+    text = f"First paragraph with enough words.\n\n{long_para}\n\nshort"
+    passages = split_passages(text, size=80)
+    assert passages[0] == "First paragraph with enough words."
+    assert [len(p.split()) for p in passages[1:]] == [80, 80, 40]
+    assert "short" not in passages      # fragments under 20 chars are dropped
+
+
+def _brute_bm25(passages, query):
+    docs = [terms_of(p) for p in passages]
+    avgdl = sum(map(len, docs)) / len(docs)
+    q = sorted(set(terms_of(query)))
+    scores = []
+    for terms in docs:
+        tf = Counter(terms)
+        score = 0.0
+        for t in q:
+            if not tf[t]:
+                continue
+            df = sum(t in d for d in docs)
+            idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+            score += idf * tf[t] * (BM25_K1 + 1) / (tf[t] + BM25_K1 * (1 - BM25_B + BM25_B * len(terms) / avgdl))
+        scores.append(score)
+    return scores
+
+
+def test_bm25_ranking_matches_brute_force(tmp_path):
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    passages = [
+        "Unemployment fell to four percent in the spring according to the labour survey.",
+        "The city council approved the new transit budget after a long debate.",
+        "Transit ridership recovered while unemployment stayed flat through the winter.",
+        "Bakers in the old town reported record bread sales during the festival weekend.",
+    ]
+    (corpus / "notes.md").write_text("\n\n".join(passages), encoding="utf-8")
+    index = EvidenceIndex(path=tmp_path / "index.sqlite3", corpus_dirs=[corpus])
+    assert index.sync() == 1
+
+    query = "transit unemployment budget"
+    results = index.search(query, k=4)
+    expected = _brute_bm25(passages, query)
+    ranked = sorted((s, p) for s, p in zip(expected, passages) if s > 0)[::-1]
+    assert [r["text"] for r in results] == [p for _, p in ranked]
+    for r, (score, _) in zip(results, ranked):
+        assert r["score"] == round(score, 3)
+
+
+def test_yaml_drafts_are_indexed(tmp_path):
+    corpus = tmp_path / "articles"
+    corpus.mkdir()
+    draft = {
+        "title": "Harbour plan",
+        "generated_sections": {"body": "The harbour dredging contract doubled in cost after the second survey."},
+        "sections": [{"heading": "Ferries", "content": "Ferry crossings were cut to three a day in winter."}],
+    }
+    (corpus / "draft.yaml").write_text(yaml.safe_dump(draft), encoding="utf-8")
+    index = EvidenceIndex(path=tmp_path / "index.sqlite3", corpus_dirs=[corpus])
+    index.sync()
+
+    hit = index.search("The harbour dredging contract doubled in cost")
+    assert is_supported(hit)
+    assert "dredging" in hit[0]["text"]
+    assert is_supported(index.search("Ferry crossings were cut to three a day"))
+
+
+def test_a_draft_does_not_corroborate_itself(tmp_path, monkeypatch):
+    corpus = tmp_path / "articles"
+    corpus.mkdir()
+    own = "The harbour dredging contract rose 40% to $12 million in 2024, the audit found."
+    other = "Ferry crossings fell from 9 to 3 a day in 2023, the port authority said."
+    closing = "Dredging resumes in March once the council signs off on the revised budget."
+    text = f"{own}\n\n{other}\n\n{closing}"
+    (corpus / "mine.yaml").write_text(yaml.safe_dump({"title": "Harbour plan", "body": text}), encoding="utf-8")
+    (corpus / "port.md").write_text(other, encoding="utf-8")     # a real source quoted verbatim
+    index = EvidenceIndex(path=tmp_path / "index.sqlite3", corpus_dirs=[corpus])
+    index.sync()
+
+    mine = index.draft_sources(text)
+    assert mine == {str(corpus / "mine.yaml")}
+    assert is_supported(index.search(own))
+    assert not is_supported(index.search(own, exclude=mine))
+    hit = index.search(other, exclude=mine)
+    assert is_supported(hit) and hit[0]["source"].endswith("port.md")
+
+    monkeypatch.setattr(analysis_modes, "get_evidence_index", lambda: index)
+    rows = analysis_modes.truth_module(analysis_modes.SharedDocument(text))["table"]
+    assert {row["Claim"]: row["Corroborated"] for row in rows} == {own: False, other: True}
@@ -0,0 +1,95 @@
+from datetime import datetime
+
+import markdown
+import pytest
+
+from app.refactor_regions.export_logic import export_builder
+from app.refactor_regions.export_logic.export_builder import EXPORT_SECTIONS, build_export_output, export_document
+
+SECTIONS = {
+    "final_draft": "\n\n".join([
+        "Fares rose *again* in May_June [ ] and 3 * 4 = 12.",
+        "A paragraph with **bold**, `code` and a [link](https://example.org).",
+        "- one\n- two_three",
+        "> quoted line",
+        "1. first\n2. second",
+        "    indented code",
+        "---",
+        "Last line with a hard  \nbreak & an <em>inline</em> tag.",
+    ]),
+    "insights": "One insight.",
+    "rippletruth": "",
+    "intent_metrics": "Drift: 0.12 _(low)_",
+}
+METADATA = {"title": "Ferry fares", "subtitle": "Part 1"}
+STAMP = datetime(2026, 1, 2, 3, 4)
+
+
+def _baseline(sections, metadata, timestamp):
+    """build_export_output before the AST: Markdown concatenated, HTML from Python-Markdown."""
+    md = f"# {metadata['title']}\n"
+    if metadata.get("subtitle"):
+        md += f"### {metadata['subtitle']}\n"
+    md += f"**Generated:** {timestamp.strftime('%Y-%m-%d %H:%M')}  \n\n"
+    for key, heading in EXPORT_SECTIONS:
+        if sections.get(key, "").strip():
+            md += f"## {heading}\n\n" + sections[key] + "\n\n"
+    return md, markdown.markdown(md)
+
+
+def _body(html):
+    return html.split("<body>\n    ", 1)[1].rsplit("\n    </body>", 1)[0]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    export_builder.clear_export_cache()
+    yield
+    export_builder.clear_export_cache()
+
+
+@pytest.mark.parametrize("metadata", [METADATA, {"title": "Ferry fares"}])
+def test_output_matches_the_baseline_byte_for_byte(metadata):
+    md, html = build_export_output(SECTIONS, metadata, STAMP)
+    want_md, want_body = _baseline(SECTIONS, metadata, STAMP)
+    assert md == want_md
+    assert _body(html) == want_body
+
+
+@pytest.fixture
+def assemblies(monkeypatch):
+    calls = []
+    assemble = export_builder._assemble
+
+    def counting(*args):
+        calls.append(args)
+        return assemble(*args)
+
+    monkeypatch.setattr(export_builder, "_assemble", counting)
+    return calls
+
+
+def test_memo_hits_on_equal_input_and_still_refreshes_the_timestamp(assemblies):
+    first = build_export_output(SECTIONS, METADATA, STAMP)
+    later = build_export_output(dict(SECTIONS), dict(METADATA), datetime(2026, 5, 6, 7, 8))
+    assert len(assemblies) == 1
+    assert "2026-01-02 03:04" in first[0] and "2026-01-02 03:04" in first[1]
+    assert "2026-05-06 07:08" in later[0] and "2026-05-06 07:08" in later[1]
+    assert "2026-01-02 03:04" not in later[0] + later[1]
+    assert export_document(SECTIONS, METADATA)[0] == export_document(dict(SECTIONS), METADATA)[0]
+    assert len(assemblies) == 1
+
+
+@pytest.mark.parametrize("change", [
+    {"metadata": {"title": "Bus fares"}},
+    {"metadata": {"subtitle": "Part 2"}},
+    {"sections": {"insights": "A different insight."}},
+    {"sections": {"rippletruth": "Now non-empty."}},
+])
+def test_memo_misses_when_title_subtitle_or_a_section_changes(assemblies, change):
+    build_export_output(SECTIONS, METADATA, STAMP)
+    sections = {**SECTIONS, **change.get("sections", {})}
+    metadata = {**METADATA, **change.get("metadata", {})}
+    md, _ = build_export_output(sections, metadata, STAMP)
+    assert len(assemblies) == 2
+    assert md == _baseline(sections, metadata, STAMP)[0]
@@ -0,0 +1,63 @@
+import random
+
+from app.refactor_regions.studio_engine.force_engine import LexiconMatcher, words_of
+
+LEXICONS = {
+    "threat": ["climate", "climate change", "climate change denial", "crisis"],
+    "hope": ["change", "we can", "we can win", "climate change"],
+    "urgency": ["now", "right now", "can't wait"],
+}
+
+
+def _brute_force(lexicons, words):
+    phrases = {}
+    for name, items in lexicons.items():
+        for phrase in items:
+            phrases.setdefault(tuple(words_of(phrase)), set()).add(name)
+    hits, i = [], 0
+    while i < len(words):
+        best = max((len(p) for p in phrases if tuple(words[i:i + len(p)]) == p), default=0)
+        if best:
+            hits.append((i, i + best, phrases[tuple(words[i:i + best])]))
+            i += best
+        else:
+            i += 1
+    return hits
+
+
+def test_longest_phrase_wins():
+    m = LexiconMatcher(LEXICONS)
+    words = words_of("Climate change denial is a crisis")
+    assert m.match(words) == [(0, 3, {"threat"}), (5, 6, {"threat"})]
+
+
+def test_falls_back_to_the_longest_complete_prefix():
+    m = LexiconMatcher(LEXICONS)
+    # "climate change" is a prefix of "climate change denial", which does not follow
+    assert m.match(words_of("climate change is here")) == [(0, 2, {"threat", "hope"})]
+    # "we can" completes, "we can win" does not
+    assert m.match(words_of("we can lose")) == [(0, 2, {"hope"})]
+    # trie path with no complete phrase on it
+    assert m.match(words_of("right away")) == []
+
+
+def test_matches_do_not_overlap_and_normalize_case_and_apostrophes():
+    m = LexiconMatcher(LEXICONS)
+    words = words_of("We CAN’T wait: we can win right now")
+    assert m.match(words) == [(1, 3, {"urgency"}), (3, 6, {"hope"}), (6, 8, {"urgency"})]
+    assert m.count(words) == {"urgency": 2, "hope": 1}
+
+
+def test_matches_brute_force_on_random_text():
+    rng = random.Random(11)
+    vocab = ["climate", "change", "denial", "crisis", "we", "can", "win", "right", "now", "can't", "wait", "the"]
+    m = LexiconMatcher(LEXICONS)
+    for _ in range(200):
+        words = [rng.choice(vocab) for _ in range(rng.randint(0, 30))]
+        assert m.match(words) == _brute_force(LEXICONS, words)
+
+
+def test_empty_phrases_are_ignored():
+    m = LexiconMatcher({"x": ["", "!!", None], "y": None})
+    assert m.entries == 0
+    assert m.match(words_of("anything at all")) == []
@@ -0,0 +1,42 @@
+import base64
+
+import pytest
+
+from app.refactor_regions.export_logic import html_inline
+from app.refactor_regions.export_logic.html_inline import inline_html
+
+PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8BQDwAEhQGAhKmMIQAAAABJRU5ErkJggg=="
+)
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    monkeypatch.setattr(html_inline, "CACHE_DIR", tmp_path / "cache")
+    html_inline.clear_asset_cache()
+    root = tmp_path / "site"
+    (root / "images").mkdir(parents=True)
+    (root / "images" / "dot.png").write_bytes(PNG)
+    (root / "secret.env").write_text("API_KEY=hunter2")
+    (tmp_path / "outside.png").write_bytes(PNG)
+    return root
+
+
+def test_local_image_is_inlined(site):
+    out, report = inline_html('<img src="images/dot.png">', base_dir=site, search_dirs=())
+    assert 'src="data:image/png;base64,' in out
+    assert report["inlined"] == 1
+
+
+@pytest.mark.parametrize("src", ["/etc/passwd", "../outside.png", "secret.env", "../../../../etc/hostname"])
+def test_non_images_and_paths_outside_roots_keep_their_reference(site, src):
+    html = f'<img src="{src}">'
+    out, report = inline_html(html, base_dir=site, search_dirs=())
+    assert out == html
+    assert report["inlined"] == 0
+
+
+def test_css_url_cannot_escape_roots(site):
+    html = "<style>body{background:url(../outside.png)}</style>"
+    out, _ = inline_html(html, base_dir=site, search_dirs=())
+    assert out == html
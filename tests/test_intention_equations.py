@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from app.refactor_regions.studio_engine.intention_equations import (
+    EquationBank,
+    compile_equation,
+    draft_weight_overrides,
+    load_intention_bank,
+    parse_expression,
+)
+
+FACTORS = {
+    "Clarity": {"clarity": 1.0},
+    "Evidence": {"evidence": 1.0},
+    "Emotion": {"sentiment": 1.0},
+}
+SIGNALS = {"coherence": 0.5, "evidence": 0.8, "novelty": 0.4, "clarity": 0.3, "sentiment": 0.6}
+
+
+def test_parse_expression_terms_and_coefficients():
+    assert parse_expression("Clarity × Credibility × Resonance") == [
+        (1.0, ("Clarity", "Credibility", "Resonance"))
+    ]
+    assert parse_expression("0.4 clarity * evidence + 0.6 Emotion") == [
+        (0.4, ("Clarity", "Evidence")),
+        (0.6, ("Emotion",)),
+    ]
+    assert parse_expression("Clarity·Evidence") == [(1.0, ("Clarity", "Evidence"))]
+
+
+@pytest.mark.parametrize("expr", ["", "Clarity ×", "+ Clarity", "Clarity + + Evidence", "Clarity / Evidence"])
+def test_parse_expression_rejects_malformed(expr):
+    with pytest.raises(ValueError):
+        parse_expression(expr)
+
+
+def test_compiled_equation_is_weighted_geometric_mean():
+    eq = compile_equation("Clarity × Evidence", {"Clarity": 0.25, "Evidence": 0.75}, FACTORS)
+    S = np.array([[0.5, 0.8, 0.4, 0.3, 0.6]])
+    assert eq(S)[0] == pytest.approx(0.3 ** 0.25 * 0.8 ** 0.75)
+
+
+def test_format_override_applies_only_to_its_equation():
+    equations = {"a": "Clarity × Evidence", "b": "Clarity × Evidence"}
+    base = {"Clarity": 0.5, "Evidence": 0.5}
+    bank = EquationBank(equations, base, FACTORS, format_overrides={"b": {"Evidence": 1.5}})
+    assert bank.weights["a"] == base
+    assert bank.weights["b"] == {"Clarity": 0.5, "Evidence": 1.5}
+
+    scores = bank.score(SIGNALS)
+    assert scores["a"] == pytest.approx((0.3 * 0.8) ** 0.5)
+    assert scores["b"] == pytest.approx(0.3 ** 0.25 * 0.8 ** 0.75)
+
+
+def test_draft_overrides_win_over_format_overrides():
+    bank = EquationBank(
+        {"a": "Clarity × Evidence"}, {"Clarity": 0.5, "Evidence": 0.5}, FACTORS,
+        format_overrides={"a": {"Evidence": 1.5}}, overrides={"Evidence": 0.5},
+    )
+    assert bank.weights["a"] == {"Clarity": 0.5, "Evidence": 0.5}
+
+
+def test_load_intention_bank_uses_per_format_overrides():
+    bank = load_intention_bank()
+    assert bank.weights["research"]["Evidence"] == 0.40
+    assert bank.weights["social"]["Emotion"] == 0.35
+    assert bank.weights["blog"].get("Evidence") == 0.30
+
+    drafted = load_intention_bank(overrides=draft_weight_overrides({"intention_weights": {"clarity": "0.9"}}))
+    assert all(w["Clarity"] == 0.9 for w in drafted.weights.values())
+
+
+def test_draft_weight_overrides_ignores_bad_values():
+    assert draft_weight_overrides({"intention_weights": {"evidence": 0.5, "Emotion": "high"}}) == {"Evidence": 0.5}
+    assert draft_weight_overrides({"intention_weights": ["Clarity"]}) == {}
+    assert draft_weight_overrides(None) == {}
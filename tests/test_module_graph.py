@@ -0,0 +1,113 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.refactor_regions.studio_engine.analysis_modes import COMPOSITE_GRAPH, SharedDocument, run_composite
+from app.refactor_regions.studio_engine.module_graph import UpstreamError, run_graph, validate_graph
+
+DRAFT = "\n\n".join(
+    f"Paragraph {i} on ferry fares, the council budget and a 12% rise voted in May {2020 + i}." for i in range(8)
+)
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events = []
+
+    def module(self, name, delay=0.0, fail=False):
+        def fn(doc, deps):
+            with self.lock:
+                self.events.append(("start", name, dict(deps)))
+            time.sleep(delay)
+            if fail:
+                raise RuntimeError(f"{name} broke")
+            with self.lock:
+                self.events.append(("end", name))
+            return {"name": name, "doc": doc, "deps": sorted(deps)}
+        return fn
+
+    def index(self, kind, name):
+        return next(i for i, e in enumerate(self.events) if e[:2] == (kind, name))
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        yield pool
+
+
+def test_modules_start_after_their_dependencies_and_receive_their_results(executor):
+    rec = Recorder()
+    graph = {
+        "FILS": (rec.module("FILS"), ("Drift",)),
+        "Drift": (rec.module("Drift", delay=0.05), ()),
+        "Report": (rec.module("Report"), ("FILS", "Coherence")),
+        "Coherence": (rec.module("Coherence"), ()),
+    }
+    finished = []
+    results = run_graph(graph, "doc", executor, lambda name, result: finished.append(name))
+
+    assert rec.index("end", "Drift") < rec.index("start", "FILS")
+    assert rec.index("end", "FILS") < rec.index("start", "Report")
+    assert rec.index("end", "Coherence") < rec.index("start", "Report")
+    assert rec.index("start", "Coherence") < rec.index("end", "Drift")     # independent: not serialized
+
+    fils_deps = next(e[2] for e in rec.events if e[:2] == ("start", "FILS"))
+    assert fils_deps == {"Drift": results["Drift"]}
+    assert results["Report"]["deps"] == ["Coherence", "FILS"]
+    assert set(results) == set(graph) and sorted(finished) == sorted(graph)
+    assert finished.index("Drift") < finished.index("FILS") < finished.index("Report")
+
+
+def test_a_failing_module_keeps_the_others_and_skips_its_dependants(executor):
+    rec = Recorder()
+    graph = {
+        "Drift": (rec.module("Drift", fail=True), ()),
+        "FILS": (rec.module("FILS"), ("Drift",)),
+        "TruthScan": (rec.module("TruthScan", delay=0.02), ()),
+        "Coherence": (rec.module("Coherence"), ()),
+    }
+    errors = {}
+
+    def on_error(name, error):
+        errors[name] = error
+        return {"error": str(error)}
+
+    results = run_graph(graph, "doc", executor, on_error=on_error)
+
+    assert results["TruthScan"]["name"] == "TruthScan" and results["Coherence"]["name"] == "Coherence"
+    assert results["Drift"] == {"error": "Drift broke"}
+    assert isinstance(errors["FILS"], UpstreamError) and "Drift" in str(errors["FILS"])
+    assert not any(e[:2] == ("start", "FILS") for e in rec.events)
+
+
+def test_without_on_error_the_exception_propagates(executor):
+    rec = Recorder()
+    with pytest.raises(RuntimeError, match="Drift broke"):
+        run_graph({"Drift": (rec.module("Drift", fail=True), ())}, "doc", executor)
+
+
+def test_validate_graph_rejects_unknown_dependencies_and_cycles():
+    noop = lambda doc, deps: None     # noqa: E731
+    with pytest.raises(ValueError, match="unknown"):
+        validate_graph({"A": (noop, ("B",))})
+    with pytest.raises(ValueError, match="cycle"):
+        validate_graph({"A": (noop, ("B",)), "B": (noop, ("C",)), "C": (noop, ("A",))})
+
+
+def test_composite_keeps_every_other_module_when_one_raises(monkeypatch):
+    def broken(doc, deps=None):
+        raise RuntimeError("index offline")
+
+    monkeypatch.setitem(COMPOSITE_GRAPH, "TruthScan", (broken, ()))
+    published = {}
+    result = run_composite(SharedDocument(DRAFT), lambda fraction, message="": None, published.__setitem__)
+
+    assert set(result["parts"]) == set(published) == set(COMPOSITE_GRAPH)
+    assert result["parts"]["TruthScan"]["error"] == "index offline"
+    assert "TruthScan failed: index offline" in result["notes"]
+    assert result["parts"]["FILS"]["metrics"]["Drift"] == result["parts"]["Drift"]["metrics"]["Mean drift"]
+    assert any(k.startswith("Coherence · ") for k in result["metrics"])
@@ -0,0 +1,106 @@
+import re
+import threading
+import time
+
+from llm_client import POST_SECTIONS, SECTION_WORDS, LLMClient
+from app.refactor_regions.studio_engine.outline_writer import (
+    section_plan,
+    stitch,
+    write_outline,
+    write_post_sections_parallel,
+)
+
+ARTICLE = {"title": "Ferry fares", "thesis": "Fares should fall.", "audience": "riders", "tone": "plain"}
+TEMPLATE = {"sections": [
+    {"hed": "Background", "copy": "Set the scene."},
+    {"hed": "The vote", "subsections": [{"hed": "Who voted"}, {"hed": "Why"}]},
+    "Outlook",
+]}
+
+
+class StubLLM(LLMClient):
+    """Answers each section after a delay that shrinks with its index, so later sections finish first."""
+
+    def __init__(self, smoothing="NONE"):
+        self.use_mock = False
+        self.smoothing = smoothing
+        self.lock = threading.Lock()
+        self.sections = []      # (index, words, prompt) in finish order
+        self.joins = []
+        self.active = self.peak = 0
+
+    def complete(self, system, user, max_tokens=None):
+        if system.startswith("You are RippleWriter's copy editor"):
+            self.joins.append(user)
+            return self.smoothing
+        m = re.search(r"Write section (\d+): .+ \(about (\d+) words\)", user)
+        index, words = int(m.group(1)), int(m.group(2))
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.01 * (6 - index))
+        with self.lock:
+            self.active -= 1
+            self.sections.append((index, words, user))
+        return f"Opening of section {index}.\n\nBody of section {index}."
+
+
+def test_template_plan_is_flattened_with_containers():
+    plan = section_plan(ARTICLE, TEMPLATE)
+    assert [(p["heading"], p["level"], p.get("container", False)) for p in plan] == [
+        ("Background", 2, False), ("The vote", 2, True), ("Who voted", 3, False), ("Why", 3, False),
+        ("Outlook", 2, False),
+    ]
+    assert plan[0]["guidance"] == "Set the scene."
+
+
+def test_sections_come_back_in_plan_order_whatever_finishes_first():
+    llm = StubLLM()
+    progress = []
+    sections = write_outline(ARTICLE, template=TEMPLATE, llm=llm, words=150, workers=4,
+                             report=lambda fraction, message: progress.append(fraction))
+
+    assert [s["heading"] for s in sections] == ["Background", "The vote", "Who voted", "Why", "Outlook"]
+    assert sections[1]["content"] == ""     # container heading only
+    assert [s["content"].split("\n")[0] for s in sections if s["content"]] == [
+        f"Opening of section {n}." for n in (1, 3, 4, 5)
+    ]
+    assert [i for i, _w, _p in llm.sections] != sorted(i for i, _w, _p in llm.sections)
+    assert llm.peak > 1
+    assert {w for _i, w, _p in llm.sections} == {150}
+    # every request shares the brief + full outline prefix
+    prefixes = {p.split("Write section")[0] for _i, _w, p in llm.sections}
+    assert len(prefixes) == 1
+    assert progress == sorted(progress) and progress[-1] == 1.0
+
+
+def test_consistency_pass_rewrites_only_flagged_openings():
+    llm = StubLLM(smoothing="[2] A smoother opening.\n[7] out of range\nnot a join line")
+    sections = write_outline(ARTICLE, template=TEMPLATE, llm=llm, words=150)
+
+    assert len(llm.joins) == 1 and llm.joins[0].count("Opening:") == 3
+    drafted = [s for s in sections if s["content"]]
+    assert drafted[2]["content"] == "A smoother opening.\n\nBody of section 4."
+    assert [s["content"] for i, s in enumerate(drafted) if i != 2] == [
+        f"Opening of section {n}.\n\nBody of section {n}." for n in (1, 3, 5)
+    ]
+
+
+def test_stitch_keeps_plan_order_and_levels():
+    sections = write_outline(ARTICLE, template=TEMPLATE, llm=StubLLM(), words=150, consistency=False)
+    assert stitch(sections, "Ferry fares") == (
+        "# Ferry fares\n\n## Background\n\nOpening of section 1.\n\nBody of section 1.\n\n## The vote\n\n"
+        "### Who voted\n\nOpening of section 3.\n\nBody of section 3.\n\n"
+        "### Why\n\nOpening of section 4.\n\nBody of section 4.\n\n"
+        "## Outlook\n\nOpening of section 5.\n\nBody of section 5.\n"
+    )
+
+
+def test_post_sections_keep_their_keys_and_word_budgets():
+    llm = StubLLM()
+    out = write_post_sections_parallel(ARTICLE, llm=llm)
+    assert list(out) == list(POST_SECTIONS)
+    assert [out[k].split("\n")[0] for k in POST_SECTIONS] == [f"Opening of section {n}." for n in (1, 2, 3, 4)]
+    assert sorted((i, w) for i, w, _p in llm.sections) == [
+        (n + 1, SECTION_WORDS[k]) for n, k in enumerate(POST_SECTIONS)
+    ]
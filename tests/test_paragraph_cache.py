@@ -0,0 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app.refactor_regions.studio_engine import paragraph_cache
+from app.refactor_regions.studio_engine.paragraph_cache import paragraph_stats
+from app.refactor_regions.studio_engine.signal_engine import scan
+
+
+def test_stats_cache_stays_bounded_under_concurrent_use(monkeypatch):
+    monkeypatch.setattr(paragraph_cache, "MAX_CACHED_PARAGRAPHS", 64)
+    monkeypatch.setattr(paragraph_cache, "_STATS_CACHE", type(paragraph_cache._STATS_CACHE)())
+    paragraphs = [f"Paragraph {i} mentions the budget and {i % 7} rivers." for i in range(400)]
+
+    def work(offset):
+        return [paragraph_stats(paragraphs[(offset + j) % len(paragraphs)]).words for j in range(300)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(work, range(0, 400, 25)))
+
+    assert len(paragraph_cache._STATS_CACHE) <= 64
+    expected = [scan(p).words for p in paragraphs]
+    for offset, words in zip(range(0, 400, 25), results):
+        assert words == [expected[(offset + j) % len(paragraphs)] for j in range(300)]
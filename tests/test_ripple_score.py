@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from app.refactor_regions.studio_engine.ripple_score import (
+    apply_equation,
+    load_equations,
+    normalize_equations,
+    score_matrix,
+    weight_matrix,
+)
+from app.refactor_regions.studio_engine.signal_engine import SIGNAL_KEYS
+
+EXTRA = normalize_equations([
+    {"id": "unknown_key", "weights": {"coherence": 0.5, "evidence": 0.25, "virality": 0.25}},
+    {"id": "only_unknown", "weights": {"virality": 1.0, "Coherence": 2}},
+    {"id": "negative", "weights": {"clarity": -0.5, "novelty": 1.0, "tone": -0.5}},
+    {"id": "integer_weights", "weights": {"coherence": 1, "sentiment": 3}},
+    {"id": "empty"},
+])
+
+
+def _signals(rng, n):
+    S = rng.random((n, len(SIGNAL_KEYS)))
+    S[0] = 0.0
+    S[1] = 1.0
+    return S
+
+
+def test_equations_yaml_loads():
+    ids = [eq["id"] for eq in load_equations()]
+    assert {"none", "fils", "ucip"} <= set(ids)
+
+
+@pytest.mark.parametrize("equations", [load_equations(), EXTRA], ids=["equations.yaml", "extra"])
+def test_score_matrix_matches_apply_equation(equations):
+    S = _signals(np.random.default_rng(7), 50)
+    scores = score_matrix(S, weight_matrix(equations))
+    assert scores.shape == (len(S), len(equations))
+    for row, signals in zip(scores, S):
+        by_key = dict(zip(SIGNAL_KEYS, signals.tolist()))
+        expected = [apply_equation(by_key, eq["weights"]) for eq in equations]
+        assert row.tolist() == pytest.approx(expected, abs=1e-12)
+
+
+def test_unknown_keys_count_towards_the_denominator():
+    W = weight_matrix(EXTRA)
+    assert W[0].tolist() == [0.5, 0.25, 0.0, 0.0, 0.0]
+    assert W[1].tolist() == [0.0] * len(SIGNAL_KEYS)
+    assert W[4].tolist() == [0.0] * len(SIGNAL_KEYS)
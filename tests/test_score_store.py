@@ -0,0 +1,51 @@
+import numpy as np
+import yaml
+
+from app.refactor_regions.studio_engine.score_store import ScoreStore
+from app.refactor_regions.studio_engine.signal_engine import DEFAULT_ENGINE, SIGNAL_KEYS
+
+EQUATIONS = [{"id": "clarity_only", "weights": {"clarity": 1.0}}]
+
+
+def test_refresh_ignores_tags_and_scores_past_the_rows_it_read(tmp_path):
+    store = ScoreStore(tmp_path / "scores.sqlite3")
+    first = store.record("a", "First draft text.", tags=["x"], equations=EQUATIONS)
+
+    # a writer's tag/score rows for the next revision, visible before its revision row
+    with store._conn() as conn:
+        conn.execute("INSERT INTO revision_tags VALUES (?, ?)", (first + 1, "y"))
+        conn.execute("INSERT INTO revision_scores VALUES (?, ?, ?)", (first + 1, "clarity_only", 0.5))
+    assert store.refresh() == 1
+    assert store._tag_rows.tolist() == [0]
+
+    second = store.record("a", "Second draft text, longer.", equations=EQUATIONS)
+    assert second == first + 1
+    assert store.refresh() == 2
+    assert sorted(store._tag_rows.tolist()) == [0, 1]
+    assert not np.isnan(store._scores).any()
+
+
+def test_sync_corpus_counts_article_words(tmp_path):
+    articles = tmp_path / "articles"
+    articles.mkdir()
+    article = {
+        "title": "Ferry fares",
+        "author": "Sam",
+        "tags": ["transit"],
+        "generated_sections": {"lede": "Fares rise in May.", "body": "The council voted five to two."},
+    }
+    (articles / "ferry.yaml").write_text(yaml.safe_dump(article), encoding="utf-8")
+
+    store = ScoreStore(tmp_path / "scores.sqlite3")
+    assert store.sync_corpus(articles, tmp_path / "posts") == 1
+    words = store._conn().execute("SELECT words FROM revisions").fetchone()[0]
+    assert words == 2 + 4 + 6
+    assert store.sync_corpus(articles, tmp_path / "posts") == 0
+
+    # signals come from the engine's corpus rows and follow edits
+    article["generated_sections"]["body"] += " See https://example.org/source for the vote."
+    (articles / "ferry.yaml").write_text(yaml.safe_dump(article), encoding="utf-8")
+    assert store.sync_corpus(articles, tmp_path / "posts") == 1
+    _drafts, signals = store.latest_signals()
+    expected = DEFAULT_ENGINE.article_signals(article)
+    assert signals[0].tolist() == [expected[k] for k in SIGNAL_KEYS]
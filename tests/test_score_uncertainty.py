@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from app.refactor_regions.studio_engine.paragraph_cache import aggregate_stats, paragraph_stats, split_paragraphs
+from app.refactor_regions.studio_engine.score_uncertainty import (
+    replicate_signal_matrix,
+    signals_for_multiplicities,
+)
+from app.refactor_regions.studio_engine.signal_engine import DEFAULT_ENGINE, SIGNAL_KEYS
+
+DRAFT = """# City budget
+
+## Transit
+
+Ridership recovered to 90 percent of 2019 levels, according to the authority [1].
+The council still cut two routes. Commuters are frustrated but hopeful.
+
+## Housing
+
+Rents rose again this year
+and the new towers remain half empty. Why? Developers say demand is weak.
+
+A closing line without a full stop"""
+
+
+def _stats(text):
+    return [paragraph_stats(p) for p in split_paragraphs(text)]
+
+
+@pytest.mark.parametrize("text", [DRAFT, DRAFT.replace("#", ""), "One sentence only."])
+def test_identity_resample_reproduces_point_signals(text):
+    stats = _stats(text)
+    point = DEFAULT_ENGINE.draft_signals_from_stats(aggregate_stats(stats))
+    replicate = signals_for_multiplicities(stats, np.ones((1, len(stats))))[0]
+    assert replicate == pytest.approx([point[k] for k in SIGNAL_KEYS])
+
+
+def test_replicates_are_reproducible_and_bounded():
+    stats = _stats(DRAFT)
+    a = replicate_signal_matrix(stats, n_replicates=200, seed=7)
+    b = replicate_signal_matrix(stats, n_replicates=200, seed=7)
+    assert a.shape == (200, len(SIGNAL_KEYS))
+    assert np.array_equal(a, b)
+    assert ((a >= 0) & (a <= 1)).all()
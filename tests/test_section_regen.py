@@ -0,0 +1,86 @@
+import copy
+
+import pytest
+
+from llm_client import LLMClient
+from app.refactor_regions.studio_engine import section_regen
+from app.refactor_regions.studio_engine.section_regen import (
+    neighbour_context,
+    regenerate_article_section,
+    regenerate_section,
+    remember_sections,
+)
+
+BRIEF = {"title": "Ferry fares", "thesis": "Fares should fall.", "audience": "riders", "tone": "plain"}
+GENERATED = {
+    "lede": "Fares rose again in May.",
+    "body": "The council voted five to two for the rise.",
+    "counterpoints": "Operators say costs doubled.",
+    "conclusion": "Cut the fares.",
+}
+
+
+class StubLLM(LLMClient):
+    def __init__(self):
+        self.use_mock = False
+        self.calls = []
+
+    def complete(self, system, user, max_tokens=None):
+        self.calls.append(user)
+        return f"Fresh text {len(self.calls)}."
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache(monkeypatch):
+    monkeypatch.setattr(section_regen, "_SECTIONS", type(section_regen._SECTIONS)())
+
+
+def test_regenerating_one_section_uses_the_edited_neighbours():
+    data = dict(BRIEF, generated_sections=dict(GENERATED))
+    remember_sections(dict(BRIEF), GENERATED)      # cached by the last full generation
+    data["generated_sections"]["counterpoints"] = "Hand-edited: operators' costs rose 12%."
+    saved = copy.deepcopy(data)
+
+    llm = StubLLM()
+    sections = regenerate_article_section(data, "conclusion", dict(BRIEF), llm)
+
+    assert len(llm.calls) == 1
+    assert "Hand-edited: operators' costs rose 12%." in llm.calls[0]
+    assert "Operators say costs doubled." not in llm.calls[0]
+    assert sections == dict(saved["generated_sections"], conclusion="Fresh text 1.")
+    assert data == saved        # the caller saves the returned sections
+
+
+def test_yaml_sections_index_changes_only_that_section():
+    y = dict(BRIEF, sections=[
+        {"heading": "Fares", "content": "Fares rose in May."},
+        {"heading": "Vote", "content": "Stale vote text."},
+        {"heading": "Costs", "content": "Costs doubled."},
+    ])
+    remember_sections(y)
+    y["sections"][0]["content"] = "Edited: fares rose 9% in May."
+    before = copy.deepcopy(y["sections"])
+
+    llm = StubLLM()
+    assert regenerate_section(y, 1, llm) == "Fresh text 1."
+    assert len(llm.calls) == 1
+    assert "Edited: fares rose 9% in May." in llm.calls[0] and "Costs doubled." in llm.calls[0]
+    assert y["sections"][0] == before[0] and y["sections"][2] == before[2]
+    assert y["sections"][1] == {"heading": "Vote", "content": "Fresh text 1."}
+
+
+def test_cache_fills_in_sections_the_article_does_not_hold():
+    remember_sections(dict(BRIEF), GENERATED)
+    context = neighbour_context(dict(BRIEF), "body")
+    assert context == {
+        "previous: lede": GENERATED["lede"],
+        "current draft of body": GENERATED["body"],
+        "next: counterpoints": GENERATED["counterpoints"],
+    }
+
+
+def test_unknown_sections_are_rejected():
+    with pytest.raises(ValueError):
+        regenerate_section(dict(BRIEF), "epilogue", StubLLM())
+    with pytest.raises(IndexError):
+        regenerate_section(dict(BRIEF, sections=[]), 0, StubLLM())
@@ -0,0 +1,107 @@
+import ast
+import os
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+import yaml
+
+from app.refactor_regions.studio_engine.signal_engine import DEFAULT_ENGINE, SIGNAL_KEYS, SignalEngine
+
+CORE_APP = Path(__file__).resolve().parents[1] / "app" / "core_app.py"
+LEGACY = ("_safe_len", "extract_sections", "_count_bullets", "_count_citations", "_count_unique_terms",
+          "extract_signals", "_score_signal")
+
+TEXTS = [
+    "",
+    "   ",
+    "Short.",
+    "The council voted 5-2 on May 3rd... Fares rise 12% (source: city budget, https://example.org/a).",
+    "A good, clear plan! Is it strong? Critics call it weak and unclear... but riders win.",
+    "One long sentence without any break that keeps going with many words to push the average length far past "
+    "twenty two words so clarity drops off a lot for sure",
+    "Ünïcödé text… with an ellipsis, digits ٣ and ١٢, a [link](https://doi.org/10.1/x) and doi:10.2/y.",
+    "- bullet one\n- bullet two\n\n1. numbered\n2. more\n\nReferences and citation: see arxiv.org/abs/1.",
+    "word " * 900,
+]
+
+ARTICLES = [
+    {},
+    {"thesis": "Fares should fall.", "outline": ["- one", "* two", "1. three", "plain"]},
+    {"generated_sections": {"lede": TEXTS[3], "body": TEXTS[4], "counterpoints": None, "conclusion": TEXTS[6]}},
+    {"generated_sections": {"body": ["Listed", "paragraphs with https://a.example and source notes"]},
+     "outline": [f"- point {i}" for i in range(12)]},
+    {"generated_sections": {"lede": TEXTS[8], "conclusion": TEXTS[7]}, "outline": []},
+]
+
+
+@pytest.fixture(scope="module")
+def legacy():
+    """The legacy functions, compiled from core_app's source (importing it starts Streamlit)."""
+    tree = ast.parse(CORE_APP.read_text(encoding="utf-8"))
+    funcs = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in LEGACY]
+    assert {f.name for f in funcs} == set(LEGACY)
+    namespace = {"Dict": Dict, "Any": Any}
+    exec(compile(ast.Module(funcs, type_ignores=[]), str(CORE_APP), "exec"), namespace)
+    return namespace
+
+
+@pytest.mark.parametrize("article", ARTICLES)
+def test_article_signals_match_legacy_extract_signals(legacy, article):
+    assert DEFAULT_ENGINE.article_signals(article) == legacy["extract_signals"](article)
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_claim_signals_match_legacy_score_signal(legacy, text):
+    expected = {k: legacy["_score_signal"](text, k) for k in SIGNAL_KEYS}
+    assert DEFAULT_ENGINE.claim_signals(text) == expected
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_draft_signals_combine_the_legacy_article_and_claim_heuristics(legacy, text):
+    # volume signals as extract_signals scores a draft body; sentence/cue signals as _score_signal
+    article = legacy["extract_signals"]({"generated_sections": {"body": text}})
+    signals = DEFAULT_ENGINE.draft_signals(text)
+    assert {k: signals[k] for k in ("coherence", "evidence", "novelty")} == \
+        {k: article[k] for k in ("coherence", "evidence", "novelty")}
+    if text.strip():
+        assert signals["clarity"] == legacy["_score_signal"](text, "clarity")
+        assert signals["sentiment"] == legacy["_score_signal"](text, "sentiment")
+
+
+def _write(directory, name, article, mtime_ns=None):
+    path = directory / name
+    path.write_text(yaml.safe_dump(article), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+def test_corpus_matrix_rescans_only_edited_files(tmp_path):
+    engine = SignalEngine()
+    scanned = []
+    article_signals = engine.article_signals
+    engine.article_signals = lambda article: scanned.append(article.get("thesis")) or article_signals(article)
+
+    for i, article in enumerate(ARTICLES[1:]):
+        _write(tmp_path, f"a{i}.yaml", dict(article, thesis=f"t{i}"), mtime_ns=10**18)
+    (tmp_path / "notes.txt").write_text("not a draft")
+
+    paths, M = engine.corpus_matrix(tmp_path)
+    assert [p.name for p in paths] == ["a0.yaml", "a1.yaml", "a2.yaml", "a3.yaml"]
+    assert sorted(scanned) == ["t0", "t1", "t2", "t3"]
+
+    scanned.clear()
+    assert engine.corpus_matrix(tmp_path)[1].tolist() == M.tolist()
+    assert scanned == []
+
+    edited = dict(ARTICLES[2], thesis="t1", outline=["- new point"])
+    _write(tmp_path, "a1.yaml", edited, mtime_ns=2 * 10**18)
+    (tmp_path / "a3.yaml").unlink()
+    _write(tmp_path, "b.yaml", dict(ARTICLES[1], thesis="new"))
+
+    paths, M2 = engine.corpus_matrix(tmp_path)
+    assert sorted(scanned) == ["new", "t1"]
+    assert [p.name for p in paths] == ["a0.yaml", "a1.yaml", "a2.yaml", "b.yaml"]
+    expected = [DEFAULT_ENGINE.article_signals(yaml.safe_load(p.read_text(encoding="utf-8"))) for p in paths]
+    assert M2.tolist() == [[sig[k] for k in SIGNAL_KEYS] for sig in expected]
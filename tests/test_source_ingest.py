@@ -0,0 +1,126 @@
+import threading
+
+import pytest
+
+from llm_client import LLMClient
+from app.refactor_regions.studio_engine import source_ingest
+from app.refactor_regions.studio_engine.source_ingest import (
+    CHUNK_TOKENS,
+    MAX_CHUNK_TOKENS,
+    MAX_CHUNKS,
+    chunk_hash,
+    chunk_text,
+    clear_summary_cache,
+    estimate_tokens,
+    ingest_source,
+    plan_chunks,
+)
+
+
+def _paragraph(i, words=100):
+    return f"Paragraph {i} opens here. " + " ".join(f"fare{i}x{j}" for j in range(words)) + "."
+
+
+def _source(n, words=100):
+    return "\n\n".join(_paragraph(i, words) for i in range(n))
+
+
+class StubLLM(LLMClient):
+    """Returns a short summary named after the hash of its input and records every call."""
+
+    def __init__(self):
+        self.use_mock = False
+        self.lock = threading.Lock()
+        self.calls = []
+
+    def complete(self, system, user, max_tokens=None):
+        with self.lock:
+            self.calls.append((system, user, max_tokens))
+        return f"Summary {chunk_hash(user)[:8]}.\n"
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_summary_cache()
+    yield
+    clear_summary_cache()
+
+
+def test_chunks_pack_whole_paragraphs_under_the_budget():
+    text = _source(30)
+    chunks = chunk_text(text, budget=500)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(c) <= 500 for c in chunks)
+    assert "\n\n".join(chunks) == text      # nothing dropped, order kept, paragraphs never cut
+
+
+def test_oversized_paragraphs_split_by_sentences_then_words():
+    sentences = " ".join(f"Sentence {i} has " + "many words " * 20 + "in it." for i in range(6))
+    run = "x" * 5000       # one unbroken token run
+    chunks = chunk_text(f"{sentences}\n\n{run}", budget=100)
+    assert all(estimate_tokens(c) <= 100 for c in chunks)
+    assert chunks[0].startswith("Sentence 0 has")
+    assert "".join(c for c in chunks if c.startswith("x")) == run
+
+
+def test_plan_grows_the_chunk_budget_before_sampling():
+    short, sampled = plan_chunks(_source(3))
+    assert len(short) == 1 and not sampled
+
+    text = _source(300)         # ~40k tokens: too many chunks at CHUNK_TOKENS, fits once they grow
+    assert len(chunk_text(text, CHUNK_TOKENS)) > MAX_CHUNKS
+    chunks, sampled = plan_chunks(text)
+    assert len(chunks) <= MAX_CHUNKS and not sampled
+    assert "\n\n".join(chunks) == text
+
+
+def test_plan_samples_evenly_past_the_largest_budget():
+    text = _source(1500)        # ~200k tokens: over MAX_CHUNKS * MAX_CHUNK_TOKENS
+    chunks, sampled = plan_chunks(text)
+    assert sampled and len(chunks) == MAX_CHUNKS
+    assert all(estimate_tokens(c) <= MAX_CHUNK_TOKENS for c in chunks)
+    assert chunks[0].startswith("Paragraph 0 ")
+    positions = [text.index(c) for c in chunks]
+    assert positions == sorted(positions) and positions[-1] > len(text) * 0.9
+
+
+def test_short_source_is_summarized_in_one_call():
+    llm = StubLLM()
+    digest = ingest_source(_source(2), llm=llm)
+    assert (digest["chunks"], digest["calls"], digest["cached"], digest["sampled"]) == (1, 1, 0, False)
+    assert len(llm.calls) == 1 and "summarize a source" in llm.calls[0][0]
+    assert digest["summary"] == f"Summary {chunk_hash(_source(2))[:8]}."
+
+
+def test_map_reduce_summaries_are_cached_by_chunk():
+    text = _source(60, words=200)
+    llm = StubLLM()
+    progress = []
+    first = ingest_source(text, llm=llm, report=lambda fraction, message: progress.append(fraction))
+
+    chunks, _ = plan_chunks(text)
+    assert first["chunks"] == len(chunks) > 1
+    assert first["calls"] == len(llm.calls) == len(chunks) + 1     # map + one reduce
+    assert first["cached"] == 0 and not first["sampled"]
+    assert sorted(user for _s, user, _m in llm.calls[:-1]) == sorted(chunks)
+    assert progress == sorted(progress) and progress[-1] == 1.0
+
+    again = ingest_source(text, llm=llm)
+    assert len(llm.calls) == first["calls"]        # nothing sent to the model
+    assert again["summary"] == first["summary"]
+    assert (again["calls"], again["cached"]) == (0, first["calls"])
+
+    edited = text.replace("Paragraph 0 opens", "Paragraph 0 now opens", 1)
+    changed = ingest_source(edited, llm=llm)
+    assert changed["calls"] == 2                   # the edited chunk + the reduce
+    assert changed["cached"] == len(chunks) - 1
+    assert changed["summary"] != first["summary"]
+
+
+def test_sampled_flag_reaches_the_digest(monkeypatch):
+    monkeypatch.setattr(source_ingest, "MAX_CHUNKS", 4)
+    monkeypatch.setattr(source_ingest, "MAX_CHUNK_TOKENS", CHUNK_TOKENS)
+    llm = StubLLM()
+    digest = ingest_source(_source(100), llm=llm)
+    assert digest["sampled"] and digest["chunks"] == 4
+    assert digest["calls"] == len(llm.calls) == 5
@@ -0,0 +1,81 @@
+import io
+import json
+from datetime import datetime
+
+import pytest
+import yaml
+
+from app.refactor_regions.export_logic import structured_export
+from app.refactor_regions.export_logic.structured_export import (
+    SCHEMA_VERSION,
+    structured_bytes,
+    structured_preview,
+    write_structured,
+)
+from app.refactor_regions.studio_engine.document_model import get_document
+
+DRAFT = "\n\n".join(
+    [f"Paragraph {i}: the council's \"ferry\" vote — 12% rise: yes/no? #{i}" for i in range(9)]
+    + ["- a list item\n- another: with colon", "Ünïcödé ✓ and a trailing backslash \\", "key: value looking line"]
+)
+SECTIONS = {"final_draft": DRAFT, "insights": "One insight.", "rippletruth": "", "intent_metrics": "   "}
+METADATA = {"title": "Fares: a \"vote\"", "subtitle": "Part 1", "intention_weights": {"Clarity": 0.9}}
+STAMP = datetime(2026, 1, 2, 3, 4)
+
+
+@pytest.fixture(autouse=True)
+def _small_chunks(monkeypatch):
+    # several paragraph chunks per section
+    monkeypatch.setattr(structured_export, "PARAGRAPHS_PER_CHUNK", 4)
+
+
+def _parse(fmt, data):
+    return json.loads(data) if fmt == "json" else yaml.safe_load(data)
+
+
+@pytest.mark.parametrize("fmt", ["json", "yaml"])
+def test_round_trip_preserves_sections_and_paragraphs(fmt):
+    out = _parse(fmt, structured_bytes(fmt, SECTIONS, METADATA, STAMP).decode("utf-8"))
+
+    assert out["schema_version"] == SCHEMA_VERSION
+    assert out["generated"] == "2026-01-02 03:04"
+    assert out["metadata"] == {"title": METADATA["title"], "subtitle": "Part 1",
+                               "word_count": get_document(DRAFT).word_count}
+    assert set(out["scores"]) == {"signals", "intention"}
+
+    assert [s["key"] for s in out["sections"]] == ["final_draft", "insights"]
+    final, insights = out["sections"]
+    assert final["paragraphs"] == list(get_document(DRAFT).paragraphs)
+    assert final["digest"] == get_document(DRAFT).digest
+    assert final["kind"] == "article" and insights["kind"] == "analysis"
+    assert insights["paragraphs"] == ["One insight."]
+
+
+def test_json_and_yaml_carry_the_same_document():
+    as_json = _parse("json", structured_bytes("json", SECTIONS, METADATA, STAMP))
+    as_yaml = _parse("yaml", structured_bytes("yaml", SECTIONS, METADATA, STAMP))
+    assert as_json == as_yaml
+
+
+@pytest.mark.parametrize("fmt", ["json", "yaml"])
+def test_empty_export_is_still_valid(fmt):
+    out = _parse(fmt, structured_bytes(fmt, {}, {}, STAMP))
+    assert out["sections"] == []
+    assert out["metadata"]["word_count"] == 0
+
+
+@pytest.mark.parametrize("fmt", ["json", "yaml"])
+def test_streamed_file_matches_bytes_and_preview_is_truncated(fmt):
+    buffer = io.StringIO()
+    write_structured(buffer, fmt, SECTIONS, METADATA, STAMP)
+    full = structured_bytes(fmt, SECTIONS, METADATA, STAMP).decode("utf-8")
+    assert buffer.getvalue() == full
+
+    preview = structured_preview(fmt, SECTIONS, METADATA, limit=200)
+    assert preview.endswith("\n…") and len(preview) == 202
+    assert "schema_version" in preview and "sections" not in preview
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        structured_bytes("xml", SECTIONS, METADATA)
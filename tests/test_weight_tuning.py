@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from app.refactor_regions.studio_engine.weight_tuning import rank_rows, random_candidates, screen, spearman
+
+
+def _average_ranks(values):
+    """scipy.stats.rankdata(method="average") - 1, by definition."""
+    values = list(values)
+    return [sum(v < x for v in values) + (sum(v == x for v in values) - 1) / 2 for x in values]
+
+
+def _pearson(a, b):
+    a, b = np.asarray(a, float) - np.mean(a), np.asarray(b, float) - np.mean(b)
+    den = np.sqrt((a * a).sum() * (b * b).sum())
+    return float(a @ b / den) if den > 0 else 0.0
+
+
+def test_rank_rows_known_values():
+    # scipy: rankdata([10, 20, 20, 30, 5]) == [2, 3.5, 3.5, 5, 1]
+    assert rank_rows([10, 20, 20, 30, 5]).tolist() == [[1.0, 2.5, 2.5, 4.0, 0.0]]
+    assert rank_rows([[3, 3, 3], [2, 1, 0]]).tolist() == [[1.0, 1.0, 1.0], [2.0, 1.0, 0.0]]
+
+
+def test_rank_rows_matches_average_ranking_with_ties():
+    rng = np.random.default_rng(4)
+    M = rng.integers(0, 6, size=(30, 17)).astype(float)     # plenty of ties
+    R = rank_rows(M)
+    for row, ranks in zip(M, R):
+        assert ranks.tolist() == _average_ranks(row)
+
+
+def test_spearman_matches_pearson_of_average_ranks():
+    rng = np.random.default_rng(9)
+    S = np.round(rng.random((40, 5)), 1)                     # ties in the predictions
+    y = rng.integers(0, 10, size=40).astype(float)            # ties in the labels
+    W = random_candidates(200, seed=2)
+
+    rho = spearman(S, y, W)
+    for w, r in zip(W, rho):
+        assert r == pytest.approx(_pearson(_average_ranks(S @ w), _average_ranks(y)), abs=1e-12)
+
+
+def test_spearman_degenerate_inputs_are_zero():
+    S = np.ones((5, 5))
+    W = random_candidates(3, seed=0)
+    assert spearman(S, np.arange(5.0), W).tolist() == [0.0, 0.0, 0.0]
+    assert spearman(S[:1], np.array([1.0]), W).tolist() == [0.0, 0.0, 0.0]
+
+
+def test_screen_is_pearson_against_label_ranks():
+    rng = np.random.default_rng(1)
+    S = rng.random((50, 5))
+    y_rank = rank_rows(rng.random(50))[0]
+    W = random_candidates(100, seed=5)
+    expected = [_pearson(S @ w, y_rank) for w in W]
+    assert screen(S, y_rank, W) == pytest.approx(expected, abs=1e-12)